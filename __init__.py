@@ -1,6 +1,31 @@
-from . import ui
-from . import projector
-from . import operators
+try:
+    import bpy
+except ImportError:
+    # Worker processes of the job scheduler import the pure NumPy modules without Blender.
+    bpy = None
+
+if bpy is not None:
+    from . import ui
+    from . import index
+    from . import projector
+    from . import operators
+    from . import jobs
+    from . import lod
+    from . import canvas
+    from . import interactive
+    from . import analysis
+    from . import catalog
+    from . import library
+    from . import culling
+    from . import optimizer
+    from . import proxies
+    from . import migration
+    from . import light_linking
+    from . import blend_clusters
+    from . import tiled_textures
+    from . import output_maps
+    from . import overlay
+    from . import live_feed
 
 bl_info = {
     "name": "Projector",
@@ -16,12 +41,48 @@ bl_info = {
 
 
 def register():
+    index.register()
     projector.register()
     operators.register()
+    jobs.register()
+    lod.register()
+    canvas.register()
+    interactive.register()
+    analysis.register()
+    catalog.register()
+    library.register()
+    culling.register()
+    optimizer.register()
+    proxies.register()
+    migration.register()
+    light_linking.register()
+    blend_clusters.register()
+    tiled_textures.register()
+    output_maps.register()
+    overlay.register()
+    live_feed.register()
     ui.register()
 
 
 def unregister():
     ui.unregister()
+    live_feed.unregister()
+    overlay.unregister()
+    output_maps.unregister()
+    tiled_textures.unregister()
+    blend_clusters.unregister()
+    light_linking.unregister()
+    migration.unregister()
+    proxies.unregister()
+    optimizer.unregister()
+    culling.unregister()
+    library.unregister()
+    catalog.unregister()
+    analysis.unregister()
+    interactive.unregister()
+    canvas.unregister()
+    lod.unregister()
+    jobs.unregister()
     operators.unregister()
     projector.unregister()
+    index.unregister()
@@ -0,0 +1,196 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+import numpy as np
+from bpy.types import Operator
+
+from .helper import ADDON_ID, get_child_ID_by_type, get_projectors, get_target_objects
+from .photometry import balance, contribution_matrix, solid_angle, watts_to_candela, watts_to_lumens
+from .projector import get_image_extents
+from .result_cache import ResultCache, array_hash
+
+log = logging.getLogger(name=__file__)
+
+LUX_ATTRIBUTE = 'projector_lux'
+LUX_COLOR_ATTRIBUTE = 'Projector Lux'
+# Object idprop with the cached contributions of every projector to the vertices of the object.
+CONTRIBUTIONS = ADDON_ID.format('contributions')
+
+
+def matrix_to_numpy(matrix):
+    return np.array([list(row) for row in matrix], dtype=np.float64)
+
+
+def mesh_points(obj, depsgraph):
+    """ Return the vertex positions and normals of the evaluated mesh (with modifiers) in world space. """
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        count = len(mesh.vertices)
+        co = np.empty(count * 3, dtype=np.float64)
+        normals = np.empty(count * 3, dtype=np.float64)
+        mesh.vertices.foreach_get('co', co)
+        mesh.vertices.foreach_get('normal', normals)
+    finally:
+        evaluated.to_mesh_clear()
+    matrix = matrix_to_numpy(obj.matrix_world)
+    points = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    return points, normals
+
+
+def projector_frustum(projector, context):
+    """ Return the (world to local matrix, position, image extents) tuple the analyses work with. """
+    return (matrix_to_numpy(projector.matrix_world.inverted()),
+            np.array(projector.matrix_world.translation),
+            get_image_extents(projector.proj_settings, context))
+
+
+def projector_intensity(projector):
+    """ Luminous intensity in candela of the projectors spot light. """
+    spot = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+    return watts_to_candela(spot.data.energy)
+
+
+def write_point_attribute(mesh, name, values, color=False):
+    """ Write per vertex floats or RGBA colors into a mesh attribute. """
+    data_type = 'FLOAT_COLOR' if color else 'FLOAT'
+    if bpy.app.version >= (3, 2) and color:
+        attributes = mesh.color_attributes
+    else:
+        attributes = mesh.attributes
+    attribute = attributes.get(name)
+    if attribute is not None and (attribute.domain != 'POINT' or attribute.data_type != data_type):
+        attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = attributes.new(name, data_type, 'POINT')
+    attribute.data.foreach_set('color' if color else 'value', np.ascontiguousarray(values, dtype=np.float32).ravel())
+    mesh.update()
+
+
+def frustum_hash(frustum):
+    to_local, position, extents = frustum
+    return array_hash(to_local, position, np.array(extents, dtype=np.float64))
+
+
+def cached_contributions(obj, frustums, keys, depsgraph):
+    """ Return the lux per candela matrix for the vertices of one target.
+    The columns are stored packed on the object, keyed by the projector frustum and invalidated
+    by any change of the geometry, so only new or changed pairs are computed.
+    """
+    points, normals = mesh_points(obj, depsgraph)
+    if CONTRIBUTIONS not in obj:
+        obj[CONTRIBUTIONS] = {}
+    cache = ResultCache(obj[CONTRIBUTIONS], array_hash(points, normals))
+    contributions = np.zeros((len(points), len(frustums)))
+    missing = []
+    for j, key in enumerate(keys):
+        column = cache.get(key)
+        if column is not None and len(column) == len(points):
+            contributions[:, j] = column
+        else:
+            missing.append(j)
+    if missing:
+        computed = contribution_matrix(points, normals, [frustums[j] for j in missing])
+        for i, j in enumerate(missing):
+            contributions[:, j] = computed[:, i]
+            cache.set(keys[j], computed[:, i].astype(np.float32))
+    cache.prune(keys)
+    log.debug(f'{obj.name}: {len(keys) - len(missing)} cached, {len(missing)} computed contributions')
+    return contributions
+
+
+def compute_contributions(context, targets, projectors):
+    """ Return the lux per candela matrix for the vertices of all targets and the vertex count of each target. """
+    frustums = [projector_frustum(projector, context) for projector in projectors]
+    keys = [frustum_hash(frustum) for frustum in frustums]
+    depsgraph = context.evaluated_depsgraph_get()
+    contributions = [cached_contributions(obj, frustums, keys, depsgraph) for obj in targets]
+    return np.vstack(contributions), [len(c) for c in contributions]
+
+
+class PROJECTOR_OT_estimate_illuminance(Operator):
+    """ Estimate the illuminance of all projectors on the selected objects and store it as a color attribute. """
+    bl_idname = 'projector.estimate_illuminance'
+    bl_label = 'Estimate Illuminance'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_target_objects(context)) and bool(get_projectors(context))
+
+    def execute(self, context):
+        targets = get_target_objects(context)
+        projectors = get_projectors(context)
+        contributions, counts = compute_contributions(context, targets, projectors)
+        lux = contributions @ np.array([projector_intensity(p) for p in projectors])
+        peak = lux.max() if lux.size and lux.max() > 0 else 1.0
+
+        start = 0
+        skipped = []
+        for obj, count in zip(targets, counts):
+            values = lux[start:start + count]
+            start += count
+            if count != len(obj.data.vertices):
+                # Modifiers which add or remove vertices, the result has no vertex to be stored on.
+                skipped.append(obj.name)
+                continue
+            colors = np.ones((count, 4))
+            colors[:, :3] = (values / peak)[:, None]
+            write_point_attribute(obj.data, LUX_ATTRIBUTE, values)
+            write_point_attribute(obj.data, LUX_COLOR_ATTRIBUTE, colors, color=True)
+        if skipped:
+            self.report({'WARNING'}, f'Modifiers change the vertex count, not stored on: {", ".join(skipped)}')
+        if lux.size:
+            self.report({'INFO'}, f'Illuminance: {lux.min():.0f} - {peak:.0f} lux')
+        else:
+            self.report({'WARNING'}, 'The targets have no vertices.')
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_balance_brightness(Operator):
+    """ Dim the projectors so the illuminance on the selected objects is as even as possible. """
+    bl_idname = 'projector.balance_brightness'
+    bl_label = 'Balance Brightness'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_target_objects(context)) and bool(get_projectors(context))
+
+    def execute(self, context):
+        targets = get_target_objects(context)
+        projectors = get_projectors(context)
+        contributions, _ = compute_contributions(context, targets, projectors)
+        # Balance against the rated brightness, not the current dimming.
+        intensities = []
+        for projector in projectors:
+            proj_settings = projector.proj_settings
+            dimming = proj_settings.brightness if proj_settings.use_lumens and proj_settings.brightness > 0 else 1.0
+            intensities.append(projector_intensity(projector) / dimming)
+        factors = balance(contributions, intensities)
+
+        for projector, factor in zip(projectors, factors):
+            proj_settings = projector.proj_settings
+            if not proj_settings.use_lumens:
+                # The current power becomes the rated brightness.
+                omega = solid_angle(*get_image_extents(proj_settings, context))
+                proj_settings['lumens'] = watts_to_lumens(proj_settings.power, omega)
+                proj_settings['use_lumens'] = True
+            proj_settings.brightness = float(factor)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(PROJECTOR_OT_estimate_illuminance)
+    bpy.utils.register_class(PROJECTOR_OT_balance_brightness)
+
+
+def unregister():
+    bpy.utils.unregister_class(PROJECTOR_OT_balance_brightness)
+    bpy.utils.unregister_class(PROJECTOR_OT_estimate_illuminance)
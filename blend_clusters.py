@@ -0,0 +1,136 @@
+# Standard Lib imports
+import json
+import logging
+import time
+
+# Blender imports
+import bpy
+from bpy.types import Operator
+
+from .analysis import matrix_to_numpy
+from .index import projector_index
+from .overlap import Frustum, overlap_graph
+from .projector import get_image_extents
+
+log = logging.getLogger(name=__file__)
+
+# Names of the overlapping projector pairs and of the blend clusters of the last search, shown in the panel.
+last_overlaps = []
+last_clusters = []
+
+
+def projector_frustums(projectors, context, distance):
+    return [Frustum(matrix_to_numpy(projector.matrix_world),
+                    get_image_extents(projector.proj_settings, context), distance)
+            for projector in projectors]
+
+
+def find_blend_clusters(context):
+    """ Find the overlapping projectors of the scene and group them into connected blend clusters.
+    Projectors without any overlap form a cluster of their own.
+    """
+    settings = context.scene.projector_overlap
+    projectors = list(projector_index.get_projectors(context.scene))
+    start = time.time()
+    pairs, groups = overlap_graph(projector_frustums(projectors, context, settings.distance))
+    log.info(f'{len(pairs)} overlaps between {len(projectors)} projectors in {time.time() - start:.3f}s')
+    last_overlaps[:] = [(projectors[i].name, projectors[j].name) for i, j in pairs]
+    last_clusters[:] = [[projectors[i].name for i in group] for group in groups]
+    return last_overlaps, last_clusters
+
+
+class ProjectorOverlapSettings(bpy.types.PropertyGroup):
+    distance: bpy.props.FloatProperty(
+        name="Range",
+        description="Distance up to which the frustums of the projectors are tested for overlaps",
+        default=20.0, min=0.01, soft_max=200.0,
+        subtype='DISTANCE', unit='LENGTH') # type: ignore
+
+
+class PROJECTOR_OT_find_blend_clusters(Operator):
+    """ Find which projectors overlap and group them into blend clusters. """
+    bl_idname = 'projector.find_blend_clusters'
+    bl_label = 'Find Overlaps'
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(projector_index.get_projectors(context.scene))
+
+    def execute(self, context):
+        overlaps, clusters = find_blend_clusters(context)
+        blended = sum(1 for cluster in clusters if len(cluster) > 1)
+        self.report({'INFO'}, f'{len(overlaps)} overlaps in {blended} blend clusters.')
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_select_blend_cluster(Operator):
+    """ Select the projectors of a blend cluster. """
+    bl_idname = 'projector.select_blend_cluster'
+    bl_label = 'Select Blend Cluster'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: bpy.props.IntProperty(min=0) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def execute(self, context):
+        if self.index >= len(last_clusters):
+            return {'CANCELLED'}
+        bpy.ops.object.select_all(action='DESELECT')
+        objects = [context.scene.objects.get(name) for name in last_clusters[self.index]]
+        objects = [obj for obj in objects if obj is not None]
+        for obj in objects:
+            obj.select_set(True)
+        if objects:
+            context.view_layer.objects.active = objects[0]
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_export_blend_clusters(Operator):
+    """ Write the overlapping projector pairs and the blend clusters to a JSON file. """
+    bl_idname = 'projector.export_blend_clusters'
+    bl_label = 'Export Blend Clusters'
+    bl_options = {'REGISTER'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH') # type: ignore
+    filter_glob: bpy.props.StringProperty(default='*.json', options={'HIDDEN'}) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return bool(projector_index.get_projectors(context.scene))
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = 'blend_clusters.json'
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        overlaps, clusters = find_blend_clusters(context)
+        filepath = bpy.path.ensure_ext(self.filepath, '.json')
+        with open(filepath, 'w') as f:
+            json.dump({'range': context.scene.projector_overlap.distance,
+                       'overlaps': overlaps,
+                       'clusters': clusters}, f, indent=2)
+        self.report({'INFO'}, f'Blend clusters saved to {filepath}')
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(ProjectorOverlapSettings)
+    bpy.utils.register_class(PROJECTOR_OT_find_blend_clusters)
+    bpy.utils.register_class(PROJECTOR_OT_select_blend_cluster)
+    bpy.utils.register_class(PROJECTOR_OT_export_blend_clusters)
+    bpy.types.Scene.projector_overlap = bpy.props.PointerProperty(
+        type=ProjectorOverlapSettings)
+
+
+def unregister():
+    del bpy.types.Scene.projector_overlap
+    bpy.utils.unregister_class(PROJECTOR_OT_export_blend_clusters)
+    bpy.utils.unregister_class(PROJECTOR_OT_select_blend_cluster)
+    bpy.utils.unregister_class(PROJECTOR_OT_find_blend_clusters)
+    bpy.utils.unregister_class(ProjectorOverlapSettings)
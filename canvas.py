@@ -0,0 +1,247 @@
+# Standard Lib imports
+import logging
+import math
+
+# Blender imports
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+from mathutils import Vector
+
+from .frustum import image_corners
+from .helper import get_child_ID_by_type, get_projectors
+from .index import is_projector
+from .material_projection import copy_mapping, ensure_canvas_mapping, get_layer_group
+from .projector import Textures, ensure_canvas_nodes, get_resolution
+
+log = logging.getLogger(name=__file__)
+
+UDIM_START = 1001
+ALL_TILES = 'projector_canvas_tiles'
+
+
+def get_all_tiles(image):
+    """ Return the numbers of all UDIM tiles of the canvas, including the ones which are currently not loaded. """
+    if ALL_TILES not in image:
+        image[ALL_TILES] = [tile.number for tile in image.tiles]
+    return list(image[ALL_TILES])
+
+
+def get_tile_grid(image):
+    """ Return the number of UDIM tiles in u and v direction. """
+    if image is None or image.source != 'TILED':
+        return 1, 1
+    numbers = [number - UDIM_START for number in get_all_tiles(image)]
+    return max(n % 10 for n in numbers) + 1, max(n // 10 for n in numbers) + 1
+
+
+def get_canvas_corners(projector, canvas_obj, context):
+    """ Return the corners of the projected image in canvas UV space or None if the projector misses the canvas plane.
+    The canvas spans the local bounding box of the canvas object in X and Y.
+    """
+    proj_settings = projector.proj_settings
+    w, h = get_resolution(proj_settings, context)
+    corners = image_corners(proj_settings.throw_ratio, w, h, proj_settings.h_shift, proj_settings.v_shift)
+
+    bbox = canvas_obj.bound_box
+    min_x, max_x = min(c[0] for c in bbox), max(c[0] for c in bbox)
+    min_y, max_y = min(c[1] for c in bbox), max(c[1] for c in bbox)
+    if max_x - min_x < 1e-9 or max_y - min_y < 1e-9:
+        return None
+
+    to_canvas = canvas_obj.matrix_world.inverted() @ projector.matrix_world
+    origin = to_canvas @ Vector((0, 0, 0))
+    rotation = to_canvas.to_3x3()
+    uvs = []
+    for corner in corners:
+        direction = rotation @ Vector(corner)
+        if abs(direction.z) < 1e-9:
+            return None
+        t = -origin.z / direction.z
+        if t <= 0:
+            return None
+        hit = origin + direction * t
+        uvs.append(((hit.x - min_x) / (max_x - min_x), (hit.y - min_y) / (max_y - min_y)))
+    return uvs
+
+
+def fit_mapping(uvs, cols, rows):
+    """ Fit location, rotation and scale of a mapping node which maps the projector image onto its part of the canvas.
+    A mapping node can't shear, so the fit is exact for projectors which hit the canvas without keystone.
+    """
+    c00, c10, _, c01 = [Vector((u * cols, v * rows)) for u, v in uvs]
+    e_u = c10 - c00
+    e_v = c01 - c00
+    angle = math.atan2(e_u.y, e_u.x)
+    perpendicular = Vector((-math.sin(angle), math.cos(angle)))
+    return (c00.x, c00.y, 0.0), (0.0, 0.0, angle), (e_u.length, e_v.dot(perpendicular), 1.0)
+
+
+def tiles_needed(uvs, cols, rows):
+    """ Return the UDIM tile numbers covered by the projected image. """
+    us = [u * cols for u, _ in uvs]
+    vs = [v * rows for _, v in uvs]
+    u_min, u_max = max(int(math.floor(min(us))), 0), min(int(math.floor(max(us))), cols - 1)
+    v_min, v_max = max(int(math.floor(min(vs))), 0), min(int(math.floor(max(vs))), rows - 1)
+    return {UDIM_START + u + 10 * v
+            for u in range(u_min, u_max + 1)
+            for v in range(v_min, v_max + 1)}
+
+
+def set_vector_if_changed(vector, value):
+    """ Only write changed values, writing triggers another depsgraph update. """
+    if any(abs(a - b) > 1e-6 for a, b in zip(vector, value)):
+        vector[:] = value
+
+
+def set_mapping(mapping_node, location, rotation, scale):
+    if bpy.app.version < (2, 81):
+        set_vector_if_changed(mapping_node.translation, location)
+        set_vector_if_changed(mapping_node.rotation, rotation)
+        set_vector_if_changed(mapping_node.scale, scale)
+    else:
+        set_vector_if_changed(mapping_node.inputs['Location'].default_value, location)
+        set_vector_if_changed(mapping_node.inputs['Rotation'].default_value, rotation)
+        set_vector_if_changed(mapping_node.inputs['Scale'].default_value, scale)
+
+
+def load_tiles(image, needed):
+    """ Keep only the UDIM tiles in the image which are needed by at least one projector. """
+    needed = needed & set(get_all_tiles(image))
+    current = {tile.number for tile in image.tiles}
+    if not needed or needed == current:
+        return
+    log.debug(f'Load canvas tiles: {sorted(needed)}')
+    for number in sorted(needed - current):
+        image.tiles.new(tile_number=number)
+    for tile in list(image.tiles):
+        if tile.number not in needed:
+            image.tiles.remove(tile)
+    image.reload()
+
+
+def sync_layer_group(layer_group, mapping_node, image):
+    """ Keep the canvas lookup of the material projection in sync, only writing what changed. """
+    copy_mapping(mapping_node, ensure_canvas_mapping(layer_group))
+    image_node = layer_group.nodes['Image Texture']
+    if image_node.image != image:
+        image_node.image = image
+
+
+def update_canvas(context):
+    """ Compute the crop and offset of every canvas projector and load the needed tiles. """
+    canvas = context.scene.projector_canvas
+    if canvas.canvas_object is None:
+        return
+    cols, rows = get_tile_grid(canvas.image)
+    needed = set()
+    for projector in get_projectors(context):
+        if projector.proj_settings.projected_texture != Textures.CANVAS.value:
+            continue
+        root_tree = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')].data.node_tree
+        mapping_node, canvas_node = ensure_canvas_nodes(root_tree)
+        if canvas_node.image != canvas.image:
+            canvas_node.image = canvas.image
+        uvs = get_canvas_corners(projector, canvas.canvas_object, context)
+        if uvs is None:
+            continue
+        set_mapping(mapping_node, *fit_mapping(uvs, cols, rows))
+        layer_group = get_layer_group(projector, create=False)
+        if projector.proj_settings.projection_mode == 'MATERIAL' and layer_group is not None:
+            sync_layer_group(layer_group, mapping_node, canvas.image)
+        needed |= tiles_needed(uvs, cols, rows)
+
+    if canvas.image and canvas.image.source == 'TILED' and canvas.load_needed_tiles:
+        load_tiles(canvas.image, needed)
+
+
+def update_canvas_settings(canvas, context):
+    update_canvas(context)
+
+
+def canvas_updated(canvas, depsgraph):
+    """ True if the canvas object, a projector or the camera data of a projector was updated. """
+    cameras = None
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object):
+            if id_data == canvas.canvas_object or is_projector(id_data):
+                return True
+        elif isinstance(id_data, bpy.types.Camera):
+            if cameras is None:
+                cameras = {projector.data for projector in get_projectors(bpy.context)}
+            if id_data in cameras:
+                return True
+    return False
+
+
+@persistent
+def update_canvas_handler(scene, depsgraph):
+    """ Follow projectors which are moved or changed. Updates of other objects are ignored. """
+    canvas = scene.projector_canvas
+    if canvas.canvas_object is None or not canvas.auto_update:
+        return
+    if not (depsgraph.id_type_updated('OBJECT') or depsgraph.id_type_updated('CAMERA')):
+        return
+    if canvas_updated(canvas, depsgraph):
+        update_canvas(bpy.context)
+
+
+def poll_canvas_object(canvas, obj):
+    return obj.type == 'MESH'
+
+
+class ProjectorCanvasSettings(bpy.types.PropertyGroup):
+    image: bpy.props.PointerProperty(
+        name="Canvas Image",
+        description="Image or UDIM tile set shared by all projectors which project the canvas",
+        type=bpy.types.Image,
+        update=update_canvas_settings) # type: ignore
+
+    canvas_object: bpy.props.PointerProperty(
+        name="Canvas Object",
+        description="Plane whose local X/Y bounds define where the canvas lies in the scene",
+        type=bpy.types.Object,
+        poll=poll_canvas_object,
+        update=update_canvas_settings) # type: ignore
+
+    auto_update: bpy.props.BoolProperty(
+        name="Follow Projectors",
+        description="Update the canvas layout when projectors are moved or changed",
+        default=True) # type: ignore
+
+    load_needed_tiles: bpy.props.BoolProperty(
+        name="Only Load Needed Tiles",
+        description="Only keep the UDIM tiles in memory which are projected by at least one projector",
+        default=True,
+        update=update_canvas_settings) # type: ignore
+
+
+class PROJECTOR_OT_update_canvas(Operator):
+    """ Compute the part of the shared canvas every projector shows. """
+    bl_idname = 'projector.update_canvas'
+    bl_label = 'Update Canvas Layout'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.projector_canvas.canvas_object is not None
+
+    def execute(self, context):
+        update_canvas(context)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(ProjectorCanvasSettings)
+    bpy.utils.register_class(PROJECTOR_OT_update_canvas)
+    bpy.types.Scene.projector_canvas = bpy.props.PointerProperty(
+        type=ProjectorCanvasSettings)
+    bpy.app.handlers.depsgraph_update_post.append(update_canvas_handler)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(update_canvas_handler)
+    del bpy.types.Scene.projector_canvas
+    bpy.utils.unregister_class(PROJECTOR_OT_update_canvas)
+    bpy.utils.unregister_class(ProjectorCanvasSettings)
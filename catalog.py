@@ -0,0 +1,206 @@
+# Standard Lib imports
+import json
+import logging
+import os
+
+# Blender imports
+import bpy
+import numpy as np
+from bpy.types import Operator, PropertyGroup
+
+from .helper import get_projector
+from .projector import (RESOLUTIONS, update_power, update_projector_dimensions,
+                        update_resolution)
+
+log = logging.getLogger(name=__file__)
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(__file__), 'projector_catalog.json')
+RESOLUTION_VALUES = {res[0]: res[3] for res in RESOLUTIONS}
+
+
+class CatalogIndex:
+    """ Projector/lens combinations indexed by their throw ratio range.
+    The models are sorted by the lower end of their zoom range, so a query only has to look at
+    the models which start below the upper end of the requested range.
+    """
+
+    def __init__(self, models):
+        order = sorted(range(len(models)), key=lambda i: models[i]['throw_min'])
+        self.models = [models[i] for i in order]
+        self.throw_min = np.array([m['throw_min'] for m in self.models], dtype=np.float64)
+        self.throw_max = np.array([m['throw_max'] for m in self.models], dtype=np.float64)
+        resolutions = [m['resolution'].split('x') for m in self.models]
+        self.res_w = np.array([int(w) for w, _ in resolutions], dtype=np.int64)
+        self.res_h = np.array([int(h) for _, h in resolutions], dtype=np.int64)
+        self.lumens = np.array([m.get('lumens', 0) for m in self.models], dtype=np.float64)
+
+    def query(self, throw_low, throw_high, min_width=0, min_height=0, min_lumens=0):
+        """ Return the indices of all models whose zoom range overlaps [throw_low, throw_high]. """
+        end = np.searchsorted(self.throw_min, throw_high, side='right')
+        mask = ((self.throw_max[:end] >= throw_low)
+                & (self.res_w[:end] >= min_width)
+                & (self.res_h[:end] >= min_height)
+                & (self.lumens[:end] >= min_lumens))
+        return np.nonzero(mask)[0]
+
+
+_cache = {}
+
+
+def load_catalog(filepath):
+    """ Load a catalog file once, it is only read again when the file changes. """
+    filepath = bpy.path.abspath(filepath) if filepath else DEFAULT_CATALOG
+    mtime = os.path.getmtime(filepath)
+    cached = _cache.get(filepath)
+    if cached is None or cached[0] != mtime:
+        log.debug(f'Load projector catalog: {filepath}')
+        with open(filepath, 'r') as f:
+            cached = (mtime, CatalogIndex(json.load(f)))
+        _cache[filepath] = cached
+    return cached[1]
+
+
+def throw_range(image_width, distance_min, distance_max):
+    """ Throw ratios needed to fill an image of the given width from the given distances. """
+    return distance_min / image_width, distance_max / image_width
+
+
+def best_model(models, throw_ratio):
+    """ Return the brightest model which can zoom to the throw ratio, or the one whose zoom range is closest. """
+    fitting = [m for m in models if m['throw_min'] - 1e-6 <= throw_ratio <= m['throw_max'] + 1e-6]
+    if fitting:
+        return max(fitting, key=lambda m: m.get('lumens', 0))
+    return min(models, key=lambda m: max(m['throw_min'] - throw_ratio, throw_ratio - m['throw_max']))
+
+
+def apply_model(proj_settings, context, model, throw_ratio):
+    """ Fill the projector settings with a catalog model and update the projector once. """
+    proj_settings['throw_ratio'] = min(max(throw_ratio, model['throw_min']), model['throw_max'])
+    proj_settings['projector_w'] = model.get('width', proj_settings.projector_w)
+    proj_settings['projector_h'] = model.get('height', proj_settings.projector_h)
+    proj_settings['projector_d'] = model.get('depth', proj_settings.projector_d)
+    if 'lumens' in model:
+        proj_settings['lumens'] = model['lumens']
+        proj_settings['brightness'] = 1.0
+        proj_settings['use_lumens'] = True
+    if model['resolution'] in RESOLUTION_VALUES:
+        proj_settings['resolution'] = RESOLUTION_VALUES[model['resolution']]
+    else:
+        log.warning(f'Resolution {model["resolution"]} is not available, the current one is kept.')
+    update_resolution(proj_settings, context)
+    update_projector_dimensions(proj_settings, context)
+    update_power(proj_settings, context)
+
+
+class ProjectorCatalogResult(PropertyGroup):
+    index: bpy.props.IntProperty() # type: ignore
+    throw_min: bpy.props.FloatProperty() # type: ignore
+    throw_max: bpy.props.FloatProperty() # type: ignore
+    resolution: bpy.props.StringProperty() # type: ignore
+    lumens: bpy.props.FloatProperty() # type: ignore
+
+
+class ProjectorCatalogSettings(PropertyGroup):
+    filepath: bpy.props.StringProperty(
+        name="Catalog",
+        description="Projector catalog file (JSON). Leave empty to use the catalog shipped with the add-on",
+        subtype='FILE_PATH') # type: ignore
+
+    image_width: bpy.props.FloatProperty(
+        name="Image Width",
+        default=6.0, min=0.01,
+        subtype='DISTANCE') # type: ignore
+
+    distance_min: bpy.props.FloatProperty(
+        name="Distance Min",
+        default=9.0, min=0.01,
+        subtype='DISTANCE') # type: ignore
+
+    distance_max: bpy.props.FloatProperty(
+        name="Distance Max",
+        default=11.0, min=0.01,
+        subtype='DISTANCE') # type: ignore
+
+    min_width: bpy.props.IntProperty(
+        name="Min Resolution Width",
+        default=1920, min=0) # type: ignore
+
+    min_height: bpy.props.IntProperty(
+        name="Min Resolution Height",
+        default=1080, min=0) # type: ignore
+
+    min_lumens: bpy.props.FloatProperty(
+        name="Min Lumens",
+        default=0, min=0) # type: ignore
+
+    results: bpy.props.CollectionProperty(type=ProjectorCatalogResult) # type: ignore
+
+    active_result: bpy.props.IntProperty() # type: ignore
+
+
+class PROJECTOR_OT_search_catalog(Operator):
+    """ Find all projector models which can fill the image width from the distance range. """
+    bl_idname = 'projector.search_catalog'
+    bl_label = 'Search Catalog'
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        settings = context.scene.projector_catalog
+        try:
+            index = load_catalog(settings.filepath)
+        except (OSError, ValueError, KeyError) as e:
+            self.report({'ERROR'}, f'Could not load catalog: {e}')
+            return {'CANCELLED'}
+        low, high = throw_range(settings.image_width, settings.distance_min, settings.distance_max)
+        found = index.query(low, high, settings.min_width, settings.min_height, settings.min_lumens)
+
+        settings.results.clear()
+        for i in found:
+            model = index.models[i]
+            result = settings.results.add()
+            result.name = f'{model["model"]} {model.get("lens", "")}'.strip()
+            result.index = int(i)
+            result.throw_min = model['throw_min']
+            result.throw_max = model['throw_max']
+            result.resolution = model['resolution']
+            result.lumens = model.get('lumens', 0)
+        self.report({'INFO'}, f'{len(found)} models can throw {low:.2f} - {high:.2f}.')
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_apply_catalog_model(Operator):
+    """ Apply the selected catalog model to the selected projector. """
+    bl_idname = 'projector.apply_catalog_model'
+    bl_label = 'Apply Model'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        settings = context.scene.projector_catalog
+        return get_projector(context) is not None and 0 <= settings.active_result < len(settings.results)
+
+    def execute(self, context):
+        settings = context.scene.projector_catalog
+        result = settings.results[settings.active_result]
+        model = load_catalog(settings.filepath).models[result.index]
+        # Aim for the middle of the requested distance range.
+        distance = (settings.distance_min + settings.distance_max) / 2
+        apply_model(get_projector(context).proj_settings, context, model, distance / settings.image_width)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(ProjectorCatalogResult)
+    bpy.utils.register_class(ProjectorCatalogSettings)
+    bpy.utils.register_class(PROJECTOR_OT_search_catalog)
+    bpy.utils.register_class(PROJECTOR_OT_apply_catalog_model)
+    bpy.types.Scene.projector_catalog = bpy.props.PointerProperty(
+        type=ProjectorCatalogSettings)
+
+
+def unregister():
+    del bpy.types.Scene.projector_catalog
+    bpy.utils.unregister_class(PROJECTOR_OT_apply_catalog_model)
+    bpy.utils.unregister_class(PROJECTOR_OT_search_catalog)
+    bpy.utils.unregister_class(ProjectorCatalogSettings)
+    bpy.utils.unregister_class(ProjectorCatalogResult)
@@ -50,6 +50,7 @@ class CMD(object):
         with zipfile.ZipFile(zip_file, 'w') as zf:
             for f in Path('.').glob('*.py'):
                 zf.write(f)
+            zf.write('projector_catalog.json')
             zf.write('README.md')
             zf.write('LICENSE')
         return f'A realease zipfile was created: {zip_file}'
@@ -0,0 +1,138 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+from .analysis import matrix_to_numpy
+from .frustum import boxes_in_frustum
+from .helper import get_child_ID_by_type
+from .index import is_projector, projector_index
+from .projector import get_image_extents
+
+log = logging.getLogger(name=__file__)
+
+GEOMETRY_TYPES = {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'}
+
+# Names of the spot lights disabled for the running render.
+_culled = []
+# Names of the projectors culled in the last render, shown in the panel.
+last_culled = []
+
+
+def camera_frustum(camera, scene):
+    """ Return the world to local matrix, the view extents and whether the camera is orthographic.
+    Returns None for panoramic cameras, they see everything.
+    """
+    if camera.data.type == 'PANO':
+        return None
+    frame = camera.data.view_frame(scene=scene)
+    ortho = camera.data.type == 'ORTHO'
+    if ortho:
+        xs = [v.x for v in frame]
+        ys = [v.y for v in frame]
+    else:
+        xs = [v.x / -v.z for v in frame]
+        ys = [v.y / -v.z for v in frame]
+    return matrix_to_numpy(camera.matrix_world.inverted()), (min(xs), max(xs), min(ys), max(ys)), ortho
+
+
+def scene_boxes(depsgraph):
+    """ Return the world space bounding box corners of all renderable geometry, instances included.
+    The helper objects of the projectors are left out.
+    """
+    boxes = []
+    for instance in depsgraph.object_instances:
+        obj = instance.object
+        if obj.type not in GEOMETRY_TYPES:
+            continue
+        parent = obj.original.parent
+        if parent is not None and is_projector(parent):
+            continue
+        matrix = matrix_to_numpy(instance.matrix_world)
+        corners = np.array([tuple(corner) for corner in obj.bound_box], dtype=np.float64)
+        boxes.append(corners @ matrix[:3, :3].T + matrix[:3, 3])
+    if not boxes:
+        return np.empty((0, 8, 3))
+    return np.array(boxes)
+
+
+def find_culled_projectors(scene, depsgraph):
+    """ Return the light projectors which don't light any geometry seen by the render camera.
+    Only direct light is taken into account.
+    """
+    frustum = camera_frustum(scene.camera, scene)
+    if frustum is None:
+        return []
+    boxes = scene_boxes(depsgraph)
+    to_local, extents, ortho = frustum
+    visible = boxes[boxes_in_frustum(boxes, to_local, extents, ortho)]
+
+    culled = []
+    for projector in projector_index.get_projectors(scene):
+        spot = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+        if spot.hide_render:
+            continue
+        to_local = matrix_to_numpy(projector.matrix_world.inverted())
+        extents = get_image_extents(projector.proj_settings, bpy.context)
+        if not boxes_in_frustum(visible, to_local, extents).any():
+            culled.append(projector)
+    return culled
+
+
+def restore_culled():
+    for name in _culled:
+        spot = bpy.data.objects.get(name)
+        if spot is not None:
+            spot.hide_render = False
+    _culled.clear()
+
+
+@persistent
+def cull_projectors(scene, *args):
+    """ Disable the spot lights of projectors which can't affect the frame about to be rendered. """
+    restore_culled()
+    if not scene.projector_culling.enabled or scene.camera is None:
+        return
+    culled = find_culled_projectors(scene, bpy.context.evaluated_depsgraph_get())
+    for projector in culled:
+        spot = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+        spot.hide_render = True
+        _culled.append(spot.name)
+    last_culled[:] = [projector.name for projector in culled]
+    if culled:
+        log.info(f'Culled {len(culled)} projectors: {", ".join(last_culled)}')
+
+
+@persistent
+def restore_projectors(scene, *args):
+    restore_culled()
+
+
+class ProjectorCullingSettings(bpy.types.PropertyGroup):
+    enabled: bpy.props.BoolProperty(
+        name="Render Culling",
+        description="Disable projectors which don't light anything the render camera sees while rendering. Light bouncing into the frame from outside is ignored",
+        default=False) # type: ignore
+
+
+def register():
+    bpy.utils.register_class(ProjectorCullingSettings)
+    bpy.types.Scene.projector_culling = bpy.props.PointerProperty(
+        type=ProjectorCullingSettings)
+    bpy.app.handlers.render_pre.append(cull_projectors)
+    bpy.app.handlers.render_post.append(restore_projectors)
+    bpy.app.handlers.render_cancel.append(restore_projectors)
+
+
+def unregister():
+    for handlers, handler in ((bpy.app.handlers.render_pre, cull_projectors),
+                              (bpy.app.handlers.render_post, restore_projectors),
+                              (bpy.app.handlers.render_cancel, restore_projectors)):
+        if handler in handlers:
+            handlers.remove(handler)
+    restore_culled()
+    del bpy.types.Scene.projector_culling
+    bpy.utils.unregister_class(ProjectorCullingSettings)
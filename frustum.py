@@ -0,0 +1,96 @@
+""" Pure math describing the frustum of a projector.
+The projector looks down its local -Z axis, like the camera it is built on.
+"""
+import math
+
+import numpy as np
+
+
+def image_extents(throw_ratio, width, height, h_shift=0.0, v_shift=0.0):
+    """ Return (left, right, bottom, top) of the projected image on the plane one unit in front of the projector.
+    The shifts are given in percent like in the projector settings.
+    """
+    inverted_aspect_ratio = height / width
+    half_width = 1 / throw_ratio / 2
+    x_shift = h_shift / 100 / throw_ratio
+    y_shift = inverted_aspect_ratio * v_shift / 100 / throw_ratio
+    left = -half_width + x_shift
+    right = half_width + x_shift
+    bottom = -half_width * inverted_aspect_ratio + y_shift
+    top = half_width * inverted_aspect_ratio + y_shift
+    return left, right, bottom, top
+
+
+def image_corners(throw_ratio, width, height, h_shift=0.0, v_shift=0.0, distance=1.0):
+    """ Return the corners of the projected image in local space at the given distance.
+    Order: bottom left, bottom right, top right, top left.
+    """
+    left, right, bottom, top = image_extents(throw_ratio, width, height, h_shift, v_shift)
+    return [(left * distance, bottom * distance, -distance),
+            (right * distance, bottom * distance, -distance),
+            (right * distance, top * distance, -distance),
+            (left * distance, top * distance, -distance)]
+
+
+def cone_angle(extents, margin=1.01):
+    """ Return the full opening angle of the narrowest cone around -Z which contains the image. """
+    left, right, bottom, top = extents
+    radius = max(math.hypot(x, y) for x in (left, right) for y in (bottom, top))
+    return min(2 * math.atan(radius * margin), math.pi)
+
+
+def boxes_in_frustum(corners, to_local, extents, ortho=False):
+    """ Conservative test which boxes may intersect a frustum.
+    corners is a (boxes, 8, 3) array in world space, to_local the 4x4 world to frustum matrix and
+    extents the (left, right, bottom, top) of the image one unit in front (or of the view for ortho).
+    Boxes crossing the plane of the frustum apex are always reported as intersecting.
+    """
+    corners = np.asarray(corners, dtype=np.float64)
+    to_local = np.asarray(to_local, dtype=np.float64)
+    local = corners @ to_local[:3, :3].T + to_local[:3, 3]
+    depth = -local[..., 2]
+    front = depth > 1e-9
+    any_front = front.any(axis=1)
+    all_front = front.all(axis=1)
+    if ortho:
+        x, y = local[..., 0], local[..., 1]
+    else:
+        safe_depth = np.where(front, depth, 1.0)
+        x, y = local[..., 0] / safe_depth, local[..., 1] / safe_depth
+    left, right, bottom, top = extents
+    overlap = ((x.min(axis=1) <= right) & (x.max(axis=1) >= left)
+               & (y.min(axis=1) <= top) & (y.max(axis=1) >= bottom))
+    if ortho:
+        return any_front & overlap
+    return any_front & (~all_front | overlap)
+
+
+def helper_lines(to_world, extents, distances, dimensions):
+    """ Return the line segments of the frustums and bodies of many projectors at once.
+    to_world is (n, 4, 4), extents (n, 4), distances (n,) the distance of the image plane and
+    dimensions (n, 3) the width, height and depth of the bodies. Returns (n, 40, 3) world positions,
+    every two positions form a line: 8 lines for the frustum and 12 for the body.
+    """
+    to_world = np.asarray(to_world, dtype=np.float64).reshape(-1, 4, 4)
+    extents = np.asarray(extents, dtype=np.float64).reshape(-1, 4)
+    distances = np.asarray(distances, dtype=np.float64).reshape(-1, 1, 1)
+    dimensions = np.asarray(dimensions, dtype=np.float64).reshape(-1, 1, 3)
+    left, right, bottom, top = extents.T
+    count = len(extents)
+
+    image = np.empty((count, 4, 3))
+    image[:, :, 0] = np.stack((left, right, right, left), axis=1)
+    image[:, :, 1] = np.stack((bottom, bottom, top, top), axis=1)
+    image[:, :, 2] = -1
+    image *= distances
+    apex = np.zeros((count, 4, 3))
+    rays = np.stack((apex, image), axis=2).reshape(count, 8, 3)
+    edges = np.stack((image, np.roll(image, -1, axis=1)), axis=2).reshape(count, 8, 3)
+
+    # The body sits behind the lens, corner i has x, y and z from the bits 0, 1 and 2 of i.
+    box_corners = np.array([(x - 0.5, y - 0.5, z) for z in (0, 1) for y in (0, 1) for x in (0, 1)])
+    box_edges = [(0, 1), (2, 3), (4, 5), (6, 7), (0, 2), (1, 3), (4, 6), (5, 7), (0, 4), (1, 5), (2, 6), (3, 7)]
+    body = box_corners[np.array(box_edges).ravel()][None] * dimensions
+
+    local = np.concatenate((rays, edges, body), axis=1)
+    return np.einsum('nij,nkj->nki', to_world[:, :3, :3], local) + to_world[:, None, :3, 3]
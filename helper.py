@@ -1,13 +1,20 @@
 # Standard Lib imports
+import functools
+from contextlib import contextmanager
 from random import uniform, random, uniform
 
 # Blender imports
 import bpy
 import colorsys
 
+from .index import is_projector, projector_index
+
 
 FALLBACK_WARNING = 'Falling back to pre 2.8 Blender Python API: {}'
 ADDON_ID = 'protor_{}'
+HELPER_COLLECTION = 'Projector Helpers'
+# Object idprop of linked projectors which still share the node groups, helper data and materials of the rig library.
+SHARED_RIG = ADDON_ID.format('shared_rig')
 
 
 def random_color(alpha=False):
@@ -23,15 +30,12 @@ def random_color(alpha=False):
 
 def get_projectors(context, only_selected=False):
     """ Get all or only the selected projectors from the scene. """
-    objs = context.selected_objects if only_selected else context.scene.objects
+    if not only_selected:
+        return list(projector_index.get_projectors(context.scene))
     projectors = []
-    for obj in objs:
-        if obj.type == 'CAMERA' and obj.name.startswith('Projector'):
-            if only_selected:
-                if obj.select_get():
-                    projectors.append(obj)
-            else:
-                projectors.append(obj)
+    for obj in context.selected_objects:
+        if is_projector(obj) and obj.select_get():
+            projectors.append(obj)
     return projectors
 
 
@@ -44,6 +48,13 @@ def get_projector(context):
         return None
 
 
+def get_target_objects(context):
+    """ Return the selected mesh objects which are not part of a projector. """
+    projectors = get_projectors(context)
+    return [obj for obj in context.selected_objects
+            if obj.type == 'MESH' and obj.parent not in projectors]
+
+
 def get_child_ID_by_type(children,name):
     index = 0
     for child in children:
@@ -66,6 +77,71 @@ def get_child_ID_by_name(children,name):
     return index
 
 
+_active_updates = set()
+
+
+@contextmanager
+def update_guard(proj_settings):
+    """ Guard against update callbacks which loop back onto the same projector.
+    Yields False if an update of the projector is already running.
+    """
+    key = proj_settings.as_pointer()
+    if key in _active_updates:
+        yield False
+        return
+    _active_updates.add(key)
+    try:
+        yield True
+    finally:
+        _active_updates.discard(key)
+
+
+def is_linked(id_data):
+    """ True if the datablock comes from a library, directly or as a library override. """
+    return id_data.library is not None or getattr(id_data, 'override_library', None) is not None
+
+
+def localize_shared_rig(projector):
+    """ Give a linked projector local copies of the rig data the update callbacks write to:
+    the node groups of the spot light, the frustum helpers and the materials.
+    The projector body mesh and the projection textures stay shared by all instances.
+    """
+    copies = {}
+
+    def local(id_data):
+        if id_data is None or not is_linked(id_data):
+            return id_data
+        if id_data not in copies:
+            copies[id_data] = id_data.copy()
+        return copies[id_data]
+
+    for obj in [projector, *projector.children]:
+        if obj.type in {'MESH', 'CURVE'} and 'Cube' not in obj.name:
+            obj.data = local(obj.data)
+        if obj.type == 'LIGHT' and obj.data.node_tree:
+            for node in obj.data.node_tree.nodes:
+                if node.type == 'GROUP':
+                    node.node_tree = local(node.node_tree)
+        for slot in obj.material_slots:
+            # Read before switching the link, the object level slot is empty until the copy is assigned.
+            material = local(slot.material)
+            if slot.link == 'DATA' and is_linked(obj.data):
+                # The body mesh stays shared, its instance gets its own color on the object.
+                slot.link = 'OBJECT'
+            slot.material = material
+    del projector[SHARED_RIG]
+
+
+def writes_rig(update):
+    """ Decorate update callbacks which write to the rig data, linked projectors get their own copy first. """
+    @functools.wraps(update)
+    def wrapper(proj_settings, context):
+        if SHARED_RIG in proj_settings.id_data:
+            localize_shared_rig(proj_settings.id_data)
+        return update(proj_settings, context)
+    return wrapper
+
+
 def auto_offset():
     offset = 0
 
@@ -77,3 +153,58 @@ def auto_offset():
         offset += gap
         return offset, y
     return inner
+
+
+def get_child_by_name(children, name):
+    """ Return the first child with name in its name, None if there is none. """
+    return next((child for child in children if name in child.name), None)
+
+
+def get_helper_objects(projector):
+    """ Return the helper objects (frustum line, body and planes) of a projector. """
+    return [child for child in projector.children if child.type != 'LIGHT']
+
+
+def is_lightweight(projector):
+    """ Lightweight projectors are only a camera and its spot light, their helpers are drawn as an overlay. """
+    return not get_helper_objects(projector)
+
+
+def ensure_helper_collection(projector, scene):
+    """ Return the managed collection which holds the helper objects of a projector.
+    The collection is created and the helpers are moved into it if needed.
+    """
+    root = bpy.data.collections.get(HELPER_COLLECTION)
+    if root is None:
+        root = bpy.data.collections.new(HELPER_COLLECTION)
+    if root.name not in scene.collection.children:
+        scene.collection.children.link(root)
+
+    collection = projector.proj_settings.helper_collection
+    if collection is None:
+        collection = bpy.data.collections.new(f'{projector.name} Helpers')
+        projector.proj_settings.helper_collection = collection
+    if collection.name not in root.children:
+        root.children.link(collection)
+
+    for obj in get_helper_objects(projector):
+        if obj.name not in collection.objects:
+            for users_collection in obj.users_collection:
+                users_collection.objects.unlink(obj)
+            collection.objects.link(obj)
+    return collection
+
+
+def get_helper_layer_collection(projector, view_layer):
+    """ Return the layer collection of the projectors helper collection in the given view layer. """
+    collection = projector.proj_settings.helper_collection
+    root = view_layer.layer_collection.children.get(HELPER_COLLECTION)
+    if collection is None or root is None:
+        return None
+    return root.children.get(collection.name)
+
+
+def helpers_excluded(projector, view_layer):
+    """ True if the helper objects are excluded from the view layer and don't need to be updated. """
+    layer_collection = get_helper_layer_collection(projector, view_layer)
+    return layer_collection is not None and layer_collection.exclude
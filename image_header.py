@@ -0,0 +1,117 @@
+""" Read the size of an image from its file header without decoding the pixels.
+Only the standard library is used here, so the headers can be read in background threads.
+"""
+import struct
+
+HEADER_BYTES = 256 * 1024
+
+
+def png_size(data):
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR':
+        return struct.unpack('>II', data[16:24])
+    return None
+
+
+def jpeg_size(data):
+    if data[:2] != b'\xff\xd8':
+        return None
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            i += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack('>H', data[i + 2:i + 4])[0]
+        # Start of frame markers, except the huffman and arithmetic coding tables.
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack('>HH', data[i + 5:i + 9])
+            return w, h
+        i += 2 + length
+    return None
+
+
+def exr_size(data):
+    if data[:4] != b'\x76\x2f\x31\x01':
+        return None
+    i = 8
+    while i < len(data):
+        end = data.find(b'\x00', i)
+        if end < 0 or end == i:
+            return None
+        name = data[i:end]
+        type_end = data.find(b'\x00', end + 1)
+        if type_end < 0:
+            return None
+        size = struct.unpack('<i', data[type_end + 1:type_end + 5])[0]
+        value = data[type_end + 5:type_end + 5 + size]
+        if name == b'dataWindow' and len(value) == 16:
+            x_min, y_min, x_max, y_max = struct.unpack('<iiii', value)
+            return x_max - x_min + 1, y_max - y_min + 1
+        i = type_end + 5 + size
+    return None
+
+
+def hdr_size(data):
+    if not (data.startswith(b'#?RADIANCE') or data.startswith(b'#?RGBE')):
+        return None
+    header_end = data.find(b'\n\n')
+    if header_end < 0:
+        return None
+    line_end = data.find(b'\n', header_end + 2)
+    parts = data[header_end + 2:line_end].split()
+    if len(parts) != 4:
+        return None
+    sizes = {parts[0][1:]: int(parts[1]), parts[2][1:]: int(parts[3])}
+    return sizes.get(b'X'), sizes.get(b'Y')
+
+
+def tiff_size(data):
+    if data[:4] == b'II*\x00':
+        order = '<'
+    elif data[:4] == b'MM\x00*':
+        order = '>'
+    else:
+        return None
+    offset = struct.unpack(order + 'I', data[4:8])[0]
+    if offset + 2 > len(data):
+        return None
+    count = struct.unpack(order + 'H', data[offset:offset + 2])[0]
+    sizes = {}
+    for n in range(count):
+        entry = data[offset + 2 + n * 12:offset + 14 + n * 12]
+        if len(entry) < 12:
+            break
+        tag, kind = struct.unpack(order + 'HH', entry[:4])
+        if tag in (256, 257):
+            fmt = 'H' if kind == 3 else 'I'
+            sizes[tag] = struct.unpack(order + fmt, entry[8:8 + struct.calcsize(fmt)])[0]
+    if 256 in sizes and 257 in sizes:
+        return sizes[256], sizes[257]
+    return None
+
+
+def bmp_size(data):
+    if data[:2] == b'BM' and len(data) >= 26:
+        w, h = struct.unpack('<ii', data[18:26])
+        return w, abs(h)
+    return None
+
+
+READERS = (png_size, jpeg_size, exr_size, hdr_size, tiff_size, bmp_size)
+
+
+def read_image_size(filepath):
+    """ Return the (width, height) of an image file or None if the format is not known. """
+    with open(filepath, 'rb') as f:
+        data = f.read(HEADER_BYTES)
+    for reader in READERS:
+        try:
+            size = reader(data)
+        except struct.error:
+            size = None
+        if size and all(size):
+            return tuple(int(v) for v in size)
+    return None
@@ -0,0 +1,103 @@
+# Blender imports
+import bpy
+from bpy.app.handlers import persistent
+
+
+def is_projector(obj):
+    return obj.type == 'CAMERA' and obj.name.startswith('Projector')
+
+
+class ProjectorIndex:
+    """ Cache of the projectors in a scene so the UI doesn't rescan all objects on every redraw.
+    The cache is rebuilt lazily after objects were added, removed, renamed or relinked and after undo or loading a file.
+    """
+
+    def __init__(self):
+        self._scene = None
+        self._projectors = []
+        self._pointers = set()
+        # Number of objects in the file at the last rescan, adding or removing objects changes it.
+        self.object_count = 0
+        self._positions = {}
+        # Raised on every rescan, so others can tell when the projectors may have changed.
+        self.generation = 0
+
+    def invalidate(self):
+        self._scene = None
+        self._positions = {}
+
+    def is_valid(self, scene):
+        if scene.as_pointer() != self._scene:
+            return False
+        try:
+            return all(is_projector(obj) for obj in self._projectors)
+        except ReferenceError:
+            # A projector was removed before the depsgraph handler ran.
+            return False
+
+    def get_projectors(self, scene):
+        if not self.is_valid(scene):
+            self._projectors = [obj for obj in scene.objects if is_projector(obj)]
+            self._pointers = {obj.as_pointer() for obj in self._projectors}
+            self.object_count = len(bpy.data.objects)
+            self._positions = {}
+            self._scene = scene.as_pointer()
+            self.generation += 1
+        return self._projectors
+
+    def contains(self, obj):
+        return obj.as_pointer() in self._pointers
+
+    def get_positions(self, scene):
+        """ Return a dict which maps the projectors to their position in bpy.data.objects. """
+        projectors = self.get_projectors(scene)
+        objects = bpy.data.objects
+        valid = len(self._positions) == len(projectors) and all(
+            objects[position] == projector for projector, position in self._positions.items())
+        if not valid:
+            # Renaming reorders bpy.data.objects.
+            pointers = {projector.as_pointer() for projector in projectors}
+            self._positions = {obj: position for position, obj in enumerate(objects)
+                               if obj.as_pointer() in pointers}
+        return self._positions
+
+
+projector_index = ProjectorIndex()
+
+
+@persistent
+def invalidate_index(*args):
+    projector_index.invalidate()
+
+
+@persistent
+def update_index_handler(scene, depsgraph):
+    """ Invalidate the index when objects were added, removed or relinked, or renamed into or out of being a projector.
+    Editing the settings or moving projectors doesn't change it, so it doesn't rebuild the index.
+    """
+    if projector_index.object_count != len(bpy.data.objects) or depsgraph.id_type_updated('COLLECTION'):
+        projector_index.invalidate()
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object) and not update.is_updated_transform:
+            obj = update.id.original
+            if is_projector(obj) != projector_index.contains(obj):
+                projector_index.invalidate()
+                return
+
+
+HANDLERS = (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post)
+
+
+def register():
+    for handlers in HANDLERS:
+        handlers.append(invalidate_index)
+    bpy.app.handlers.depsgraph_update_post.append(update_index_handler)
+
+
+def unregister():
+    if update_index_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(update_index_handler)
+    for handlers in HANDLERS:
+        if invalidate_index in handlers:
+            handlers.remove(invalidate_index)
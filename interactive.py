@@ -0,0 +1,118 @@
+# Standard Lib imports
+import math
+
+# Blender imports
+import bpy
+from bpy.types import Operator
+
+from .helper import get_projector
+from .projector import update_focus_distance, update_lens_shift, update_projection_helper, update_throw_ratio
+
+ADJUST_TARGETS = [('THROW_RATIO', 'Throw Ratio', 'Drag horizontally to change the throw ratio', 1),
+                  ('LENS_SHIFT', 'Lens Shift', 'Drag to change the horizontal and vertical lens shift', 2),
+                  ('FOCUS_DISTANCE', 'Focus Distance', 'Drag horizontally to change the focus distance', 3)]
+
+ADJUST_PROPERTIES = {'THROW_RATIO': ('throw_ratio',),
+                     'LENS_SHIFT': ('h_shift', 'v_shift'),
+                     'FOCUS_DISTANCE': ('focus_distance',)}
+
+ADJUST_UPDATES = {'THROW_RATIO': update_throw_ratio,
+                  'LENS_SHIFT': update_lens_shift,
+                  'FOCUS_DISTANCE': update_focus_distance}
+
+# Change per pixel of mouse movement.
+EXP_SPEED = 0.005
+SHIFT_SPEED = 0.1
+
+
+class PROJECTOR_OT_adjust_interactive(Operator):
+    """ Move the mouse to adjust the projector, click to confirm.
+    While adjusting only the camera and the frustum preview are updated at a capped frame rate,
+    the node tree and texture updates run once on confirm.
+    """
+    bl_idname = 'projector.adjust_interactive'
+    bl_label = 'Adjust Projector'
+    bl_options = {'REGISTER', 'UNDO', 'BLOCKING'}
+
+    target: bpy.props.EnumProperty(items=ADJUST_TARGETS) # type: ignore
+
+    max_fps: bpy.props.IntProperty(
+        name="Max FPS",
+        description="How often the preview is updated while adjusting",
+        default=30, min=1, max=120) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return get_projector(context) is not None
+
+    def invoke(self, context, event):
+        self.projector = get_projector(context)
+        proj_settings = self.projector.proj_settings
+        self.initial = {name: getattr(proj_settings, name) for name in ADJUST_PROPERTIES[self.target]}
+        self.values = dict(self.initial)
+        self.start = (event.mouse_x, event.mouse_y)
+        self.dirty = False
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(1 / self.max_fps, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def compute_values(self, event):
+        factor = 0.1 if event.shift else 1.0
+        dx = (event.mouse_x - self.start[0]) * factor
+        dy = (event.mouse_y - self.start[1]) * factor
+        if self.target == 'THROW_RATIO':
+            self.values['throw_ratio'] = self.initial['throw_ratio'] * math.exp(dx * EXP_SPEED)
+        elif self.target == 'LENS_SHIFT':
+            self.values['h_shift'] = self.initial['h_shift'] + dx * SHIFT_SPEED
+            self.values['v_shift'] = self.initial['v_shift'] + dy * SHIFT_SPEED
+        else:
+            self.values['focus_distance'] = max(0.01, self.initial['focus_distance'] * math.exp(dx * EXP_SPEED))
+
+    def write_values(self, values):
+        """ Write the values as ID properties, which doesn't trigger the update callbacks. """
+        proj_settings = self.projector.proj_settings
+        for name, value in values.items():
+            proj_settings[name] = value
+
+    def preview(self, context):
+        """ Only update what is needed to see the new frustum. """
+        self.write_values(self.values)
+        proj_settings = self.projector.proj_settings
+        cam = self.projector.data
+        cam.lens = 10 * proj_settings.throw_ratio
+        cam.shift_x = proj_settings.h_shift / -100
+        cam.shift_y = proj_settings.v_shift / -100
+        update_projection_helper(proj_settings, context)
+        text = ', '.join(f'{name.replace("_", " ").title()}: {value:.3f}' for name, value in self.values.items())
+        context.area.header_text_set(text)
+
+    def finish(self, context, values):
+        context.window_manager.event_timer_remove(self._timer)
+        context.area.header_text_set(None)
+        self.write_values(values)
+        ADJUST_UPDATES[self.target](self.projector.proj_settings, context)
+
+    def modal(self, context, event):
+        if event.type == 'MOUSEMOVE':
+            self.compute_values(event)
+            self.dirty = True
+        elif event.type == 'TIMER':
+            if self.dirty:
+                self.preview(context)
+                self.dirty = False
+        elif event.type in {'LEFTMOUSE', 'RET', 'NUMPAD_ENTER'} and event.value == 'PRESS':
+            self.finish(context, self.values)
+            return {'FINISHED'}
+        elif event.type in {'RIGHTMOUSE', 'ESC'} and event.value == 'PRESS':
+            self.finish(context, self.initial)
+            return {'CANCELLED'}
+        return {'RUNNING_MODAL'}
+
+
+def register():
+    bpy.utils.register_class(PROJECTOR_OT_adjust_interactive)
+
+
+def unregister():
+    bpy.utils.unregister_class(PROJECTOR_OT_adjust_interactive)
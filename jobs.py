@@ -0,0 +1,183 @@
+# Standard Lib imports
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Blender imports
+import bpy
+from bpy.types import Operator
+
+log = logging.getLogger(name=__file__)
+
+POLL_INTERVAL = 0.2
+
+
+class JobCancelled(Exception):
+    """ Raised inside a worker when its job got cancelled. """
+
+
+class Job:
+    """ A unit of work running in the background.
+    Thread jobs get the job as first argument and can report their progress with it.
+    """
+
+    def __init__(self, key, label, on_done=None, use_processes=False):
+        self.key = key
+        self.label = label
+        self.on_done = on_done
+        self.use_processes = use_processes
+        self.progress = 0.0
+        self.started = time.time()
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+        if self.future:
+            self.future.cancel()
+
+    def report(self, progress):
+        """ Report the progress (0-1) from inside the worker. Raises JobCancelled if the job was cancelled. """
+        if self.cancelled:
+            raise JobCancelled(self.key)
+        self.progress = min(max(progress, 0.0), 1.0)
+
+
+class JobScheduler:
+    """ Run pure NumPy work in a thread or process pool and hand the results back to the main thread.
+    Jobs are identified by a key. Submitting a job with a key that is still pending
+    cancels the older job, so repeated requests are coalesced into the latest one.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.jobs = {}
+        self._threads = None
+        self._processes = None
+
+    def _thread_pool(self):
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.max_workers)
+        return self._threads
+
+    def _process_pool(self):
+        if self._processes is None:
+            if bpy.app.version < (2, 91):
+                # Older versions report the blender binary as the python executable.
+                multiprocessing.set_executable(bpy.app.binary_path_python)
+            self._processes = ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._processes
+
+    def submit(self, key, func, *args, label=None, on_done=None, use_processes=False):
+        """ Run func in the background and call on_done(result) on the main thread when it finished.
+        Process jobs call func(*args), func has to be picklable and importable without Blender.
+        Thread jobs call func(job, *args).
+        """
+        previous = self.jobs.pop(key, None)
+        if previous:
+            log.debug(f'Coalesce job: {key}')
+            previous.cancel()
+
+        job = Job(key, label or key, on_done, use_processes)
+        if use_processes:
+            job.future = self._process_pool().submit(func, *args)
+        else:
+            job.future = self._thread_pool().submit(func, job, *args)
+        self.jobs[key] = job
+
+        if not bpy.app.timers.is_registered(poll_jobs):
+            bpy.app.timers.register(poll_jobs, first_interval=POLL_INTERVAL)
+        return job
+
+    def cancel(self, key):
+        job = self.jobs.pop(key, None)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        for key in list(self.jobs):
+            self.cancel(key)
+
+    def poll(self):
+        """ Hand over finished results. Has to be called on the main thread. """
+        for key, job in list(self.jobs.items()):
+            if not job.future.done():
+                continue
+            del self.jobs[key]
+            if job.cancelled or job.future.cancelled():
+                continue
+            try:
+                result = job.future.result()
+            except JobCancelled:
+                continue
+            except Exception:
+                log.exception(f'Job failed: {job.label}')
+                continue
+            log.debug(f'Job finished in {time.time() - job.started:.2f}s: {job.label}')
+            if job.on_done:
+                job.on_done(result)
+        return bool(self.jobs)
+
+    def shutdown(self):
+        self.cancel_all()
+        for pool in (self._threads, self._processes):
+            if pool:
+                pool.shutdown(wait=False)
+        self._threads = None
+        self._processes = None
+
+
+scheduler = JobScheduler()
+
+
+def tag_redraw_view3d():
+    """ Redraw the 3D Viewports to show the progress of running jobs. """
+    wm = bpy.context.window_manager
+    if wm is None:
+        return
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+def poll_jobs():
+    """ Timer callback which feeds finished jobs back to the main thread. """
+    running = scheduler.poll()
+    tag_redraw_view3d()
+    return POLL_INTERVAL if running else None
+
+
+class PROJECTOR_OT_cancel_job(Operator):
+    """ Cancel a running background job. """
+    bl_idname = 'projector.cancel_job'
+    bl_label = 'Cancel Job'
+    bl_options = {'REGISTER'}
+
+    key: bpy.props.StringProperty() # type: ignore
+
+    def execute(self, context):
+        if self.key:
+            scheduler.cancel(self.key)
+        else:
+            scheduler.cancel_all()
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(PROJECTOR_OT_cancel_job)
+
+
+def unregister():
+    scheduler.shutdown()
+    if bpy.app.timers.is_registered(poll_jobs):
+        bpy.app.timers.unregister(poll_jobs)
+    bpy.utils.unregister_class(PROJECTOR_OT_cancel_job)
@@ -0,0 +1,140 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+from bpy.types import Operator
+
+from .helper import SHARED_RIG, get_projector, is_linked
+from .index import is_projector, projector_index
+from .projector import create_projector_textures
+
+log = logging.getLogger(name=__file__)
+
+RIG_COLLECTION = 'Projector Rig'
+
+
+def save_rig_library(projector, filepath):
+    """ Write the projector with all its child objects into a library .blend file.
+    The rig is stored as a collection which is marked as an asset in Blender 3.0+.
+    """
+    collection = bpy.data.collections.new(RIG_COLLECTION)
+    try:
+        for obj in [projector, *projector.children]:
+            collection.objects.link(obj)
+        if bpy.app.version >= (3, 0):
+            collection.asset_mark()
+        bpy.data.libraries.write(filepath, {collection}, path_remap='RELATIVE_ALL', fake_user=True)
+    finally:
+        bpy.data.collections.remove(collection)
+
+
+def localize_rig(projector):
+    """ Give a linked projector local copies of its camera and light data, which nearly every update writes to.
+    The node groups, helpers and materials stay shared with the library until the first update which
+    writes to them, see helper.localize_shared_rig(). The body mesh and the textures are always shared.
+    """
+    for obj in [projector, *projector.children]:
+        if obj.type in {'CAMERA', 'LIGHT'} and is_linked(obj.data):
+            obj.data = obj.data.copy()
+    projector[SHARED_RIG] = True
+    # The helpers live in the rig collection of the instance.
+    projector.proj_settings.helper_collection = None
+
+
+def link_rig(context, filepath):
+    """ Link the projector rig from a library file into the scene and return the new projector.
+    Blender 3.2+ creates a library override of the rig, so only the projector settings are stored
+    in this file. Older versions get local objects which still share the linked data.
+    """
+    with bpy.data.libraries.load(filepath, link=True, relative=True) as (data_from, data_to):
+        if RIG_COLLECTION not in data_from.collections:
+            raise ValueError(f'{filepath} contains no "{RIG_COLLECTION}" collection')
+        data_to.collections = [RIG_COLLECTION]
+    collection = data_to.collections[0]
+
+    if bpy.app.version >= (3, 2):
+        instance = collection.override_hierarchy_create(context.scene, context.view_layer, do_fully_editable=True)
+        if not context.scene.user_of_id(instance):
+            context.scene.collection.children.link(instance)
+    else:
+        instance = bpy.data.collections.new(RIG_COLLECTION)
+        context.scene.collection.children.link(instance)
+        copies = {obj: obj.copy() for obj in collection.all_objects}
+        for obj, copy in copies.items():
+            instance.objects.link(copy)
+            if obj.parent in copies:
+                copy.parent = copies[obj.parent]
+
+    projector = next(obj for obj in instance.all_objects if is_projector(obj) and obj.parent is None)
+    create_projector_textures()
+    localize_rig(projector)
+    projector.location = context.scene.cursor.location
+    projector_index.invalidate()
+    return projector
+
+
+class PROJECTOR_OT_save_rig_library(Operator):
+    """ Save the selected projector as a rig library other files can link. """
+    bl_idname = 'projector.save_rig_library'
+    bl_label = 'Save Rig Library'
+    bl_options = {'REGISTER'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH') # type: ignore
+    filter_glob: bpy.props.StringProperty(default='*.blend', options={'HIDDEN'}) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        projector = get_projector(context)
+        return projector is not None and not is_linked(projector)
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = 'projector_rig.blend'
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        filepath = bpy.path.ensure_ext(self.filepath, '.blend')
+        save_rig_library(get_projector(context), filepath)
+        self.report({'INFO'}, f'Projector rig saved to {filepath}')
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_link_rig(Operator):
+    """ Add a projector linked from a rig library. """
+    bl_idname = 'projector.link_rig'
+    bl_label = 'Link Projector Rig'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH') # type: ignore
+    filter_glob: bpy.props.StringProperty(default='*.blend', options={'HIDDEN'}) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        try:
+            projector = link_rig(context, self.filepath)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        bpy.ops.object.select_all(action='DESELECT')
+        projector.select_set(True)
+        context.view_layer.objects.active = projector
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(PROJECTOR_OT_save_rig_library)
+    bpy.utils.register_class(PROJECTOR_OT_link_rig)
+
+
+def unregister():
+    bpy.utils.unregister_class(PROJECTOR_OT_link_rig)
+    bpy.utils.unregister_class(PROJECTOR_OT_save_rig_library)
@@ -0,0 +1,185 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+
+from .analysis import matrix_to_numpy
+from .culling import GEOMETRY_TYPES
+from .frustum import boxes_in_frustum
+from .helper import get_child_ID_by_type
+from .index import is_projector, projector_index
+from .projector import get_image_extents
+
+log = logging.getLogger(name=__file__)
+
+RECEIVERS = '{} Receivers'
+UPDATE_DELAY = 0.25
+
+
+def light_linking_supported():
+    return bpy.app.version >= (4, 0)
+
+
+def get_spot(projector):
+    return projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+
+
+def object_boxes(obj):
+    """ Return the world space bounding box corners of an object, or of the objects it instances. """
+    if obj.type in GEOMETRY_TYPES:
+        sources = [(obj, matrix_to_numpy(obj.matrix_world))]
+    elif obj.instance_type == 'COLLECTION' and obj.instance_collection is not None:
+        offset = np.eye(4)
+        offset[:3, 3] = -np.array(obj.instance_collection.instance_offset)
+        instancer = matrix_to_numpy(obj.matrix_world) @ offset
+        sources = [(child, instancer @ matrix_to_numpy(child.matrix_world))
+                   for child in obj.instance_collection.all_objects if child.type in GEOMETRY_TYPES]
+    else:
+        return []
+    boxes = []
+    for source, matrix in sources:
+        corners = np.array([tuple(corner) for corner in source.bound_box], dtype=np.float64)
+        boxes.append(corners @ matrix[:3, :3].T + matrix[:3, 3])
+    return boxes
+
+
+def get_receiver_candidates(scene):
+    """ Return the objects a projector could light with their bounding boxes, the projector helpers excluded. """
+    objects, boxes = [], []
+    for obj in scene.objects:
+        if obj.parent is not None and is_projector(obj.parent):
+            continue
+        for box in object_boxes(obj):
+            objects.append(obj)
+            boxes.append(box)
+    return objects, np.array(boxes) if boxes else np.empty((0, 8, 3))
+
+
+def reached_objects(projector, context, objects, boxes):
+    """ Return the objects with at least one bounding box inside the frustum of the projector. """
+    to_local = matrix_to_numpy(projector.matrix_world.inverted())
+    extents = get_image_extents(projector.proj_settings, context)
+    inside = boxes_in_frustum(boxes, to_local, extents)
+    return {obj for obj, hit in zip(objects, inside) if hit}
+
+
+def sync_receivers(projector, receivers):
+    """ Make the receiver collection of the projectors spot light hold exactly the given objects. """
+    spot = get_spot(projector)
+    collection = spot.light_linking.receiver_collection
+    if collection is None:
+        collection = bpy.data.collections.new(RECEIVERS.format(projector.name))
+        spot.light_linking.receiver_collection = collection
+    current = set(collection.objects)
+    for obj in current - receivers:
+        collection.objects.unlink(obj)
+    for obj in receivers - current:
+        collection.objects.link(obj)
+    return collection
+
+
+def update_light_linking(context):
+    """ Link every light projector only to the objects its frustum reaches. """
+    scene = context.scene
+    objects, boxes = get_receiver_candidates(scene)
+    for projector in projector_index.get_projectors(scene):
+        if projector.proj_settings.projection_mode != 'LIGHT':
+            continue
+        sync_receivers(projector, reached_objects(projector, context, objects, boxes))
+
+
+def clear_light_linking(context):
+    for projector in projector_index.get_projectors(context.scene):
+        spot = get_spot(projector)
+        collection = spot.light_linking.receiver_collection
+        if collection is not None:
+            spot.light_linking.receiver_collection = None
+            if collection.users == 0:
+                bpy.data.collections.remove(collection)
+
+
+def delayed_update():
+    scene = bpy.context.scene
+    if scene is not None and scene.projector_light_linking.auto_update:
+        update_light_linking(bpy.context)
+    return None
+
+
+@persistent
+def update_light_linking_handler(scene, depsgraph):
+    """ Follow moved projectors and objects. The update runs once after a short delay, not on every change. """
+    if not scene.projector_light_linking.auto_update:
+        return
+    moved = any(update.is_updated_transform for update in depsgraph.updates
+                if isinstance(update.id, bpy.types.Object))
+    if moved and not bpy.app.timers.is_registered(delayed_update):
+        bpy.app.timers.register(delayed_update, first_interval=UPDATE_DELAY)
+
+
+def update_auto_update(settings, context):
+    if settings.auto_update:
+        update_light_linking(context)
+
+
+class ProjectorLightLinkingSettings(bpy.types.PropertyGroup):
+    auto_update: bpy.props.BoolProperty(
+        name="Auto Update",
+        description="Update the light linking when projectors or objects are moved",
+        default=False,
+        update=update_auto_update) # type: ignore
+
+
+class PROJECTOR_OT_update_light_linking(Operator):
+    """ Link every projector only to the objects its frustum reaches. """
+    bl_idname = 'projector.update_light_linking'
+    bl_label = 'Update Light Linking'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return light_linking_supported()
+
+    def execute(self, context):
+        update_light_linking(context)
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_clear_light_linking(Operator):
+    """ Let all projectors light every object again. """
+    bl_idname = 'projector.clear_light_linking'
+    bl_label = 'Clear Light Linking'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return light_linking_supported()
+
+    def execute(self, context):
+        context.scene.projector_light_linking.auto_update = False
+        clear_light_linking(context)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(ProjectorLightLinkingSettings)
+    bpy.utils.register_class(PROJECTOR_OT_update_light_linking)
+    bpy.utils.register_class(PROJECTOR_OT_clear_light_linking)
+    bpy.types.Scene.projector_light_linking = bpy.props.PointerProperty(
+        type=ProjectorLightLinkingSettings)
+    if light_linking_supported():
+        bpy.app.handlers.depsgraph_update_post.append(update_light_linking_handler)
+
+
+def unregister():
+    if update_light_linking_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(update_light_linking_handler)
+    if bpy.app.timers.is_registered(delayed_update):
+        bpy.app.timers.unregister(delayed_update)
+    del bpy.types.Scene.projector_light_linking
+    bpy.utils.unregister_class(PROJECTOR_OT_clear_light_linking)
+    bpy.utils.unregister_class(PROJECTOR_OT_update_light_linking)
+    bpy.utils.unregister_class(ProjectorLightLinkingSettings)
@@ -0,0 +1,286 @@
+""" Live feed of frames from an external player into the projected image.
+Frames start with a little endian header: a uint64 sequence counter, uint32 width and uint32 height,
+followed by width * height RGBA uint8 pixels, bottom row first.
+
+Shared memory is a sequence lock: the player increments the counter to an odd value before it writes
+a frame and to the next even value once the frame is complete. A frame is only taken if the counter
+was even and did not change while it was copied. The segment belongs to the player, it is never unlinked.
+A watched file is read again whenever it changes, the player replaces it atomically (writes a temporary
+file and renames it over the watched one), the counter is not checked.
+"""
+# Standard Lib imports
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+# Blender imports
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+
+from .helper import get_projectors
+from .jobs import tag_redraw_view3d
+from .projector import LIVE_FEED_IMAGE, Textures
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    # Python < 3.8 (Blender < 2.91).
+    shared_memory = None
+
+log = logging.getLogger(name=__file__)
+
+HEADER = struct.Struct('<QII')
+# Number of applied frames the frame rate is averaged over.
+FPS_WINDOW = 30
+
+# Running feeds by projector name.
+_feeds = {}
+
+
+class SharedMemorySource:
+    def __init__(self, name):
+        if shared_memory is None:
+            raise RuntimeError('Shared memory feeds need Blender 2.91 or newer')
+        if sys.version_info >= (3, 13):
+            self.memory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            if os.name == 'posix':
+                # Attaching registers the segment too, the tracker would unlink it when Blender exits.
+                resource_tracker.unregister(self.memory._name, 'shared_memory')
+
+    def read(self, last_frame, out):
+        """ Convert a new frame into out. Returns the sequence counter or None if there is no complete new frame. """
+        buffer = self.memory.buf
+        sequence, width, height = HEADER.unpack_from(buffer)
+        if sequence % 2 or sequence == last_frame:
+            # The player is writing, or there is no new frame.
+            return None
+        check_size(width, height, out)
+        pixels = np.frombuffer(buffer, dtype=np.uint8, count=out.size, offset=HEADER.size)
+        np.multiply(pixels, 1 / 255, out=out, casting='unsafe')
+        del pixels
+        # The player started another frame while this one was copied, it is torn.
+        if HEADER.unpack_from(buffer)[0] != sequence:
+            return None
+        return sequence
+
+    def close(self):
+        # The segment belongs to the player, it is only closed and never unlinked.
+        self.memory.close()
+
+
+class FileSource:
+    def __init__(self, path):
+        self.path = path
+        self.stamp = None
+
+    def read(self, last_frame, out):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.stamp or stat.st_size < HEADER.size + out.size:
+            return None
+        with open(self.path, 'rb') as f:
+            data = f.read(HEADER.size + out.size)
+        if len(data) < HEADER.size + out.size:
+            # Still being written.
+            return None
+        self.stamp = stamp
+        frame, width, height = HEADER.unpack_from(data)
+        check_size(width, height, out)
+        np.multiply(np.frombuffer(data, dtype=np.uint8, offset=HEADER.size), 1 / 255, out=out, casting='unsafe')
+        return frame
+
+    def close(self):
+        pass
+
+
+def check_size(width, height, out):
+    if width * height * 4 != out.size:
+        raise ValueError(f'Frame is {width}x{height}, the projector image has {out.size // 4} pixels')
+
+
+class LiveFeed:
+    """ Double buffered feed: a reader thread converts new frames into the back buffer and swaps it
+    with the front buffer, the main thread copies the front buffer into the image on a fixed refresh rate.
+    The image is never reallocated and the main thread never waits for the source.
+    """
+
+    def __init__(self, source, width, height, rate):
+        self.source = source
+        self.size = (width, height)
+        self.interval = 1 / rate
+        self.front = np.zeros(width * height * 4, dtype=np.float32)
+        self.back = np.zeros_like(self.front)
+        self.fresh = False
+        self.frame = None
+        self.error = None
+        self.next_refresh = time.perf_counter()
+        self.applied = deque(maxlen=FPS_WINDOW)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                frame = self.source.read(self.frame, self.back)
+                self.error = None
+            except (OSError, ValueError) as e:
+                frame = None
+                self.error = str(e)
+            if frame is not None:
+                with self._lock:
+                    self.front, self.back = self.back, self.front
+                    self.fresh = True
+                    self.frame = frame
+            # Poll twice per refresh, so a new frame is ready for every refresh.
+            self._stop.wait(self.interval / 2)
+
+    def apply(self, image):
+        """ Copy the latest frame into the image, if there is a new one. """
+        with self._lock:
+            if not self.fresh:
+                return False
+            image.pixels.foreach_set(self.front)
+            self.fresh = False
+        image.update()
+        self.applied.append(time.perf_counter())
+        return True
+
+    @property
+    def fps(self):
+        if len(self.applied) < 2:
+            return 0.0
+        return (len(self.applied) - 1) / (self.applied[-1] - self.applied[0])
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+        self.source.close()
+
+
+def get_feed(projector):
+    return _feeds.get(projector.name)
+
+
+def start_feed(projector):
+    """ Start (or restart) the live feed of a projector. """
+    stop_feed(projector.name)
+    proj_settings = projector.proj_settings
+    image = bpy.data.images.get(LIVE_FEED_IMAGE.format(projector.name))
+    if image is None:
+        raise RuntimeError(f'{projector.name} does not project a live feed')
+    path = proj_settings.live_feed_path
+    if proj_settings.live_feed_source == 'SHARED_MEMORY':
+        source = SharedMemorySource(path)
+    else:
+        source = FileSource(bpy.path.abspath(path))
+    width, height = image.size
+    _feeds[projector.name] = LiveFeed(source, width, height, proj_settings.live_feed_rate)
+    if not bpy.app.timers.is_registered(refresh_feeds):
+        bpy.app.timers.register(refresh_feeds)
+
+
+def stop_feed(name):
+    feed = _feeds.pop(name, None)
+    if feed is not None:
+        feed.stop()
+
+
+def stop_all_feeds():
+    for name in list(_feeds):
+        stop_feed(name)
+
+
+def refresh_feeds():
+    """ Timer which writes the latest frames into the projector images, each feed at its own refresh rate. """
+    now = time.perf_counter()
+    updated = False
+    for name, feed in list(_feeds.items()):
+        image = bpy.data.images.get(LIVE_FEED_IMAGE.format(name))
+        if image is None or tuple(image.size) != feed.size:
+            # The projector was removed or its resolution changed.
+            stop_feed(name)
+            continue
+        if now >= feed.next_refresh:
+            # Keep the rate fixed, but don't try to catch up on missed refreshes.
+            feed.next_refresh = max(feed.next_refresh + feed.interval, now)
+            updated |= feed.apply(image)
+    if updated:
+        tag_redraw_view3d()
+    if not _feeds:
+        return None
+    return max(0.0, min(feed.next_refresh for feed in _feeds.values()) - time.perf_counter())
+
+
+@persistent
+def stop_feeds_on_load(*args):
+    stop_all_feeds()
+
+
+def get_feed_projectors(context):
+    return [projector for projector in get_projectors(context, only_selected=True)
+            if projector.proj_settings.projected_texture == Textures.LIVE_FEED.value]
+
+
+class PROJECTOR_OT_start_live_feed(Operator):
+    """ Start refreshing the projected image of the selected projectors from their live feed. """
+    bl_idname = 'projector.start_live_feed'
+    bl_label = 'Start Live Feed'
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_feed_projectors(context))
+
+    def execute(self, context):
+        for projector in get_feed_projectors(context):
+            try:
+                start_feed(projector)
+            except (OSError, ValueError, RuntimeError) as e:
+                self.report({'ERROR'}, f'{projector.name}: {e}')
+                return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_stop_live_feed(Operator):
+    """ Stop the live feed of the selected projectors. """
+    bl_idname = 'projector.stop_live_feed'
+    bl_label = 'Stop Live Feed'
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return any(get_feed(projector) for projector in get_feed_projectors(context))
+
+    def execute(self, context):
+        for projector in get_feed_projectors(context):
+            stop_feed(projector.name)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(PROJECTOR_OT_start_live_feed)
+    bpy.utils.register_class(PROJECTOR_OT_stop_live_feed)
+    bpy.app.handlers.load_pre.append(stop_feeds_on_load)
+
+
+def unregister():
+    if stop_feeds_on_load in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(stop_feeds_on_load)
+    if bpy.app.timers.is_registered(refresh_feeds):
+        bpy.app.timers.unregister(refresh_feeds)
+    stop_all_feeds()
+    bpy.utils.unregister_class(PROJECTOR_OT_stop_live_feed)
+    bpy.utils.unregister_class(PROJECTOR_OT_start_live_feed)
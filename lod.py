@@ -0,0 +1,158 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+from mathutils import Vector
+
+from .helper import ensure_helper_collection, get_helper_layer_collection, get_projectors, is_lightweight
+from .index import projector_index
+from .projector import update_projection_helper
+
+log = logging.getLogger(name=__file__)
+
+LOD_INTERVAL = 0.5
+
+# View layer, projector index generation and visible projectors the helpers were last excluded for.
+_applied = None
+
+LOD_MODES = [('OFF', 'Off', 'Always show the helper objects', 1),
+             ('DISTANCE', 'Distance', 'Exclude the helpers of projectors far away from the view', 2),
+             ('COUNT', 'Count', 'Only show the helpers of the closest projectors', 3),
+             ('SELECTED', 'Selected', 'Only show the helpers of selected projectors', 4)]
+
+
+def get_view_location(context):
+    """ Return the location of the first 3D Viewport, the scene camera or the 3D cursor. """
+    screen = context.screen
+    if screen:
+        for area in screen.areas:
+            if area.type == 'VIEW_3D':
+                return area.spaces.active.region_3d.view_matrix.inverted().translation
+    if context.scene.camera:
+        return context.scene.camera.matrix_world.translation
+    return Vector(context.scene.cursor.location)
+
+
+def get_visible_projectors(projectors, lod, view_location):
+    """ Return the projectors whose helpers should be part of the view layer. """
+    if lod.mode == 'OFF':
+        return set(projectors)
+    if lod.mode == 'SELECTED':
+        return {projector for projector in projectors if projector.select_get()}
+
+    distances = [((projector.matrix_world.translation - view_location).length, projector)
+                 for projector in projectors]
+    if lod.mode == 'DISTANCE':
+        return {projector for distance, projector in distances if distance <= lod.distance}
+    distances.sort(key=lambda item: item[0])
+    return {projector for _, projector in distances[:lod.max_count]}
+
+
+def apply_lod(context, force=False):
+    """ Exclude the helper collections of all projectors which are not visible by the current policy.
+    Excluded collections are not evaluated by the depsgraph. Helpers which become visible again
+    are brought up to date, because their updates were skipped while excluded.
+    Nothing is written unless the visible projectors changed since the last call or force is set.
+    """
+    global _applied
+    scene = context.scene
+    view_layer = context.view_layer
+    projectors = get_projectors(context)
+    visible = get_visible_projectors(projectors, scene.projector_lod, get_view_location(context))
+    applied = (view_layer.as_pointer(), projector_index.generation,
+               frozenset(projector.as_pointer() for projector in visible))
+    if applied == _applied and not force:
+        return
+    _applied = applied
+
+    for projector in projectors:
+        layer_collection = get_helper_layer_collection(projector, view_layer)
+        if layer_collection is None:
+            continue
+        exclude = projector not in visible
+        if layer_collection.exclude != exclude:
+            layer_collection.exclude = exclude
+            if not exclude:
+                update_projection_helper(projector.proj_settings, context)
+
+
+def lod_timer():
+    """ Re-evaluate the level of detail policy while it is active. """
+    scene = bpy.context.scene
+    if scene is None or scene.projector_lod.mode == 'OFF':
+        return None
+    apply_lod(bpy.context)
+    return LOD_INTERVAL
+
+
+@persistent
+def restart_lod_timer(*args):
+    """ The timer stops while the policy is off, a loaded file may have it turned on. """
+    scene = bpy.context.scene
+    if scene is not None and scene.projector_lod.mode != 'OFF' and not bpy.app.timers.is_registered(lod_timer):
+        bpy.app.timers.register(lod_timer, first_interval=LOD_INTERVAL, persistent=True)
+
+
+def update_lod(lod_settings, context):
+    apply_lod(context, force=True)
+    if lod_settings.mode != 'OFF' and not bpy.app.timers.is_registered(lod_timer):
+        bpy.app.timers.register(lod_timer, first_interval=LOD_INTERVAL, persistent=True)
+
+
+class ProjectorLODSettings(bpy.types.PropertyGroup):
+    mode: bpy.props.EnumProperty(
+        items=LOD_MODES,
+        name="Helper Level of Detail",
+        default='OFF',
+        description="When to exclude projector helper objects from the view layer",
+        update=update_lod) # type: ignore
+
+    distance: bpy.props.FloatProperty(
+        name="Distance",
+        description="Exclude helpers of projectors further away from the view than this distance",
+        default=25.0, min=0,
+        update=update_lod,
+        subtype='DISTANCE') # type: ignore
+
+    max_count: bpy.props.IntProperty(
+        name="Count",
+        description="Number of closest projectors which keep their helpers",
+        default=20, min=0,
+        update=update_lod) # type: ignore
+
+
+class PROJECTOR_OT_apply_lod(Operator):
+    """ Apply the helper level of detail policy now. """
+    bl_idname = 'projector.apply_lod'
+    bl_label = 'Apply Helper Level of Detail'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        # Also repairs helpers which were moved out of their managed collection.
+        for projector in get_projectors(context):
+            if not is_lightweight(projector):
+                ensure_helper_collection(projector, context.scene)
+        apply_lod(context, force=True)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(ProjectorLODSettings)
+    bpy.utils.register_class(PROJECTOR_OT_apply_lod)
+    bpy.types.Scene.projector_lod = bpy.props.PointerProperty(
+        type=ProjectorLODSettings)
+    bpy.app.timers.register(lod_timer, first_interval=LOD_INTERVAL, persistent=True)
+    bpy.app.handlers.load_post.append(restart_lod_timer)
+
+
+def unregister():
+    if restart_lod_timer in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(restart_lod_timer)
+    if bpy.app.timers.is_registered(lod_timer):
+        bpy.app.timers.unregister(lod_timer)
+    del bpy.types.Scene.projector_lod
+    bpy.utils.unregister_class(PROJECTOR_OT_apply_lod)
+    bpy.utils.unregister_class(ProjectorLODSettings)
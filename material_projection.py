@@ -0,0 +1,349 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+
+from .helper import auto_offset
+from .index import projector_index
+
+log = logging.getLogger(name=__file__)
+
+LAYER_GROUP = '_Projector_Layer.{}'
+UV_MAP = 'Proj_{}'
+MODIFIER = 'Projector {}'
+TARGET_MATERIAL = 'Projector_Target_Mat'
+# Object idprop of projectors: the key the names above are made from.
+LAYER_KEY = 'projector_layer_key'
+# Material idprop of the copies made for targets: the name of the material they were copied from.
+SOURCE_MATERIAL = 'projector_source_material'
+
+
+def key_owner(key):
+    """ Return the projector the UV Project modifiers with the key point at, None if there are no targets. """
+    name = MODIFIER.format(key)
+    for obj in bpy.context.scene.objects:
+        mod = obj.modifiers.get(name)
+        if mod is not None and mod.type == 'UV_PROJECT' and mod.projector_count:
+            return mod.projectors[0].object
+    return None
+
+
+def key_taken(key, projector):
+    """ True if the layer of another projector uses the key. """
+    owner = key_owner(key)
+    if owner is not None:
+        return owner != projector
+    return any(other != projector and other.get(LAYER_KEY) == key
+               for other in projector_index.get_projectors(bpy.context.scene))
+
+
+def unique_key(name):
+    key = name
+    i = 0
+    while bpy.data.node_groups.get(LAYER_GROUP.format(key)) is not None:
+        i += 1
+        key = f'{name}.{i:03d}'
+    return key
+
+
+def layer_key(projector):
+    """ Return the key the names of the layer group, UV map and modifiers of a projector are made from.
+    It is the name of the projector when it first got its layer, so renaming the projector keeps them connected.
+    A duplicated projector shares the key of its original, it gets a key of its own here.
+    """
+    key = projector.get(LAYER_KEY)
+    if key is None or (key != projector.name and key_taken(key, projector)):
+        # Layers made before the key was stored are named after the projector.
+        key = projector.name
+        if key_taken(key, projector):
+            key = unique_key(key)
+        projector[LAYER_KEY] = key
+    return key
+
+
+def uv_map_name(projector):
+    return UV_MAP.format(layer_key(projector))
+
+
+def create_layer_group(projector):
+    """ Create the node group which is added to the materials of the target objects.
+    It looks up the projected texture through the UV map written by the UV Project modifier.
+    """
+    node_group = bpy.data.node_groups.new(LAYER_GROUP.format(layer_key(projector)), 'ShaderNodeTree')
+
+    # Create output sockets for the node group.
+    if(bpy.app.version >= (4, 0)):
+        node_group.interface.new_socket('Shader', in_out='OUTPUT', socket_type='NodeSocketShader')
+        node_group.interface.new_socket('Mask', in_out='OUTPUT', socket_type='NodeSocketFloat')
+    else:
+        outputs = node_group.outputs
+        outputs.new('NodeSocketShader', 'Shader')
+        outputs.new('NodeSocketFloat', 'Mask')
+
+    nodes = node_group.nodes
+    auto_pos = auto_offset()
+
+    uv_map = nodes.new('ShaderNodeUVMap')
+    uv_map.name = 'UV Map'
+    uv_map.uv_map = uv_map_name(projector)
+    uv_map.location = auto_pos(200)
+
+    # The color grid image is only used for its alpha, which masks everything outside of the projection.
+    mask = nodes.new('ShaderNodeTexImage')
+    mask.name = 'Mask'
+    mask.extension = 'CLIP'
+    mask.location = auto_pos(200, y=300)
+
+    img = nodes.new('ShaderNodeTexImage')
+    img.name = 'Image Texture'
+    img.extension = 'CLIP'
+    img.location = auto_pos(y=0)
+    ensure_canvas_mapping(node_group)
+
+    checker_tex = nodes.new('ShaderNodeTexChecker')
+    checker_tex.name = 'Checker Texture'
+    checker_tex.inputs[3].default_value = 8
+    checker_tex.inputs[1].default_value = (1, 1, 1, 1)
+    checker_tex.location = auto_pos(y=-300)
+
+    mix_rgb = nodes.new('ShaderNodeMixRGB')
+    mix_rgb.name = 'Mix'
+    mix_rgb.inputs[1].default_value = (0, 0, 0, 1)
+    mix_rgb.location = auto_pos(200, y=-300)
+
+    emission = nodes.new('ShaderNodeEmission')
+    emission.name = 'Emission'
+    emission.location = auto_pos(200)
+
+    group_output = nodes.new('NodeGroupOutput')
+    group_output.location = auto_pos(200)
+
+    links = node_group.links
+    links.new(uv_map.outputs[0], mask.inputs['Vector'])
+    links.new(uv_map.outputs[0], img.inputs['Vector'])
+    links.new(uv_map.outputs[0], checker_tex.inputs['Vector'])
+    links.new(mask.outputs['Alpha'], mix_rgb.inputs[0])
+    links.new(checker_tex.outputs['Color'], mix_rgb.inputs[2])
+    links.new(emission.outputs[0], group_output.inputs[0])
+    links.new(mask.outputs['Alpha'], group_output.inputs[1])
+    return node_group
+
+
+def ensure_canvas_mapping(node_group):
+    """ Return the mapping node between the UV map and the image, it maps the projector image onto its part
+    of the shared canvas. Groups created before the canvas get it added.
+    """
+    nodes = node_group.nodes
+    mapping = nodes.get('Canvas Mapping')
+    if mapping is None:
+        mapping = nodes.new('ShaderNodeMapping')
+        mapping.name = 'Canvas Mapping'
+        mapping.vector_type = 'POINT'
+        img = nodes['Image Texture']
+        mapping.location = (img.location[0] - 200, img.location[1] - 150)
+        node_group.links.new(nodes['UV Map'].outputs[0], mapping.inputs['Vector'])
+        node_group.links.new(mapping.outputs['Vector'], img.inputs['Vector'])
+    return mapping
+
+
+def copy_mapping(source, target):
+    """ Copy location, rotation and scale of a mapping node, reset to identity without a source. """
+    for name, default in (('Location', (0, 0, 0)), ('Rotation', (0, 0, 0)), ('Scale', (1, 1, 1))):
+        value = tuple(source.inputs[name].default_value) if source is not None else default
+        if tuple(target.inputs[name].default_value) != value:
+            target.inputs[name].default_value = value
+
+
+def get_layer_group(projector, create=True):
+    group = bpy.data.node_groups.get(LAYER_GROUP.format(layer_key(projector)))
+    if group is None and create:
+        group = create_layer_group(projector)
+    return group
+
+
+def update_layer_group(projector, use_checker, image, mask_image, color, strength, canvas_mapping=None):
+    """ Sync the layer node group with the projector settings.
+    canvas_mapping is the mapping node of the light which looks up the shared canvas, if the canvas is projected.
+    """
+    group = get_layer_group(projector)
+    nodes = group.nodes
+    copy_mapping(canvas_mapping, ensure_canvas_mapping(group))
+    nodes['UV Map'].uv_map = uv_map_name(projector)
+    nodes['Mask'].image = mask_image
+    nodes['Image Texture'].image = image
+    nodes['Checker Texture'].inputs['Color2'].default_value = color
+    nodes['Emission'].inputs['Strength'].default_value = strength
+    source = nodes['Mix'] if use_checker else nodes['Image Texture']
+    group.links.new(source.outputs['Color'], nodes['Emission'].inputs['Color'])
+
+
+def get_material_output(tree):
+    outputs = [node for node in tree.nodes if node.type == 'OUTPUT_MATERIAL']
+    for node in outputs:
+        if node.is_active_output:
+            return node
+    return outputs[0] if outputs else tree.nodes.new('ShaderNodeOutputMaterial')
+
+
+def add_layer_to_material(material, group):
+    """ Add the projection on top of the existing surface shader of a material. """
+    material.use_nodes = True
+    tree = material.node_tree
+    if tree.nodes.get(group.name):
+        return
+    output = get_material_output(tree)
+    surface = output.inputs['Surface']
+
+    layer = tree.nodes.new('ShaderNodeGroup')
+    layer.node_tree = group
+    layer.name = group.name
+    layer.label = 'Projector Layer'
+    layer.location = (output.location[0] - 200, output.location[1] - 200)
+
+    add = tree.nodes.new('ShaderNodeAddShader')
+    add.name = group.name + ' Add'
+    add.location = (output.location[0], output.location[1] + 150)
+    output.location[0] += 200
+
+    if surface.links:
+        tree.links.new(surface.links[0].from_socket, add.inputs[0])
+    tree.links.new(layer.outputs['Shader'], add.inputs[1])
+    tree.links.new(add.outputs[0], surface)
+
+
+def remove_layer_from_material(material, group_name):
+    """ Remove the projection from a material and restore the original link. """
+    if not material.node_tree:
+        return
+    tree = material.node_tree
+    add = tree.nodes.get(group_name + ' Add')
+    if add:
+        source = add.inputs[0].links[0].from_socket if add.inputs[0].links else None
+        targets = [link.to_socket for link in add.outputs[0].links]
+        if source:
+            for socket in targets:
+                tree.links.new(source, socket)
+        tree.nodes.remove(add)
+    layer = tree.nodes.get(group_name)
+    if layer:
+        tree.nodes.remove(layer)
+
+
+def material_users(material):
+    return [obj for obj in bpy.data.objects if any(slot.material == material for slot in obj.material_slots)]
+
+
+def target_material(projector, obj, index):
+    """ Return the material of a target slot which may get the layer of the projector.
+    A material which is also used by objects without the projection is copied and the copy is assigned to
+    the target object only. The other objects have no UV map of the projector and would show its corner texel.
+    """
+    slot = obj.material_slots[index]
+    material = slot.material
+    name = MODIFIER.format(layer_key(projector))
+    if all(name in user.modifiers for user in material_users(material)):
+        return material
+    copy = material.copy()
+    copy[SOURCE_MATERIAL] = material.get(SOURCE_MATERIAL, material.name)
+    # Assigned to the object, other users of the mesh keep the original.
+    slot.link = 'OBJECT'
+    slot.material = copy
+    return copy
+
+
+def restore_material(obj, index):
+    """ Give a target the material back its copy was made from, once no projector layer is left in the copy. """
+    slot = obj.material_slots[index]
+    copy = slot.material
+    if SOURCE_MATERIAL not in copy or (copy.node_tree and any(
+            node.name.startswith(LAYER_GROUP.format('')) for node in copy.node_tree.nodes)):
+        return
+    source = bpy.data.materials.get(copy[SOURCE_MATERIAL])
+    if source is None:
+        return
+    if slot.link == 'OBJECT' and obj.data.materials[index] == source:
+        slot.material = None
+        slot.link = 'DATA'
+    else:
+        slot.material = source
+    if copy.users == 0:
+        bpy.data.materials.remove(copy)
+
+
+def get_targets(projector, objects=None):
+    """ Return all objects which receive the projection of the given projector in material mode. """
+    objects = bpy.context.scene.objects if objects is None else objects
+    name = MODIFIER.format(layer_key(projector))
+    return [obj for obj in objects
+            if obj.type == 'MESH' and name in obj.modifiers]
+
+
+def update_target(projector, obj, width, height):
+    """ Match the UV Project modifier to the aspect ratio of the projected image. """
+    mod = obj.modifiers[MODIFIER.format(layer_key(projector))]
+    mod.projectors[0].object = projector
+    mod.aspect_x = width / height
+    mod.aspect_y = 1.0
+
+
+def add_target(projector, obj, width, height):
+    """ Make an object receive the projection through a UV Project modifier and a material layer.
+    The modifier projects the vertices only, faces in between are interpolated without perspective.
+    Large faces at a steep angle to the projector need to be subdivided.
+    Return False if the object has no free UV map left.
+    """
+    name = MODIFIER.format(layer_key(projector))
+    uv_name = uv_map_name(projector)
+    mesh = obj.data
+    if uv_name not in mesh.uv_layers:
+        if mesh.uv_layers.new(name=uv_name) is None:
+            log.warning(f'{obj.name} has no free UV map for {projector.name}.')
+            return False
+
+    mod = obj.modifiers.get(name)
+    if mod is None:
+        mod = obj.modifiers.new(name, 'UV_PROJECT')
+    mod.uv_layer = uv_name
+    mod.projector_count = 1
+    update_target(projector, obj, width, height)
+
+    if not obj.material_slots:
+        material = bpy.data.materials.get(TARGET_MATERIAL) or bpy.data.materials.new(TARGET_MATERIAL)
+        mesh.materials.append(material)
+    group = get_layer_group(projector)
+    for index, slot in enumerate(obj.material_slots):
+        if slot.material:
+            add_layer_to_material(target_material(projector, obj, index), group)
+    return True
+
+
+def shares_uv_map(obj, modifier_name):
+    """ True if another target of the projector uses the mesh of the object and needs its UV map. """
+    mesh = obj.data
+    return mesh.users > 1 and any(other != obj and other.data == mesh and modifier_name in other.modifiers
+                                  for other in bpy.data.objects)
+
+
+def remove_target(projector, obj):
+    """ Stop an object from receiving the projection in material mode. """
+    name = MODIFIER.format(layer_key(projector))
+    mod = obj.modifiers.get(name)
+    if mod:
+        obj.modifiers.remove(mod)
+    uv_layer = obj.data.uv_layers.get(uv_map_name(projector))
+    if uv_layer and not shares_uv_map(obj, name):
+        obj.data.uv_layers.remove(uv_layer)
+    for index, slot in enumerate(obj.material_slots):
+        if slot.material:
+            remove_layer_from_material(slot.material, LAYER_GROUP.format(layer_key(projector)))
+            restore_material(obj, index)
+
+
+def remove_projector_layers(projector):
+    """ Remove everything the material mode added for a projector. """
+    for obj in get_targets(projector):
+        remove_target(projector, obj)
+    group = get_layer_group(projector, create=False)
+    if group:
+        bpy.data.node_groups.remove(group)
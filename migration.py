@@ -0,0 +1,89 @@
+# Standard Lib imports
+import logging
+import time
+
+# Blender imports
+import bpy
+from bpy.app.handlers import persistent
+
+from .helper import ensure_helper_collection, get_child_ID_by_type, is_lightweight, is_linked
+from .index import is_projector
+from .projector import (RIG_VERSION, RIG_VERSION_KEY, ensure_canvas_nodes, ensure_warp_nodes,
+                        update_checker_color, update_pixel_grid, update_power, update_throw_ratio)
+from .relighting import ensure_lightgroup
+
+log = logging.getLogger(name=__file__)
+
+
+def migrate_incoming_vector(tree):
+    """ Blender 4.0 removed the normal output of the texture coordinates for lights.
+    The direction to the shading point comes from the incoming vector of the geometry node instead.
+    """
+    if bpy.app.version < (4, 0):
+        return
+    nodes = tree.nodes
+    mapping = nodes['Mapping']
+    links = mapping.inputs['Vector'].links
+    if links and links[0].from_node.type == 'VECT_TRANSFORM':
+        return
+    geo = nodes.get('Geometry') or nodes.new('ShaderNodeNewGeometry')
+    vec_transform = nodes.get('Vector Transform') or nodes.new('ShaderNodeVectorTransform')
+    vec_transform.vector_type = 'NORMAL'
+    geo.location = (mapping.location[0] - 400, mapping.location[1] - 300)
+    vec_transform.location = (mapping.location[0] - 200, mapping.location[1])
+    tree.links.new(geo.outputs['Incoming'], vec_transform.inputs['Vector'])
+    tree.links.new(vec_transform.outputs['Vector'], mapping.inputs['Vector'])
+
+
+def migrate_projector(projector, context):
+    """ Bring the node setup of an older projector up to date and recompute all derived values once.
+    Blender converts the scale of pre 2.81 mapping nodes itself, the values are rewritten by update_throw_ratio.
+    """
+    spot = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+    root_tree = spot.data.node_tree
+    tree = root_tree.nodes['Group'].node_tree
+    migrate_incoming_vector(tree)
+    ensure_warp_nodes(tree)
+    ensure_canvas_nodes(root_tree)
+
+    proj_settings = projector.proj_settings
+    update_throw_ratio(proj_settings, context)
+    update_pixel_grid(proj_settings, context)
+    update_checker_color(proj_settings, context)
+    update_power(proj_settings, context)
+    ensure_lightgroup(projector, spot, context.view_layer)
+    if not is_lightweight(projector):
+        ensure_helper_collection(projector, context.scene)
+    projector[RIG_VERSION_KEY] = RIG_VERSION
+
+
+def get_outdated_projectors():
+    return [obj for obj in bpy.data.objects
+            if is_projector(obj) and not is_linked(obj) and obj.get(RIG_VERSION_KEY, 0) < RIG_VERSION]
+
+
+@persistent
+def migrate_projectors(*args):
+    """ Migrate all projectors made with older versions of the add-on in one pass after loading a file.
+    Up to date projectors are not touched, so files without old projectors load as fast as before.
+    """
+    outdated = get_outdated_projectors()
+    if not outdated:
+        return
+    start = time.time()
+    context = bpy.context
+    for projector in outdated:
+        try:
+            migrate_projector(projector, context)
+        except (KeyError, IndexError) as e:
+            log.warning(f'Could not migrate {projector.name}: {e}')
+    log.info(f'Migrated {len(outdated)} projectors in {time.time() - start:.2f}s')
+
+
+def register():
+    bpy.app.handlers.load_post.append(migrate_projectors)
+
+
+def unregister():
+    if migrate_projectors in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(migrate_projectors)
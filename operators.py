@@ -1,6 +1,18 @@
 import bpy
+from bpy.app.handlers import persistent
 from bpy.types import Operator
 
+from .helper import get_child_ID_by_type, get_projector, get_target_objects
+from .index import projector_index
+from .material_projection import add_target, remove_target
+from .projector import get_resolution, update_material_projection, update_relighting
+from .relighting import (INDEX_AOV, add_aov_outputs, aov_group_outdated, assign_aov_indices, build_aov_group,
+                         create_weight_group, ensure_lightgroup, ensure_view_layer_aovs, get_weight_group,
+                         relighting_supported, write_index_names)
+
+# Generation of the projector index the relighting setup was last synced with.
+_synced_generation = None
+
 
 class PROJECTOR_OT_switch_to_cycles(Operator):
     """ Change the render engin to cycles. """
@@ -13,9 +25,124 @@ class PROJECTOR_OT_switch_to_cycles(Operator):
         return {'FINISHED'}
 
 
+class PROJECTOR_OT_add_material_targets(Operator):
+    """ Project onto the selected objects through their materials. """
+    bl_idname = 'projector.add_material_targets'
+    bl_label = 'Add Selected as Targets'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return get_projector(context) is not None and bool(get_target_objects(context))
+
+    def execute(self, context):
+        projector = get_projector(context)
+        proj_settings = projector.proj_settings
+        w, h = get_resolution(proj_settings, context)
+        for obj in get_target_objects(context):
+            if not add_target(projector, obj, w, h):
+                self.report({'WARNING'}, f'{obj.name} has no free UV map left.')
+        if proj_settings.projection_mode == 'MATERIAL':
+            update_material_projection(proj_settings, context)
+        else:
+            proj_settings.projection_mode = 'MATERIAL'
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_remove_material_targets(Operator):
+    """ Stop projecting onto the selected objects. """
+    bl_idname = 'projector.remove_material_targets'
+    bl_label = 'Remove Selected Targets'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return get_projector(context) is not None and bool(get_target_objects(context))
+
+    def execute(self, context):
+        projector = get_projector(context)
+        for obj in get_target_objects(context):
+            remove_target(projector, obj)
+        return {'FINISHED'}
+
+
+class PROJECTOR_OT_setup_relighting(Operator):
+    """ Render every projector into its own light group and write the projector index and pixel grid AOVs
+    from the materials of the selected objects, so projectors can be rebalanced in the compositor. """
+    bl_idname = 'projector.setup_relighting'
+    bl_label = 'Setup Relighting Passes'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return relighting_supported() and bool(get_target_objects(context))
+
+    def execute(self, context):
+        projectors = projector_index.get_projectors(context.scene)
+        if not projectors:
+            self.report({'WARNING'}, 'There are no projectors in the scene.')
+            return {'CANCELLED'}
+        view_layer = context.view_layer
+        ensure_view_layer_aovs(view_layer)
+        setup_relighting_projectors(context, projectors, [view_layer])
+        aov_group = build_aov_group(projectors)
+        materials = {slot.material for obj in get_target_objects(context)
+                     for slot in obj.material_slots if slot.material is not None}
+        converted = [material.name for material in materials if not material.use_nodes]
+        for material in materials:
+            material.use_nodes = True
+            add_aov_outputs(material, aov_group)
+        if converted:
+            self.report({'WARNING'}, f'Switched to use nodes: {", ".join(sorted(converted))}')
+        self.report({'INFO'}, f'{len(projectors)} light groups, AOVs in {len(materials)} materials.')
+        return {'FINISHED'}
+
+
+def setup_relighting_projectors(context, projectors, view_layers):
+    """ Give every projector its light group, weight group and AOV index and store the index names. """
+    assign_aov_indices(projectors)
+    for projector in projectors:
+        spot = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+        for view_layer in view_layers:
+            ensure_lightgroup(projector, spot, view_layer)
+        if get_weight_group(projector) is None:
+            create_weight_group(projector)
+            update_relighting(projector.proj_settings, context)
+    for view_layer in view_layers:
+        write_index_names(view_layer, projectors)
+
+
+@persistent
+def sync_relighting_handler(scene, depsgraph):
+    """ Keep the relighting setup in sync after projectors were added, removed, duplicated or renamed.
+    Only runs when the projector index was rebuilt and the scene uses the relighting AOVs.
+    """
+    global _synced_generation
+    projectors = projector_index.get_projectors(scene)
+    if projector_index.generation == _synced_generation:
+        return
+    _synced_generation = projector_index.generation
+    view_layers = [view_layer for view_layer in scene.view_layers
+                   if any(aov.name == INDEX_AOV for aov in view_layer.aovs)]
+    if not relighting_supported() or not view_layers:
+        return
+    setup_relighting_projectors(bpy.context, projectors, view_layers)
+    if aov_group_outdated(projectors):
+        build_aov_group(projectors)
+
+
 def register():
     bpy.utils.register_class(PROJECTOR_OT_switch_to_cycles)
+    bpy.utils.register_class(PROJECTOR_OT_add_material_targets)
+    bpy.utils.register_class(PROJECTOR_OT_remove_material_targets)
+    bpy.utils.register_class(PROJECTOR_OT_setup_relighting)
+    bpy.app.handlers.depsgraph_update_post.append(sync_relighting_handler)
 
 
 def unregister():
+    if sync_relighting_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(sync_relighting_handler)
+    bpy.utils.unregister_class(PROJECTOR_OT_setup_relighting)
+    bpy.utils.unregister_class(PROJECTOR_OT_remove_material_targets)
+    bpy.utils.unregister_class(PROJECTOR_OT_add_material_targets)
     bpy.utils.unregister_class(PROJECTOR_OT_switch_to_cycles)
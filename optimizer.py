@@ -0,0 +1,248 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+import numpy as np
+from bpy.types import Operator, PropertyGroup
+from mathutils import Matrix
+
+from .analysis import matrix_to_numpy
+from .catalog import apply_model, best_model, load_catalog
+from .index import projector_index
+from .jobs import scheduler
+from .placement import MAX_COUNT, search_layout
+from .projector import RESOLUTIONS, create_projector, init_projector, update_resolution
+
+log = logging.getLogger(name=__file__)
+
+JOB_KEY = 'placement.{}'
+
+PLACEMENT_GOALS = [('COUNT', 'Count', 'Place a fixed number of projectors', 1),
+                   ('COVERAGE', 'Coverage', 'Add projectors until the coverage goal is reached', 2)]
+
+# Layouts of the running search, one per restart.
+_results = []
+
+
+def mesh_faces(obj, max_samples, seed=0):
+    """ Return world space face centers, normals and areas of a mesh, reduced to max_samples faces.
+    The areas of the remaining faces are scaled up, so the total area stays the same.
+    """
+    mesh = obj.data
+    count = len(mesh.polygons)
+    centers = np.empty(count * 3)
+    normals = np.empty(count * 3)
+    areas = np.empty(count)
+    mesh.polygons.foreach_get('center', centers)
+    mesh.polygons.foreach_get('normal', normals)
+    mesh.polygons.foreach_get('area', areas)
+    matrix = matrix_to_numpy(obj.matrix_world)
+    centers = centers.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    areas = areas * abs(np.linalg.det(matrix[:3, :3])) ** (2 / 3)
+
+    if count > max_samples:
+        total = areas.sum()
+        keep = np.random.default_rng(seed).choice(count, size=max_samples, replace=False)
+        centers, normals, areas = centers[keep], normals[keep], areas[keep]
+        areas *= total / areas.sum()
+    return centers, normals, areas
+
+
+def create_layout(context, layout, resolution, models=None):
+    """ Create a projector for every (matrix, throw ratio) of the layout.
+    With catalog models every projector becomes the brightest model which can zoom to its throw ratio.
+    """
+    projectors = []
+    for matrix, throw_ratio in layout:
+        projector = create_projector(context)
+        proj_settings = projector.proj_settings
+        init_projector(proj_settings, context)
+        proj_settings['resolution'] = next(res[3] for res in RESOLUTIONS if res[0] == resolution)
+        proj_settings['throw_ratio'] = throw_ratio
+        projector.matrix_world = Matrix(matrix)
+        # Also switches the color grid image and pixel grid to the resolution and updates the throw ratio.
+        update_resolution(proj_settings, context)
+        if models:
+            apply_model(proj_settings, context, best_model(models, throw_ratio), throw_ratio)
+        projectors.append(projector)
+    projector_index.invalidate()
+    for projector in projectors:
+        projector.select_set(True)
+    return projectors
+
+
+class ProjectorPlacementSettings(PropertyGroup):
+    target: bpy.props.PointerProperty(
+        name="Target",
+        description="Surface the projectors should cover",
+        type=bpy.types.Object,
+        poll=lambda self, obj: obj.type == 'MESH') # type: ignore
+
+    goal: bpy.props.EnumProperty(
+        items=PLACEMENT_GOALS,
+        name="Goal",
+        default='COUNT') # type: ignore
+
+    count: bpy.props.IntProperty(
+        name="Projectors",
+        default=4, min=1, soft_max=32) # type: ignore
+
+    coverage: bpy.props.FloatProperty(
+        name="Coverage",
+        description="Fraction of the target area which should be lit",
+        default=0.95, min=0.05, max=1,
+        subtype='FACTOR') # type: ignore
+
+    resolution: bpy.props.EnumProperty(
+        items=RESOLUTIONS,
+        name="Resolution",
+        default='1920x1080') # type: ignore
+
+    throw_min: bpy.props.FloatProperty(
+        name="Throw Ratio Min",
+        default=1.2, min=0.1, soft_max=5) # type: ignore
+
+    throw_max: bpy.props.FloatProperty(
+        name="Throw Ratio Max",
+        default=2.0, min=0.1, soft_max=5) # type: ignore
+
+    distance_min: bpy.props.FloatProperty(
+        name="Distance Min",
+        default=3.0, min=0.1,
+        subtype='DISTANCE') # type: ignore
+
+    distance_max: bpy.props.FloatProperty(
+        name="Distance Max",
+        default=10.0, min=0.1,
+        subtype='DISTANCE') # type: ignore
+
+    pixel_density: bpy.props.FloatProperty(
+        name="Pixel Density",
+        description="Pixels per meter which count as full quality",
+        default=200, min=1) # type: ignore
+
+    overlap_weight: bpy.props.FloatProperty(
+        name="Overlap Penalty",
+        description="How much overlapping images are penalized",
+        default=0.5, min=0, soft_max=2) # type: ignore
+
+    samples: bpy.props.IntProperty(
+        name="Samples",
+        description="Maximum number of target faces used to score a layout",
+        default=4000, min=100) # type: ignore
+
+    candidates: bpy.props.IntProperty(
+        name="Candidates",
+        description="Candidates tried for every projector",
+        default=64, min=1) # type: ignore
+
+    restarts: bpy.props.IntProperty(
+        name="Restarts",
+        description="Independent searches run in parallel, the best layout wins",
+        default=4, min=1, soft_max=16) # type: ignore
+
+    seed: bpy.props.IntProperty(
+        name="Seed",
+        default=0, min=0) # type: ignore
+
+    use_catalog: bpy.props.BoolProperty(
+        name="Use Catalog Models",
+        description="Only use throw ratios of the catalog models which offer the resolution and apply the models to the placed projectors",
+        default=False) # type: ignore
+
+
+class PROJECTOR_OT_optimize_placement(Operator):
+    """ Search a projector layout which covers the target evenly and create the projectors.
+    The search runs in the background, the projectors are created by the operator once it is done,
+    so they are added in a proper operator context. Esc cancels the search.
+    """
+    bl_idname = 'projector.optimize_placement'
+    bl_label = 'Optimize Placement'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    _timer = None
+    _models = None
+    _restarts = 0
+    _resolution = ''
+
+    @classmethod
+    def poll(cls, context):
+        settings = context.scene.projector_placement
+        return context.mode == 'OBJECT' and settings.target is not None and len(settings.target.data.polygons) > 0
+
+    def execute(self, context):
+        settings = context.scene.projector_placement
+        points, normals, areas = mesh_faces(settings.target, settings.samples, settings.seed)
+        w, h = (int(v) for v in settings.resolution.split('x'))
+        count = settings.count if settings.goal == 'COUNT' else 0
+        throw_min = min(settings.throw_min, settings.throw_max)
+        throw_max = max(settings.throw_min, settings.throw_max)
+        distance_min = min(settings.distance_min, settings.distance_max)
+        distance_max = max(settings.distance_min, settings.distance_max)
+
+        throw_ranges = None
+        self._models = None
+        if settings.use_catalog:
+            catalog = context.scene.projector_catalog
+            try:
+                index = load_catalog(catalog.filepath)
+            except (OSError, ValueError, KeyError) as e:
+                self.report({'ERROR'}, f'Could not load catalog: {e}')
+                return {'CANCELLED'}
+            found = index.query(throw_min, throw_max, w, h, catalog.min_lumens)
+            if not len(found):
+                self.report({'ERROR'}, f'No catalog model offers {settings.resolution} and throw {throw_min:.2f} - {throw_max:.2f}.')
+                return {'CANCELLED'}
+            self._models = [index.models[i] for i in found]
+            throw_ranges = [(max(m['throw_min'], throw_min), min(m['throw_max'], throw_max)) for m in self._models]
+
+        _results.clear()
+        self._restarts = settings.restarts
+        self._resolution = settings.resolution
+        for i in range(settings.restarts):
+            scheduler.submit(JOB_KEY.format(i), search_layout,
+                             points, normals, areas, count, settings.coverage, throw_min, throw_max, (w, h),
+                             distance_min, distance_max, settings.pixel_density, settings.overlap_weight,
+                             settings.candidates, settings.seed + i, MAX_COUNT, throw_ranges,
+                             label=f'Projector placement {i + 1}/{settings.restarts}',
+                             on_done=_results.append, use_processes=True)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.2, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            for i in range(self._restarts):
+                scheduler.cancel(JOB_KEY.format(i))
+            return self.finish(context, {'CANCELLED'})
+        if event.type != 'TIMER' or any(JOB_KEY.format(i) in scheduler.jobs for i in range(self._restarts)):
+            return {'PASS_THROUGH'}
+        if not _results:
+            self.report({'ERROR'}, 'The placement search failed, see the console.')
+            return self.finish(context, {'CANCELLED'})
+        best_score, covered, layout = max(_results, key=lambda r: r[0])
+        projectors = create_layout(context, layout, self._resolution, self._models)
+        self.report({'INFO'}, f'Placed {len(projectors)} projectors covering {covered:.0%} of the target.')
+        return self.finish(context, {'FINISHED'})
+
+    def finish(self, context, result):
+        context.window_manager.event_timer_remove(self._timer)
+        _results.clear()
+        return result
+
+
+def register():
+    bpy.utils.register_class(ProjectorPlacementSettings)
+    bpy.utils.register_class(PROJECTOR_OT_optimize_placement)
+    bpy.types.Scene.projector_placement = bpy.props.PointerProperty(
+        type=ProjectorPlacementSettings)
+
+
+def unregister():
+    del bpy.types.Scene.projector_placement
+    bpy.utils.unregister_class(PROJECTOR_OT_optimize_placement)
+    bpy.utils.unregister_class(ProjectorPlacementSettings)
@@ -0,0 +1,164 @@
+# Standard Lib imports
+import json
+import logging
+import os
+
+# Blender imports
+import bpy
+import numpy as np
+from bpy.types import Operator
+
+from .analysis import matrix_to_numpy
+from .helper import get_projectors, get_target_objects
+from .index import is_projector
+from .jobs import scheduler
+from .projector import get_image_extents, get_resolution
+from .raycast import cast_maps
+
+log = logging.getLogger(name=__file__)
+
+JOB_KEY = 'maps.{}'
+MAP_FILE = '{}_{}.exr'
+TARGETS_FILE = '{}_targets.json'
+
+
+def get_map_targets(context):
+    """ The selected meshes, or all visible meshes of the scene which are not part of a projector. """
+    targets = get_target_objects(context)
+    if targets:
+        return targets
+    return [obj for obj in context.visible_objects
+            if obj.type == 'MESH' and not (obj.parent is not None and is_projector(obj.parent))]
+
+
+def target_geometry(context, objects):
+    """ Return the world space triangles, corner normals, corner UVs and object index of every triangle. """
+    depsgraph = context.evaluated_depsgraph_get()
+    triangles, normals, uvs, ids = [], [], [], []
+    for i, obj in enumerate(objects):
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            mesh.calc_loop_triangles()
+            if bpy.app.version < (4, 1):
+                mesh.calc_normals_split()
+            count = len(mesh.loop_triangles)
+            if count == 0:
+                continue
+            co = np.empty(len(mesh.vertices) * 3)
+            mesh.vertices.foreach_get('co', co)
+            vertex_indices = np.empty(count * 3, dtype=np.int64)
+            mesh.loop_triangles.foreach_get('vertices', vertex_indices)
+            loop_indices = np.empty(count * 3, dtype=np.int64)
+            mesh.loop_triangles.foreach_get('loops', loop_indices)
+            split_normals = np.empty(count * 9)
+            mesh.loop_triangles.foreach_get('split_normals', split_normals)
+            corner_uvs = np.zeros((count * 3, 2))
+            if mesh.uv_layers.active is not None:
+                loop_uvs = np.empty(len(mesh.loops) * 2)
+                mesh.uv_layers.active.data.foreach_get('uv', loop_uvs)
+                corner_uvs = loop_uvs.reshape(-1, 2)[loop_indices]
+        finally:
+            evaluated.to_mesh_clear()
+
+        matrix = matrix_to_numpy(obj.matrix_world)
+        points = co.reshape(-1, 3)[vertex_indices] @ matrix[:3, :3].T + matrix[:3, 3]
+        triangles.append(points.reshape(-1, 3, 3))
+        normals.append((split_normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])).reshape(-1, 3, 3))
+        uvs.append(corner_uvs.reshape(-1, 3, 2))
+        ids.append(np.full(count, i))
+    if not triangles:
+        return np.empty((0, 3, 3)), np.empty((0, 3, 3)), np.empty((0, 3, 2)), np.empty(0, dtype=np.int64)
+    return np.vstack(triangles), np.vstack(normals), np.vstack(uvs), np.concatenate(ids)
+
+
+def write_exr(filepath, array):
+    """ Save a (h, w, channels) float array as an RGBA OpenEXR file. """
+    h, w = array.shape[:2]
+    channels = array.reshape(h, w, -1)
+    pixels = np.zeros((h, w, 4), dtype=np.float32)
+    pixels[..., 3] = 1
+    if channels.shape[2] == 1:
+        pixels[..., :3] = channels
+    else:
+        pixels[..., :channels.shape[2]] = channels
+    image = bpy.data.images.new(os.path.basename(filepath), w, h, alpha=True, float_buffer=True)
+    try:
+        image.colorspace_settings.name = 'Non-Color'
+        image.pixels.foreach_set(pixels.ravel())
+        image.filepath_raw = filepath
+        image.file_format = 'OPEN_EXR'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+
+def map_resolution(proj_settings, context):
+    """ Return the size of the maps of a projector in whole pixels. """
+    return tuple(int(v) for v in get_resolution(proj_settings, context))
+
+
+def on_maps_done(name, directory):
+    def on_done(maps):
+        depth, normal, uv = maps
+        for map_name, array in (('depth', depth), ('normal', normal), ('uv', uv)):
+            write_exr(os.path.join(directory, MAP_FILE.format(name, map_name)), array)
+        log.info(f'Output maps written: {name}')
+    return on_done
+
+
+class ProjectorMapSettings(bpy.types.PropertyGroup):
+    directory: bpy.props.StringProperty(
+        name="Directory",
+        description="Directory the depth, normal and UV maps of the projectors are written to",
+        default='//projector_maps/',
+        subtype='DIR_PATH') # type: ignore
+
+
+class PROJECTOR_OT_bake_output_maps(Operator):
+    """ Ray cast the depth, normal and UV maps of the selected projectors (or all) and save them as OpenEXR. """
+    bl_idname = 'projector.bake_output_maps'
+    bl_label = 'Bake Output Maps'
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return bool(get_projectors(context))
+
+    def execute(self, context):
+        projectors = get_projectors(context, only_selected=True) or get_projectors(context)
+        targets = get_map_targets(context)
+        triangles, normals, uvs, ids = target_geometry(context, targets)
+        if not len(triangles):
+            self.report({'WARNING'}, 'There is no geometry to cast onto.')
+            return {'CANCELLED'}
+        directory = bpy.path.abspath(context.scene.projector_maps.directory)
+        os.makedirs(directory, exist_ok=True)
+
+        for projector in projectors:
+            proj_settings = projector.proj_settings
+            name = bpy.path.clean_name(projector.name)
+            with open(os.path.join(directory, TARGETS_FILE.format(name)), 'w') as f:
+                json.dump({'uv_index': {i + 1: obj.name for i, obj in enumerate(targets)}}, f, indent=2)
+            scheduler.submit(JOB_KEY.format(projector.name), cast_maps,
+                             triangles, normals, uvs, ids,
+                             matrix_to_numpy(projector.matrix_world.inverted()),
+                             get_image_extents(proj_settings, context),
+                             map_resolution(proj_settings, context),
+                             label=f'Output maps {projector.name}',
+                             on_done=on_maps_done(name, directory), use_processes=True)
+        self.report({'INFO'}, f'Casting {len(triangles)} triangles for {len(projectors)} projectors.')
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(ProjectorMapSettings)
+    bpy.utils.register_class(PROJECTOR_OT_bake_output_maps)
+    bpy.types.Scene.projector_maps = bpy.props.PointerProperty(
+        type=ProjectorMapSettings)
+
+
+def unregister():
+    del bpy.types.Scene.projector_maps
+    bpy.utils.unregister_class(PROJECTOR_OT_bake_output_maps)
+    bpy.utils.unregister_class(ProjectorMapSettings)
@@ -0,0 +1,108 @@
+""" Pure math to find which projector frustums overlap.
+Frustums are pyramids from the projector to the image at a maximum distance. Candidate pairs come
+from a sweep and prune over their bounding boxes and are confirmed with a separating axis test.
+"""
+import numpy as np
+
+
+def frustum_vertices(to_world, extents, distance):
+    """ Return the apex and the four far corners of a frustum in world space as a (5, 3) array. """
+    to_world = np.asarray(to_world, dtype=np.float64)
+    left, right, bottom, top = extents
+    local = np.array([(0, 0, 0),
+                      (left, bottom, -1), (right, bottom, -1),
+                      (right, top, -1), (left, top, -1)], dtype=np.float64) * distance
+    return local @ to_world[:3, :3].T + to_world[:3, 3]
+
+
+def frustum_axes(to_world, extents):
+    """ Return the face normals and edge directions of a frustum in world space. """
+    to_world = np.asarray(to_world, dtype=np.float64)
+    rotation = to_world[:3, :3]
+    left, right, bottom, top = extents
+    normals = np.array([(0, 0, 1), (1, 0, left), (1, 0, right), (0, 1, bottom), (0, 1, top)], dtype=np.float64)
+    edges = np.array([(1, 0, 0), (0, 1, 0),
+                      (left, bottom, -1), (right, bottom, -1),
+                      (right, top, -1), (left, top, -1)], dtype=np.float64)
+    # Normals transform with the inverse transpose, so scaled projectors stay exact.
+    return normals @ np.linalg.inv(rotation), edges @ rotation.T
+
+
+class Frustum:
+    def __init__(self, to_world, extents, distance):
+        self.vertices = frustum_vertices(to_world, extents, distance)
+        self.normals, self.edges = frustum_axes(to_world, extents)
+
+    @property
+    def bounds(self):
+        return self.vertices.min(axis=0), self.vertices.max(axis=0)
+
+
+def frustums_intersect(a, b, eps=1e-9):
+    """ Exact intersection test of two convex frustums with the separating axis theorem. """
+    crosses = np.cross(a.edges[:, None, :], b.edges[None, :, :]).reshape(-1, 3)
+    axes = np.vstack((a.normals, b.normals, crosses))
+    lengths = np.linalg.norm(axes, axis=1)
+    axes = axes[lengths > eps] / lengths[lengths > eps, None]
+    pa = a.vertices @ axes.T
+    pb = b.vertices @ axes.T
+    separated = (pa.max(axis=0) < pb.min(axis=0) - eps) | (pb.max(axis=0) < pa.min(axis=0) - eps)
+    return not separated.any()
+
+
+def candidate_pairs(mins, maxs):
+    """ Sweep and prune: return the (i, j) pairs with overlapping bounding boxes, i < j.
+    The sweep runs along the axis with the largest spread, the other two axes filter the pairs.
+    """
+    mins = np.asarray(mins, dtype=np.float64)
+    maxs = np.asarray(maxs, dtype=np.float64)
+    if len(mins) < 2:
+        return []
+    axis = int(np.argmax(np.var((mins + maxs) / 2, axis=0)))
+    order = np.argsort(mins[:, axis], kind='stable')
+    sorted_mins = mins[order, axis]
+    # Every box overlaps, along the sweep axis, the following boxes which start before it ends.
+    ends = np.searchsorted(sorted_mins, maxs[order, axis], side='right')
+    pairs = []
+    for position, end in enumerate(ends):
+        if end <= position + 1:
+            continue
+        i = int(order[position])
+        others = order[position + 1:end]
+        overlap = np.all((mins[others] <= maxs[i]) & (maxs[others] >= mins[i]), axis=1)
+        pairs.extend((min(i, j), max(i, j)) for j in others[overlap].tolist())
+    return pairs
+
+
+def clusters(count, pairs):
+    """ Group the indices 0..count-1 into connected components with a union find.
+    Returns a list of sorted index lists, the largest cluster first.
+    """
+    parent = list(range(count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    groups = {}
+    for i in range(count):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values(), key=lambda group: (-len(group), group[0]))
+
+
+def overlap_graph(frustums):
+    """ Return the overlapping (i, j) pairs and the clusters of a list of Frustum objects. """
+    if not frustums:
+        return [], []
+    bounds = [frustum.bounds for frustum in frustums]
+    mins = np.array([low for low, _ in bounds])
+    maxs = np.array([high for _, high in bounds])
+    pairs = sorted((i, j) for i, j in candidate_pairs(mins, maxs)
+                   if frustums_intersect(frustums[i], frustums[j]))
+    return pairs, clusters(len(frustums), pairs)
@@ -0,0 +1,197 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+import gpu
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+from gpu_extras.batch import batch_for_shader
+
+from .analysis import matrix_to_numpy
+from .frustum import helper_lines
+from .helper import get_helper_objects, get_projectors, is_lightweight
+from .index import is_projector, projector_index
+from .projector import get_image_extents
+
+log = logging.getLogger(name=__file__)
+
+# Alpha of the lines of unselected projectors.
+UNSELECTED_ALPHA = 0.5
+
+_draw_handle = None
+_batch = None
+# Set when projectors were added, removed, (de)selected or hidden: the batch is rebuilt from scratch.
+_dirty = True
+# The projectors which moved or changed since the last draw by their pointer, only their lines are rebuilt.
+_moved = {}
+# The lightweight projectors in the batch, the slot of each projector and their lines and colors.
+_projectors = []
+_slots = {}
+_lines = None
+_colors = None
+_generation = None
+
+
+def get_shader():
+    if bpy.app.version >= (3, 4):
+        return gpu.shader.from_builtin('SMOOTH_COLOR')
+    return gpu.shader.from_builtin('3D_SMOOTH_COLOR')
+
+
+def projector_lines(projectors, context):
+    """ Return the frustum and body lines (n, 40, 3) and the colors (n, 4) of the projectors. """
+    settings = [projector.proj_settings for projector in projectors]
+    lines = helper_lines([matrix_to_numpy(projector.matrix_world) for projector in projectors],
+                         [get_image_extents(proj_settings, context) for proj_settings in settings],
+                         [proj_settings.focus_distance for proj_settings in settings],
+                         [(proj_settings.projector_w, proj_settings.projector_h, proj_settings.projector_d)
+                          for proj_settings in settings])
+    colors = np.ones((len(projectors), 4), dtype=np.float32)
+    colors[:, :3] = [tuple(proj_settings.projected_color) for proj_settings in settings]
+    colors[:, 3] = [1.0 if projector.select_get() else UNSELECTED_ALPHA for projector in projectors]
+    return lines, colors
+
+
+def create_batch():
+    colors = np.repeat(_colors, _lines.shape[1], axis=0)
+    return batch_for_shader(get_shader(), 'LINES', {
+        'pos': _lines.reshape(-1, 3).astype(np.float32),
+        'color': colors})
+
+
+def build_batch(context):
+    """ Build one batch with the frustum and body lines of all visible lightweight projectors. """
+    global _projectors, _slots, _lines, _colors, _generation
+    _generation = projector_index.generation
+    _projectors = [projector for projector in projector_index.get_projectors(context.scene)
+                   if is_lightweight(projector) and projector.visible_get()]
+    _slots = {projector.as_pointer(): i for i, projector in enumerate(_projectors)}
+    if not _projectors:
+        return None
+    _lines, _colors = projector_lines(_projectors, context)
+    return create_batch()
+
+
+def update_batch(context):
+    """ Rebuild only the lines of the moved projectors, the whole batch if one of them appeared or disappeared. """
+    slots = [_slots[pointer] for pointer in _moved if pointer in _slots]
+    projectors = [_projectors[i] for i in slots]
+    if not all(projector.visible_get() for projector in projectors) or any(
+            is_lightweight(projector) and projector.visible_get()
+            for pointer, projector in _moved.items() if pointer not in _slots):
+        return build_batch(context)
+    if slots:
+        _lines[slots], _colors[slots] = projector_lines(projectors, context)
+    return create_batch() if _projectors else None
+
+
+def draw_overlay():
+    global _batch, _dirty
+    context = bpy.context
+    if context.scene is None:
+        return
+    space = context.space_data
+    if space is not None and not space.overlay.show_overlays:
+        return
+    if _dirty:
+        _batch = build_batch(context)
+        _dirty = False
+        _moved.clear()
+    elif _moved:
+        _batch = update_batch(context)
+        _moved.clear()
+    if _batch is None:
+        return
+    shader = get_shader()
+    if bpy.app.version >= (2, 93):
+        gpu.state.blend_set('ALPHA')
+        gpu.state.depth_test_set('LESS_EQUAL')
+    shader.bind()
+    _batch.draw(shader)
+    if bpy.app.version >= (2, 93):
+        gpu.state.depth_test_set('NONE')
+        gpu.state.blend_set('NONE')
+
+
+def tag_overlay():
+    global _dirty
+    _dirty = True
+
+
+@persistent
+def update_overlay_handler(scene, depsgraph):
+    """ Tag the projectors whose lines have to be rebuilt.
+    While projectors are transformed only their own lines are rebuilt on the next draw.
+    Selection and visibility changes update the scene and rebuild the whole batch.
+    """
+    if _dirty:
+        return
+    if projector_index.generation != _generation:
+        tag_overlay()
+        return
+    moved = {update.id.original.as_pointer(): update.id.original for update in depsgraph.updates
+             if isinstance(update.id, bpy.types.Object) and is_projector(update.id)}
+    if moved:
+        _moved.update(moved)
+    elif depsgraph.id_type_updated('SCENE'):
+        tag_overlay()
+
+
+@persistent
+def tag_overlay_on_load(*args):
+    tag_overlay()
+
+
+class PROJECTOR_OT_make_lightweight(Operator):
+    """ Remove the helper objects of the selected projectors, their frustum and body are drawn as an overlay. """
+    bl_idname = 'projector.make_lightweight'
+    bl_label = 'Make Lightweight'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and bool(get_projectors(context, only_selected=True))
+
+    def execute(self, context):
+        for projector in get_projectors(context, only_selected=True):
+            helper_collection = projector.proj_settings.helper_collection
+            for obj in get_helper_objects(projector):
+                bpy.data.objects.remove(obj, do_unlink=True)
+            if helper_collection is not None:
+                projector.proj_settings.helper_collection = None
+                if not helper_collection.all_objects:
+                    bpy.data.collections.remove(helper_collection)
+        tag_overlay()
+        return {'FINISHED'}
+
+
+HANDLERS = ((bpy.app.handlers.depsgraph_update_post, update_overlay_handler),
+            (bpy.app.handlers.load_post, tag_overlay_on_load),
+            (bpy.app.handlers.undo_post, tag_overlay_on_load),
+            (bpy.app.handlers.redo_post, tag_overlay_on_load))
+
+
+def register():
+    global _draw_handle
+    bpy.utils.register_class(PROJECTOR_OT_make_lightweight)
+    for handlers, handler in HANDLERS:
+        handlers.append(handler)
+    if not bpy.app.background:
+        _draw_handle = bpy.types.SpaceView3D.draw_handler_add(draw_overlay, (), 'WINDOW', 'POST_VIEW')
+
+
+def unregister():
+    global _draw_handle, _batch, _projectors
+    if _draw_handle is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(_draw_handle, 'WINDOW')
+        _draw_handle = None
+    _batch = None
+    _projectors = []
+    _moved.clear()
+    tag_overlay()
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+    bpy.utils.unregister_class(PROJECTOR_OT_make_lightweight)
@@ -0,0 +1,79 @@
+""" Photometric model of the projectors.
+Only NumPy is used here, so the functions can run in worker processes of the job scheduler.
+"""
+import math
+
+import numpy as np
+
+# Blender converts light power to luminous flux with 683 lm/W.
+LUMINOUS_EFFICACY = 683.0
+
+
+def solid_angle(left, right, bottom, top):
+    """ Return the solid angle of a rectangle on the plane one unit in front of the projector. """
+    def f(x, y):
+        return math.atan(x * y / math.sqrt(1 + x * x + y * y))
+    return f(right, top) - f(left, top) - f(right, bottom) + f(left, bottom)
+
+
+def lumens_to_watts(lumens, omega):
+    """ Return the power of a spot light which emits the given flux into the solid angle omega.
+    Spot lights have the intensity of a point light of the same power, P / 4pi per steradian.
+    """
+    return 4 * math.pi * lumens / (LUMINOUS_EFFICACY * omega)
+
+
+def watts_to_lumens(watts, omega):
+    """ Return the flux a spot light of the given power emits into the solid angle omega. """
+    return LUMINOUS_EFFICACY * watts * omega / (4 * math.pi)
+
+
+def watts_to_candela(watts):
+    """ Luminous intensity of a spot light with the given power. """
+    return LUMINOUS_EFFICACY * watts / (4 * math.pi)
+
+
+def contribution_matrix(points, normals, projectors):
+    """ Return a (points, projectors) array with the illuminance in lux per candela of every projector.
+    points and normals are (n, 3) arrays in world space, projectors a list of
+    (world to local 4x4 matrix, world position, (left, right, bottom, top)) tuples.
+    Occlusion is not taken into account.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    normals = np.asarray(normals, dtype=np.float64)
+    contributions = np.zeros((len(points), len(projectors)))
+    homogeneous = np.hstack((points, np.ones((len(points), 1))))
+    for j, (to_local, position, (left, right, bottom, top)) in enumerate(projectors):
+        local = homogeneous @ np.asarray(to_local, dtype=np.float64).T
+        depth = -local[:, 2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = local[:, 0] / depth
+            y = local[:, 1] / depth
+        inside = (depth > 0) & (x >= left) & (x <= right) & (y >= bottom) & (y <= top)
+
+        to_projector = np.asarray(position, dtype=np.float64) - points
+        distance_squared = np.einsum('ij,ij->i', to_projector, to_projector)
+        distance = np.sqrt(distance_squared)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cos = np.einsum('ij,ij->i', normals, to_projector) / distance
+            lux = np.clip(cos, 0, None) / distance_squared
+        contributions[:, j] = np.where(inside & (distance_squared > 0), lux, 0)
+    return contributions
+
+
+def balance(contributions, intensities, percentile=10):
+    """ Return a dimming factor (0-1) per projector which evens out the illuminance of all lit points.
+    The target is a low percentile of the current illuminance, so it can be reached without
+    driving any projector above its rated brightness.
+    """
+    intensities = np.asarray(intensities, dtype=np.float64)
+    lit = contributions.any(axis=1)
+    factors = np.ones(len(intensities))
+    if not lit.any():
+        return factors
+    weighted = contributions[lit] * intensities
+    target = np.percentile(weighted.sum(axis=1), percentile)
+    solution = np.linalg.lstsq(weighted, np.full(len(weighted), target), rcond=None)[0]
+    used = weighted.any(axis=0)
+    factors[used] = np.clip(solution[used], 0, 1)
+    return factors
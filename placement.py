@@ -0,0 +1,128 @@
+""" Search for projector layouts which cover a surface evenly.
+Only NumPy is used here, so the search can run in worker processes of the job scheduler.
+The surface is given as sample points with normals and the area each sample stands for.
+"""
+import numpy as np
+
+# Upper bound of projectors placed to reach a coverage goal.
+MAX_COUNT = 64
+
+
+def look_at(position, target):
+    """ Return the local to world 4x4 matrix of a projector at position which looks at target (down local -Z). """
+    forward = target - position
+    forward = forward / np.linalg.norm(forward)
+    z_axis = -forward
+    up = np.array((0.0, 0.0, 1.0))
+    if abs(z_axis @ up) > 0.999:
+        up = np.array((0.0, 1.0, 0.0))
+    x_axis = np.cross(up, z_axis)
+    x_axis /= np.linalg.norm(x_axis)
+    y_axis = np.cross(z_axis, x_axis)
+    matrix = np.eye(4)
+    matrix[:3, 0] = x_axis
+    matrix[:3, 1] = y_axis
+    matrix[:3, 2] = z_axis
+    matrix[:3, 3] = position
+    return matrix
+
+
+def random_candidates(rng, points, normals, weights, count, throw_min, throw_max,
+                      distance_min, distance_max, max_tilt=0.35, throw_ranges=None):
+    """ Return count (local to world matrix, throw ratio) candidates aimed at randomly picked points.
+    Points with a higher weight are picked more often. The projectors are placed in front of the
+    picked point along its normal, tilted by up to max_tilt radians.
+    With throw_ranges ((low, high), ...) the throw ratio is taken from a randomly picked range instead,
+    e.g. the zoom ranges of the available projector models.
+    """
+    picked = rng.choice(len(points), size=count, p=weights / weights.sum())
+    candidates = []
+    for index in picked:
+        aim = points[index]
+        direction = normals[index] + rng.normal(scale=max_tilt, size=3)
+        length = np.linalg.norm(direction)
+        if length == 0:
+            continue
+        distance = rng.uniform(distance_min, distance_max)
+        position = aim + direction / length * distance
+        if throw_ranges:
+            throw_ratio = rng.uniform(*throw_ranges[rng.integers(len(throw_ranges))])
+        else:
+            throw_ratio = rng.uniform(throw_min, throw_max)
+        candidates.append((look_at(position, aim), throw_ratio))
+    return candidates
+
+
+def candidate_quality(points, normals, candidates, resolution, target_density):
+    """ Return a (candidates, points) array with the image quality (0-1) of every candidate on every point.
+    The quality is the pixel density (pixels per meter) relative to the target density, capped at 1.
+    Points outside of the frustum or facing away get 0. Occlusion is not taken into account.
+    """
+    width, height = resolution
+    aspect = height / width
+    quality = np.zeros((len(candidates), len(points)))
+    for c, (matrix, throw_ratio) in enumerate(candidates):
+        rotation = matrix[:3, :3]
+        position = matrix[:3, 3]
+        local = (points - position) @ rotation
+        depth = -local[:, 2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = local[:, 0] / depth
+            y = local[:, 1] / depth
+        half_width = 1 / throw_ratio / 2
+        inside = (depth > 0) & (np.abs(x) <= half_width) & (np.abs(y) <= half_width * aspect)
+
+        to_projector = position - points
+        distance = np.linalg.norm(to_projector, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cos = np.einsum('ij,ij->i', normals, to_projector) / distance
+            # Pixels per meter across the image, thinned out on slanted surfaces.
+            density = width * throw_ratio / depth * np.sqrt(np.clip(cos, 0, None))
+        quality[c] = np.where(inside & (cos > 0), np.minimum(density / target_density, 1), 0)
+    return quality
+
+
+def score(quality, areas, coverage, overlap_weight):
+    """ Score candidates by the quality they add to the current coverage, minus the area they overlap. """
+    gain = np.clip(quality - coverage, 0, None) @ areas
+    overlap = (quality > 0) @ (areas * (coverage > 0))
+    return gain - overlap_weight * overlap
+
+
+def search_layout(points, normals, areas, count, coverage_goal, throw_min, throw_max, resolution,
+                  distance_min, distance_max, target_density, overlap_weight, candidates_per_step, seed,
+                  max_count=MAX_COUNT, throw_ranges=None):
+    """ Greedily add the best of a batch of random candidates until count projectors are placed.
+    With a count of 0 projectors are added until coverage_goal (0-1) of the area is covered
+    or max_count is reached. throw_ranges restricts the throw ratios, see random_candidates().
+    Returns (score, covered fraction, [(matrix, throw ratio), ...]).
+    """
+    rng = np.random.default_rng(seed)
+    points = np.asarray(points, dtype=np.float64)
+    normals = np.asarray(normals, dtype=np.float64)
+    areas = np.asarray(areas, dtype=np.float64)
+    total_area = areas.sum()
+    coverage = np.zeros(len(points))
+    layout = []
+    total_score = 0.0
+    limit = count if count > 0 else max_count
+    while len(layout) < limit:
+        if count <= 0 and areas @ (coverage > 0) >= coverage_goal * total_area:
+            break
+        # Aim the candidates at the parts which are covered worst.
+        weights = areas * (1 - coverage) + 1e-9
+        candidates = random_candidates(rng, points, normals, weights, candidates_per_step,
+                                       throw_min, throw_max, distance_min, distance_max,
+                                       throw_ranges=throw_ranges)
+        if not candidates:
+            continue
+        quality = candidate_quality(points, normals, candidates, resolution, target_density)
+        scores = score(quality, areas, coverage, overlap_weight)
+        best = int(np.argmax(scores))
+        if scores[best] <= 0:
+            break
+        layout.append((candidates[best][0].tolist(), float(candidates[best][1])))
+        coverage = np.maximum(coverage, quality[best])
+        total_score += float(scores[best])
+    covered = float(areas @ (coverage > 0) / total_area) if total_area > 0 else 0.0
+    return total_score, covered, layout
@@ -9,18 +9,33 @@ from bpy import context, data, ops
 from bpy.types import Operator
 import bmesh
 
-from .helper import (ADDON_ID, auto_offset,
-                     get_projectors, get_projector, get_child_ID_by_name, get_child_ID_by_type, random_color)
+from .helper import (ADDON_ID, auto_offset, ensure_helper_collection, helpers_excluded, update_guard, writes_rig,
+                     get_projectors, get_projector, get_child_by_name, get_child_ID_by_type, random_color)
+from .index import projector_index
+from .frustum import cone_angle, image_extents
+from .photometry import lumens_to_watts, solid_angle
+from .proxies import full_image
+from .relighting import ensure_lightgroup, update_weight_group
+from .texture_loading import known_image_size, request_image_size
+from .warp import bake_warp_map
+from .material_projection import get_targets, remove_projector_layers, update_layer_group, update_target
 
 logging.basicConfig(
     format='[ProjectorForks Addon]: %(name)s - %(levelname)s - %(message)s')
 log = logging.getLogger(name=__file__)
 
 
+# Version of the node setup and objects of a projector, raised when older projectors need a migration.
+RIG_VERSION = 4
+RIG_VERSION_KEY = ADDON_ID.format('rig_version')
+
+
 class Textures(Enum):
     CHECKER = 'checker_texture'
     COLOR_GRID = 'color_grid_texture'
     CUSTOM_TEXTURE = 'custom_texture'
+    CANVAS = 'canvas_texture'
+    LIVE_FEED = 'live_feed'
 
 
 RESOLUTIONS = [
@@ -48,9 +63,25 @@ RESOLUTIONS = [
     ('2000x1000', 'Landscape (2000x1000) 2:1', '', 15)
 ]
 
+PROJECTION_MODES = [('LIGHT', 'Light', 'Project through a spot light (Cycles only)', 1),
+                    ('MATERIAL', 'Material', 'Project through a UV Project modifier and a material layer on the target objects (all render engines)', 2)]
+
+SIZE_SOLVES = [('THROW_RATIO', 'Throw Ratio', 'Keep the focus distance and change the throw ratio', 1),
+               ('DISTANCE', 'Focus Distance', 'Keep the throw ratio and change the focus distance', 2)]
+
+# Library overrides of linked projector rigs can only change flagged properties (Blender 2.90+).
+OVERRIDABLE = {'override': {'LIBRARY_OVERRIDABLE'}} if bpy.app.version >= (2, 90) else {}
+
 PROJECTED_OUTPUTS = [(Textures.CHECKER.value, 'Checker', '', 1),
                      (Textures.COLOR_GRID.value, 'Color Grid', '', 2),
-                     (Textures.CUSTOM_TEXTURE.value, 'Custom Texture', '', 3)]
+                     (Textures.CUSTOM_TEXTURE.value, 'Custom Texture', '', 3),
+                     (Textures.CANVAS.value, 'Shared Canvas', 'Project a part of the scene wide canvas image', 4),
+                     (Textures.LIVE_FEED.value, 'Live Feed', 'Project the frames an external player pushes into a shared memory segment or file', 5)]
+
+LIVE_FEED_SOURCES = [('SHARED_MEMORY', 'Shared Memory', 'Read the frames from a named shared memory segment', 1),
+                     ('FILE', 'Watched File', 'Read a frame whenever the file changes', 2)]
+
+LIVE_FEED_IMAGE = '{}.live_feed'
 
 
 class PROJECTOR_OT_change_color_randomly(Operator):
@@ -88,7 +119,10 @@ def create_projector_textures():
                               generated_type='COLOR_GRID',
                               float=False)
 
-        bpy.data.images[img_name].use_fake_user = True
+        image = bpy.data.images[img_name]
+        # Textures linked from a rig library are kept alive by the library.
+        if image.library is None:
+            image.use_fake_user = True
 
 
 def add_projector_node_tree_to_spot(spot):
@@ -167,6 +201,7 @@ def add_projector_node_tree_to_spot(spot):
     map_2.vector_type = 'TEXTURE'
 
     add = nodes.new('ShaderNodeMixRGB')
+    add.name = 'Texture Vector'
     add.blend_type = 'ADD'
     add.inputs[0].default_value = 1
     add.location = auto_pos(350)
@@ -256,30 +291,163 @@ def add_projector_node_tree_to_spot(spot):
     root_tree.links.new(group.outputs[0], pixel_grid_node.inputs[1])
     root_tree.links.new(emission.outputs[0], pixel_grid_node.inputs[0])
 
+    ensure_warp_nodes(tree)
+
+
+def ensure_warp_nodes(tree):
+    """ Return the texture vector, warp map and warp offset nodes of a projector group node tree.
+    The warp nodes are created if they don't exist yet (e.g. projectors from older versions of the add-on).
+    """
+    nodes = tree.nodes
+    vector_node = nodes.get('Texture Vector')
+    if vector_node is None:
+        vector_node = nodes['Group Output'].inputs[0].links[0].from_node
+        vector_node.name = 'Texture Vector'
+
+    warp_node = nodes.get('Warp Map')
+    if warp_node is None:
+        warp_node = nodes.new('ShaderNodeTexImage')
+        warp_node.name = 'Warp Map'
+        warp_node.label = 'Warp Map'
+        warp_node.extension = 'CLIP'
+        warp_node.location = (vector_node.location[0], vector_node.location[1] + 300)
+    # Filtering would blend valid coordinates with the 0 of empty pixels at the border of the image.
+    warp_node.interpolation = 'Closest'
+
+    offset_node = nodes.get('Warp Offset')
+    if offset_node is None:
+        # The warp map stores coordinates offset by +1, so empty pixels end up outside of the image.
+        offset_node = nodes.new('ShaderNodeVectorMath')
+        offset_node.name = 'Warp Offset'
+        offset_node.operation = 'SUBTRACT'
+        offset_node.inputs[1].default_value = (1, 1, 1)
+        offset_node.location = (warp_node.location[0] + 300, warp_node.location[1])
+        tree.links.new(warp_node.outputs['Color'], offset_node.inputs[0])
+
+    return vector_node, warp_node, offset_node
+
+
+def get_warp_map(projector):
+    spot = projector.children[get_child_ID_by_type(projector.children,'LIGHT')]
+    warp_node = spot.data.node_tree.nodes['Group'].node_tree.nodes.get('Warp Map')
+    return warp_node.image if warp_node is not None else None
+
+
+def ensure_canvas_nodes(root_tree):
+    """ Return the mapping and image node used to look up the shared canvas. Create them if needed. """
+    nodes = root_tree.nodes
+    mapping_node = nodes.get('Canvas Mapping')
+    if mapping_node is None:
+        mapping_node = nodes.new('ShaderNodeMapping')
+        mapping_node.name = 'Canvas Mapping'
+        mapping_node.vector_type = 'POINT'
+        loc = nodes['Image Texture'].location
+        mapping_node.location = (loc[0] - 200, loc[1] + 400)
+        root_tree.links.new(nodes['Group'].outputs['texture vector'], mapping_node.inputs['Vector'])
+
+    canvas_node = nodes.get('Canvas Texture')
+    if canvas_node is None:
+        canvas_node = nodes.new('ShaderNodeTexImage')
+        canvas_node.name = 'Canvas Texture'
+        canvas_node.label = 'Shared Canvas'
+        canvas_node.extension = 'CLIP'
+        canvas_node.location = (mapping_node.location[0] + 200, mapping_node.location[1])
+        root_tree.links.new(mapping_node.outputs['Vector'], canvas_node.inputs['Vector'])
+    return mapping_node, canvas_node
+
+
+def ensure_live_feed_node(root_tree):
+    """ Return the image node the live feed is written to. Create it if needed. """
+    nodes = root_tree.nodes
+    feed_node = nodes.get('Live Feed')
+    if feed_node is None:
+        feed_node = nodes.new('ShaderNodeTexImage')
+        feed_node.name = 'Live Feed'
+        feed_node.label = 'Live Feed'
+        feed_node.extension = 'CLIP'
+        loc = nodes['Image Texture'].location
+        feed_node.location = (loc[0], loc[1] - 300)
+        root_tree.links.new(nodes['Group'].outputs['texture vector'], feed_node.inputs['Vector'])
+    return feed_node
+
+
+def ensure_live_feed_image(projector, width, height):
+    """ Return the image the live feed of a projector is written to, sized to the projector resolution.
+    Frames are written into the pixels of this image, it is only reallocated when the resolution changes.
+    """
+    name = LIVE_FEED_IMAGE.format(projector.name)
+    image = bpy.data.images.get(name)
+    if image is None:
+        image = bpy.data.images.new(name, width, height, alpha=True)
+        image.generated_color = (0, 0, 0, 1)
+    elif tuple(image.size) != (width, height):
+        image.scale(width, height)
+    return image
+
+
+# Last known resolution of the custom texture of every projector, used while a new image is read.
+_last_resolution = {}
+
+
+def get_custom_image(proj_settings):
+    """ Return the custom texture if it defines the projector resolution, otherwise None. """
+    if proj_settings.use_custom_texture_res and proj_settings.projected_texture == Textures.CUSTOM_TEXTURE.value:
+        projector = proj_settings.id_data
+        root_tree = projector.children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree
+        return root_tree.nodes['Image Texture'].image
+    return None
+
+
+def refresh_custom_texture(image):
+    """ Update all projectors showing the image once its size is known. """
+    context = bpy.context
+    for projector in projector_index.get_projectors(context.scene):
+        if full_image(get_custom_image(projector.proj_settings)) == image:
+            update_throw_ratio(projector.proj_settings, context)
+            update_pixel_grid(projector.proj_settings, context)
+
+
+def resolution_pending(proj_settings):
+    """ True while the size of the custom texture is read in the background.
+    Updates which depend on the resolution are skipped meanwhile and run once it is known.
+    """
+    if not proj_settings.use_custom_texture_res or proj_settings.projected_texture != Textures.CUSTOM_TEXTURE.value:
+        return False
+    image = full_image(get_custom_image(proj_settings))
+    if image is None or known_image_size(image) is not None:
+        return False
+    request_image_size(image, refresh_custom_texture)
+    return True
+
+
 def get_resolution(proj_settings, context):
     """ Find out what resolution is currently used and return it.
     Resolution from the dropdown or the resolution from the custom texture.
     """
     if proj_settings.use_custom_texture_res and proj_settings.projected_texture == Textures.CUSTOM_TEXTURE.value:
-        projector = get_projector(context)
-        root_tree = projector.children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree
-        image = root_tree.nodes['Image Texture'].image
-        if image:
-            w = image.size[0]
-            h = image.size[1]
+        image = full_image(get_custom_image(proj_settings))
+        key = proj_settings.id_data.name
+        size = known_image_size(image) if image else (300, 300)
+        if size is None:
+            request_image_size(image, refresh_custom_texture)
+            size = _last_resolution.get(key, (300, 300))
         else:
-            w, h = 300, 300
+            _last_resolution[key] = size
+        w, h = size
     else:
         w, h = proj_settings.resolution.split('x')
 
     return float(w), float(h)
 
 
+@writes_rig
 def update_throw_ratio(proj_settings, context):
     """
     Adjust some settings on a camera to achieve a throw ratio
     """
-    projector = get_projector(context)
+    if resolution_pending(proj_settings):
+        return
+    projector = proj_settings.id_data
     # Update properties of the camera.
     throw_ratio = proj_settings.throw_ratio
     focus_distance = proj_settings.focus_distance
@@ -304,22 +472,27 @@ def update_throw_ratio(proj_settings, context):
         nodes['Mapping'].inputs[3].default_value[0] = 1 / throw_ratio
         nodes['Mapping'].inputs[3].default_value[1] = 1 / \
             throw_ratio * inverted_aspect_ratio
-        
+
+    # The warp map depends on the aspect ratio of the resolution.
+    update_warp_map(proj_settings, context)
     update_lens_shift(proj_settings,context)
     update_projection_helper(proj_settings, context)
+    update_material_projection(proj_settings, context)
 
+@writes_rig
 def update_focus_distance(proj_settings, context):
-    projector = get_projector(context)
+    projector = proj_settings.id_data
     throw_ratio = proj_settings.throw_ratio
     focus_distance = proj_settings.focus_distance
     #projector.data.display_size = 1/throw_ratio*focus_distance
     update_projection_helper(proj_settings, context)
 
+@writes_rig
 def update_lens_shift(proj_settings, context):
     """
     Apply the shift to the camera and texture.
     """
-    projector = get_projector(context)
+    projector = proj_settings.id_data
     h_shift = proj_settings.get('h_shift', 0.0) / 100
     v_shift = proj_settings.get('v_shift', 0.0) / 100
     throw_ratio = proj_settings.throw_ratio
@@ -348,46 +521,114 @@ def update_lens_shift(proj_settings, context):
         nodes['Mapping.001'].inputs[1].default_value[0] = h_shift_factor
         nodes['Mapping.001'].inputs[1].default_value[1] = v_shift_factor
     update_projection_helper(proj_settings, context)
+    update_spot_cone(proj_settings, context)
+    # The solid angle of the frustum changes with throw ratio and shift.
+    if proj_settings.use_lumens:
+        update_power(proj_settings, context)
+    else:
+        update_relighting(proj_settings, context)
 
+def update_spot_cone(proj_settings, context):
+    """ Fit the cone of the spot light tightly around the frustum, so light sampling ignores the rest of the hemisphere. """
+    projector = proj_settings.id_data
+    spot = projector.children[get_child_ID_by_type(projector.children,'LIGHT')]
+    spot_size = max(cone_angle(get_image_extents(proj_settings, context)), math.radians(1))
+    if abs(spot.data.spot_size - spot_size) > 1e-6:
+        spot.data.spot_size = spot_size
+
+@writes_rig
+def update_warp_map(proj_settings, context):
+    """ Bake keystone and lens distortion into a warp map and link it into the node tree.
+    All texture lookups go through a single lookup into the warp map.
+    """
+    projector = proj_settings.id_data
+    spot = projector.children[get_child_ID_by_type(projector.children,'LIGHT')]
+    tree = spot.data.node_tree.nodes['Group'].node_tree
+    nodes = tree.nodes
+    vector_node, warp_node, offset_node = ensure_warp_nodes(tree)
+
+    if proj_settings.use_warp_map:
+        w, h = get_resolution(proj_settings, context)
+        width = proj_settings.warp_map_resolution
+        height = max(1, round(width * h / w))
+        params = (proj_settings.keystone_h / 100, proj_settings.keystone_v / 100,
+                  proj_settings.k1, proj_settings.k2,
+                  proj_settings.p1, proj_settings.p2)
+        warp_node.image = bake_warp_map(projector.name, width, height, w / h, params, warp_node.image)
+        tree.links.new(vector_node.outputs[0], warp_node.inputs['Vector'])
+        source = offset_node.outputs[0]
+    else:
+        source = vector_node.outputs[0]
+
+    tree.links.new(source, nodes['Image Texture'].inputs['Vector'])
+    tree.links.new(source, nodes['Checker Texture'].inputs['Vector'])
+    tree.links.new(source, nodes['Group Output'].inputs[0])
+
+def solve_projection_size(proj_settings, context, width):
+    """ Set the throw ratio or the focus distance so the projected image gets the given width. """
+    if width <= 0:
+        return
+    with update_guard(proj_settings) as entered:
+        if not entered:
+            return
+        if proj_settings.size_solves == 'THROW_RATIO':
+            proj_settings.throw_ratio = proj_settings.focus_distance / width
+        else:
+            proj_settings.focus_distance = width * proj_settings.throw_ratio
+
+@writes_rig
 def update_projection_by_width(proj_settings, context):
-    w_projection = proj_settings.w_projection
-    #proj_settings.throw_ratio = w_projection
-    
+    solve_projection_size(proj_settings, context, proj_settings.w_projection)
 
+@writes_rig
 def update_projection_by_height(proj_settings, context):
-    h_projection = proj_settings.h_projection
-    #proj_settings.throw_ratio = h_projection*0.1
-    #update_throw_ratio(proj_settings, context)
+    w, h = get_resolution(proj_settings, context)
+    solve_projection_size(proj_settings, context, proj_settings.h_projection * w / h)
 
+@writes_rig
 def update_projection_by_diagonal(proj_settings, context):
-    d_projection = proj_settings.d_projection
-    #proj_settings.throw_ratio = d_projection*0.1
-    #update_throw_ratio(proj_settings, context)
+    w, h = get_resolution(proj_settings, context)
+    solve_projection_size(proj_settings, context, proj_settings.d_projection / math.hypot(1, h / w))
 
+def update_projection_size(proj_settings, context):
+    """ Store the size of the projected image at the focus distance.
+    The values are written as ID properties, so the sizing callbacks are not triggered.
+    """
+    w, h = get_resolution(proj_settings, context)
+    width = proj_settings.focus_distance / proj_settings.throw_ratio
+    proj_settings['w_projection'] = width
+    proj_settings['h_projection'] = width * h / w
+    proj_settings['d_projection'] = width * math.hypot(1, h / w)
+
+@writes_rig
 def update_projector_width(proj_settings, context):
-    projector = get_projector(context)
-    projector_cube = projector.children[get_child_ID_by_name(projector.children,'Cube')]
-    projector_cube.dimensions[0] = proj_settings.projector_w
+    projector_cube = get_child_by_name(proj_settings.id_data.children, 'Cube')
+    if projector_cube is not None:
+        projector_cube.dimensions[0] = proj_settings.projector_w
 
+@writes_rig
 def update_projector_height(proj_settings, context):
-    projector = get_projector(context)
-    projector_cube = projector.children[get_child_ID_by_name(projector.children,'Cube')]
-    projector_cube.dimensions[1] = proj_settings.projector_h
+    projector_cube = get_child_by_name(proj_settings.id_data.children, 'Cube')
+    if projector_cube is not None:
+        projector_cube.dimensions[1] = proj_settings.projector_h
 
+@writes_rig
 def update_projector_depth(proj_settings, context):
-    projector = get_projector(context)
-    projector_cube = projector.children[get_child_ID_by_name(projector.children,'Cube')]
-    projector_cube.dimensions[2] = proj_settings.projector_d
-    projector_cube.location[2] = projector_cube.dimensions[2]/2
+    projector_cube = get_child_by_name(proj_settings.id_data.children, 'Cube')
+    if projector_cube is not None:
+        projector_cube.dimensions[2] = proj_settings.projector_d
+        projector_cube.location[2] = projector_cube.dimensions[2]/2
 
+@writes_rig
 def update_projector_dimensions(proj_settings, context):
-    projector = get_projector(context)
-    projector_cube = projector.children[get_child_ID_by_name(projector.children,'Cube')]
-    projector_cube.scale = (proj_settings.projector_w,proj_settings.projector_h,proj_settings.projector_d)
-    projector_cube.location[2] = projector_cube.dimensions[2]/2
+    projector_cube = get_child_by_name(proj_settings.id_data.children, 'Cube')
+    if projector_cube is not None:
+        projector_cube.scale = (proj_settings.projector_w,proj_settings.projector_h,proj_settings.projector_d)
+        projector_cube.location[2] = projector_cube.dimensions[2]/2
 
+@writes_rig
 def update_resolution(proj_settings, context):
-    projector = get_projector(context)
+    projector = proj_settings.id_data
     nodes = projector.children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree.nodes['Group'].node_tree.nodes
     # Change resolution image texture
     nodes['Image Texture'].image = bpy.data.images[f'_proj.tex.{proj_settings.resolution}']
@@ -396,33 +637,100 @@ def update_resolution(proj_settings, context):
     update_projection_helper(proj_settings, context)
 
 
+@writes_rig
 def update_checker_color(proj_settings, context):
     # Update checker texture color
-    projector = get_projector(context)
-    nodes = get_projector(
-        context).children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree.nodes['Group'].node_tree.nodes
+    projector = proj_settings.id_data
+    nodes = projector.children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree.nodes['Group'].node_tree.nodes
     c = proj_settings.projected_color
     nodes['Checker Texture'].inputs['Color2'].default_value = [c.r, c.g, c.b, 1]
-    projector_cube = projector.children[get_child_ID_by_name(projector.children,'Cube')]
-    projector_cube.material_slots[0].material.diffuse_color = [c.r, c.g, c.b, 0.5]
+    # Lightweight projectors have no helpers, the overlay takes the color from the settings.
+    projector_cube = get_child_by_name(projector.children, 'Cube')
+    if projector_cube is not None:
+        projector_cube.material_slots[0].material.diffuse_color = [c.r, c.g, c.b, 0.5]
     for i in range(2):
-        projector_plane = projector.children[get_child_ID_by_name(projector.children,'Plane_' + str(i))]
-        projector_plane.material_slots[0].material.diffuse_color = [c.r, c.g, c.b, 0.5]
+        projector_plane = get_child_by_name(projector.children, 'Plane_' + str(i))
+        if projector_plane is not None:
+            projector_plane.material_slots[0].material.diffuse_color = [c.r, c.g, c.b, 0.5]
+    update_material_projection(proj_settings, context)
+
 
+def get_image_extents(proj_settings, context):
+    """ Return (left, right, bottom, top) of the projected image one unit in front of the projector. """
+    w, h = get_resolution(proj_settings, context)
+    return image_extents(proj_settings.throw_ratio, w, h, proj_settings.h_shift, proj_settings.v_shift)
 
 
+@writes_rig
 def update_power(proj_settings, context):
-    # Update spotlight power
-    projector = get_projector(context)
-    spot = get_projector(context).children[get_child_ID_by_type(projector.children,'LIGHT')]
+    """ Update spotlight power.
+    With lumens the power is derived from the rated brightness and the solid angle of the frustum.
+    """
+    projector = proj_settings.id_data
+    spot = projector.children[get_child_ID_by_type(projector.children,'LIGHT')]
+    if proj_settings.use_lumens:
+        omega = solid_angle(*get_image_extents(proj_settings, context))
+        proj_settings['power'] = lumens_to_watts(proj_settings.lumens * proj_settings.brightness, omega)
     spot.data.energy = proj_settings["power"]
+    update_relighting(proj_settings, context)
+
+
+def update_relighting(proj_settings, context):
+    """ Keep the weight group of the relighting AOVs in sync with the frustum and power of the projector. """
+    projector = proj_settings.id_data
+    update_weight_group(projector, get_image_extents(proj_settings, context),
+                        get_resolution(proj_settings, context), proj_settings.power)
+
+
+@writes_rig
+def update_projection_mode(proj_settings, context):
+    """ Switch between projecting through the spot light or through the materials of the target objects. """
+    projector = proj_settings.id_data
+    spot = projector.children[get_child_ID_by_type(projector.children,'LIGHT')]
+    use_material = proj_settings.projection_mode == 'MATERIAL'
+    spot.hide_render = use_material
+    spot.hide_viewport = use_material
+    if use_material:
+        update_material_projection(proj_settings, context)
+    else:
+        # Otherwise the targets would receive the projection twice, through the spot and their materials.
+        remove_projector_layers(projector)
+
+
+@writes_rig
+def update_material_projection(proj_settings, context):
+    """ Sync the material layer and the UV Project modifiers of the material projection mode. """
+    if proj_settings.projection_mode != 'MATERIAL':
+        return
+    projector = proj_settings.id_data
+    root_tree = projector.children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree
+    mask_image = bpy.data.images.get(f'_proj.tex.{proj_settings.resolution}')
+    case = proj_settings.projected_texture
+    canvas_mapping = None
+    if case == Textures.CUSTOM_TEXTURE.value:
+        image = root_tree.nodes['Image Texture'].image
+    elif case == Textures.LIVE_FEED.value:
+        image = bpy.data.images.get(LIVE_FEED_IMAGE.format(projector.name), mask_image)
+    elif case == Textures.CANVAS.value:
+        canvas_mapping, canvas_node = ensure_canvas_nodes(root_tree)
+        image = canvas_node.image
+    else:
+        image = mask_image
+    c = proj_settings.projected_color
+    update_layer_group(projector, case == Textures.CHECKER.value, image, mask_image,
+                       (c.r, c.g, c.b, 1), proj_settings.material_strength, canvas_mapping)
+    w, h = get_resolution(proj_settings, context)
+    for obj in get_targets(projector):
+        update_target(projector, obj, w, h)
 
 
+@writes_rig
 def update_pixel_grid(proj_settings, context):
     """ Update the pixel grid. Meaning, make it visible by linking the right node and updating the resolution. """
-    
-    projector = get_projector(context)
-    root_tree = get_projector(context).children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree
+    if resolution_pending(proj_settings):
+        return
+    projector = proj_settings.id_data
+    root_tree = projector.children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree
     nodes = root_tree.nodes
     pixel_grid_nodes = nodes['pixel_grid'].node_tree.nodes
     width, height = get_resolution(proj_settings, context)
@@ -433,11 +741,17 @@ def update_pixel_grid(proj_settings, context):
     else:
         root_tree.links.new(nodes['Emission'].outputs[0], nodes['Light Output'].inputs[0])
 
+@writes_rig
 def update_projection_helper(proj_settings, context):
-    
-    projector = get_projector(context)
-    curve = projector.children[get_child_ID_by_name(projector.children,'HelperLine')]
-    
+    """ Update the frustum line and planes. Helpers excluded by the level of detail policy are skipped. """
+    projector = proj_settings.id_data
+    update_projection_size(proj_settings, context)
+    if helpers_excluded(projector, context.view_layer):
+        return
+    curve = get_child_by_name(projector.children, 'HelperLine')
+    if curve is None:
+        return
+
     pn = curve.data.splines[0].points
 
     throw_ratio = proj_settings.throw_ratio
@@ -484,7 +798,9 @@ def update_projection_helper(proj_settings, context):
     pn[16].co = ((0.0,0.0,0.0,0.0))
 
     for j in range(4):
-        plane = projector.children[get_child_ID_by_name(projector.children,'HelperPlane_' + str(j))]
+        plane = get_child_by_name(projector.children, 'HelperPlane_' + str(j))
+        if plane is None:
+            continue
         for i in range(4):
             if i < 2:
                 plane.data.vertices[i].co.x = pn[i+j].co.x*2
@@ -495,10 +811,6 @@ def update_projection_helper(proj_settings, context):
                 plane.data.vertices[i].co.y = 0
                 plane.data.vertices[i].co.z = 0
 
-    proj_settings.w_projection = (pn[0].co - pn[1].co).length
-    proj_settings.h_projection = (pn[1].co - pn[2].co).length
-    proj_settings.d_projection = (pn[0].co - pn[2].co).length
-
 def update_projector_visibility(context):
     projector = get_projector(context)
     projector.hide_viewport = False
@@ -663,6 +975,50 @@ def create_shape_from_verts(obj_name):
     # clean up/free memory that was allocated for the bmesh
     bm.free() 
 
+def setup_spot(spot):
+    spot.name = 'Projector_Spotlight'
+    spot.scale = (.01, .01, .01)
+    spot.data.spot_size = math.pi - 0.001
+    spot.data.spot_blend = 0
+    spot.data.shadow_soft_size = 0.0
+    spot.hide_select = True
+    spot[ADDON_ID.format('spot')] = True
+    spot.data.cycles.use_multiple_importance_sampling = False
+    add_projector_node_tree_to_spot(spot)
+
+
+def setup_camera(cam):
+    cam.name = 'Projector_Camera.001'
+    cam.data.lens_unit = 'MILLIMETERS'
+    cam.data.sensor_width = 10
+    cam.data.display_size = 0.01
+    cam[RIG_VERSION_KEY] = RIG_VERSION
+
+
+def create_lightweight_projector(context):
+    """ Create a projector out of only the camera and the spot light.
+    The objects are created through bpy.data instead of operators and get no helper objects,
+    the frustum and body are drawn by the overlay.
+    """
+    create_projector_textures()
+    log.debug('Creating lightweight projector.')
+    spot = bpy.data.objects.new('Projector_Spotlight', bpy.data.lights.new('Projector_Spotlight', 'SPOT'))
+    cam = bpy.data.objects.new('Projector_Camera.001', bpy.data.cameras.new('Projector_Camera'))
+    context.collection.objects.link(spot)
+    context.collection.objects.link(cam)
+    setup_spot(spot)
+    setup_camera(cam)
+    spot.parent = cam
+    cam.location = context.scene.cursor.location
+    cam.rotation_euler = (math.pi*0.5, 0, 0)
+
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    cam.select_set(True)
+    context.view_layer.objects.active = cam
+    return cam
+
+
 def create_projector(context):
     """
     Create a new projector composed out of a camera (parent obj) and a spotlight (child not intended for user interaction).
@@ -676,25 +1032,14 @@ def create_projector(context):
     # ### Spot Light ###
     bpy.ops.object.light_add(type='SPOT', location=(0, 0, 0))
     spot = context.object
-    spot.name = 'Projector_Spotlight'
-    spot.scale = (.01, .01, .01)
-    spot.data.spot_size = math.pi - 0.001
-    spot.data.spot_blend = 0
-    spot.data.shadow_soft_size = 0.0
-    spot.hide_select = True
-    spot[ADDON_ID.format('spot')] = True
-    spot.data.cycles.use_multiple_importance_sampling = False
-    add_projector_node_tree_to_spot(spot)
+    setup_spot(spot)
 
     # ### Camera ###
     bpy.ops.object.camera_add(enter_editmode=False,
                               location=(0, 0, 0),
                               rotation=(0, 0, 0))
     cam = context.object
-    cam.name = 'Projector_Camera.001'
-    cam.data.lens_unit = 'MILLIMETERS'
-    cam.data.sensor_width = 10
-    cam.data.display_size = 0.01
+    setup_camera(cam)
 
     #cam.hide_render = False
 
@@ -809,6 +1154,8 @@ def create_projector(context):
 
         Projector_HelperPlane.data.materials.append(Projector_HelperPlane_mat)
 
+    ensure_helper_collection(cam, context.scene)
+
     bpy.context.view_layer.objects.active = cam
     
     bpy.ops.object.select_all(action='DESELECT')
@@ -888,6 +1235,8 @@ def init_projector(proj_settings, context):
     update_projection_helper(proj_settings, context)
     update_projector_visibility(context)
     update_projector_dimensions(proj_settings, context)
+    spot = proj_settings.id_data.children[get_child_ID_by_type(proj_settings.id_data.children, 'LIGHT')]
+    ensure_lightgroup(proj_settings.id_data, spot, context.view_layer)
 
 
 class PROJECTOR_OT_create_projector(Operator):
@@ -895,20 +1244,30 @@ class PROJECTOR_OT_create_projector(Operator):
     bl_idname = 'projector.create'
     bl_label = 'Create a new Projector'
     bl_options = {'REGISTER', 'UNDO'}
-    
+
+    lightweight: bpy.props.BoolProperty(
+        name="Lightweight",
+        description="Create only the camera and the spot light, the frustum and body are drawn as a viewport overlay",
+        default=False) # type: ignore
+
     @classmethod
     def poll(cls, context):
         return context.mode == 'OBJECT'
 
     def execute(self, context):
-        projector = create_projector(context)
+        if self.lightweight:
+            projector = create_lightweight_projector(context)
+        else:
+            projector = create_projector(context)
         init_projector(projector.proj_settings, context)
+        projector_index.invalidate()
         return {'FINISHED'}
 
 
+@writes_rig
 def update_projected_texture(proj_settings, context):
     """ Update the projected output source. """
-    projector = get_projectors(context, only_selected=True)[0]
+    projector = proj_settings.id_data
     root_tree = projector.children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree
     group_tree = root_tree.nodes['Group'].node_tree
     group_output_node = group_tree.nodes['Group Output']
@@ -930,6 +1289,15 @@ def update_projected_texture(proj_settings, context):
         custom_tex_node = root_tree.nodes['Image Texture']
         root_tree.links.new(
             custom_tex_node.outputs[0], emission_node.inputs[0])
+    elif case == Textures.CANVAS.value:
+        canvas_node = ensure_canvas_nodes(root_tree)[1]
+        canvas_node.image = context.scene.projector_canvas.image
+        root_tree.links.new(canvas_node.outputs[0], emission_node.inputs[0])
+    elif case == Textures.LIVE_FEED.value:
+        feed_node = ensure_live_feed_node(root_tree)
+        w, h = get_resolution(proj_settings, context)
+        feed_node.image = ensure_live_feed_image(projector, int(w), int(h))
+        root_tree.links.new(feed_node.outputs[0], emission_node.inputs[0])
 
 
 class PROJECTOR_OT_delete_projector(Operator):
@@ -945,10 +1313,19 @@ class PROJECTOR_OT_delete_projector(Operator):
     def execute(self, context):
         selected_projectors = get_projectors(context, only_selected=True)
         for projector in selected_projectors:
+            remove_projector_layers(projector)
+            helper_collection = projector.proj_settings.helper_collection
+            warp_map = get_warp_map(projector)
             for child in projector.children:
                 bpy.data.objects.remove(child, do_unlink=True)
             else:
                 bpy.data.objects.remove(projector, do_unlink=True)
+            if helper_collection:
+                bpy.data.collections.remove(helper_collection)
+            # The light data is orphaned but still uses the warp map until the file is saved.
+            if warp_map is not None and warp_map.users <= 1:
+                bpy.data.images.remove(warp_map)
+        projector_index.invalidate()
         return {'FINISHED'}
 
 
@@ -957,55 +1334,92 @@ class ProjectorSettings(bpy.types.PropertyGroup):
         name="Throw Ratio",
         soft_min=0.1, soft_max=5,
         update=update_throw_ratio,
-        subtype='FACTOR') # type: ignore
+        subtype='FACTOR',
+        **OVERRIDABLE) # type: ignore
 
     power: bpy.props.FloatProperty(
         name="Projector Power",
         soft_min=0.01, soft_max=30,
         update=update_power,
-        unit='POWER') # type: ignore
+        unit='POWER',
+        **OVERRIDABLE) # type: ignore
+
+    use_lumens: bpy.props.BoolProperty(
+        name="Use Lumens",
+        description="Derive the power from the rated brightness in ANSI lumens",
+        default=False,
+        update=update_power,
+        **OVERRIDABLE) # type: ignore
+
+    lumens: bpy.props.FloatProperty(
+        name="Lumens",
+        description="Rated brightness of the projector in ANSI lumens",
+        default=5000, min=0, soft_max=50000,
+        update=update_power,
+        **OVERRIDABLE) # type: ignore
+
+    brightness: bpy.props.FloatProperty(
+        name="Brightness",
+        description="Dimming of the projector relative to its rated brightness",
+        default=1.0, min=0, max=1,
+        update=update_power,
+        subtype='FACTOR',
+        **OVERRIDABLE) # type: ignore
 
     v_shift: bpy.props.FloatProperty(
         name="Vertical Shift",
         description="Vertical Lens Shift",
         soft_min=-100, soft_max=100,
         update=update_lens_shift,
-        subtype='PERCENTAGE') # type: ignore
+        subtype='PERCENTAGE',
+        **OVERRIDABLE) # type: ignore
 
     h_shift: bpy.props.FloatProperty(
         name="Horizontal Shift",
         description="Horizontal Lens Shift",
         soft_min=-100, soft_max=100,
         update=update_lens_shift,
-        subtype='PERCENTAGE') # type: ignore
+        subtype='PERCENTAGE',
+        **OVERRIDABLE) # type: ignore
 
     focus_distance: bpy.props.FloatProperty(
         name="Focus Distance",
         description="Set the focus distance in meter",
         soft_min=0.01, soft_max=30,
         update=update_focus_distance,
-        subtype='DISTANCE') # type: ignore
+        subtype='DISTANCE',
+        **OVERRIDABLE) # type: ignore
+
+    size_solves: bpy.props.EnumProperty(
+        items=SIZE_SOLVES,
+        name="Image Size Changes",
+        default='THROW_RATIO',
+        description="What to change when the image width, height or diagonal is set",
+        **OVERRIDABLE) # type: ignore
 
     w_projection: bpy.props.FloatProperty(
         name="Projection Width",
-        description="Get the projection width",
+        description="Width of the projected image at the focus distance",
         soft_min=0, soft_max=10,
         update=update_projection_by_width,
-        subtype='DISTANCE') # type: ignore
+        subtype='DISTANCE',
+        **OVERRIDABLE) # type: ignore
 
     h_projection: bpy.props.FloatProperty(
         name="Projection Height",
-        description="Get the projection height",
+        description="Height of the projected image at the focus distance",
         soft_min=0, soft_max=10,
         update=update_projection_by_height,
-        subtype='DISTANCE') # type: ignore
+        subtype='DISTANCE',
+        **OVERRIDABLE) # type: ignore
 
     d_projection: bpy.props.FloatProperty(
         name="Projection Diagonal",
-        description="Get the projection diagonal",
+        description="Diagonal of the projected image at the focus distance",
         soft_min=0, soft_max=10,
         update=update_projection_by_diagonal,
-        subtype='DISTANCE') # type: ignore
+        subtype='DISTANCE',
+        **OVERRIDABLE) # type: ignore
     
     projector_w: bpy.props.FloatProperty(
         name="Projector Width",
@@ -1013,49 +1427,159 @@ class ProjectorSettings(bpy.types.PropertyGroup):
         soft_min=0.1, soft_max=1,
         update=update_projector_width,
         subtype='DISTANCE',
-        unit='LENGTH') # type: ignore
+        unit='LENGTH',
+        **OVERRIDABLE) # type: ignore
 
     projector_h: bpy.props.FloatProperty(
         name="Projector Height",
         description="Set the height of the projector",
         soft_min=0.1, soft_max=1,
         update=update_projector_height,
-        subtype='DISTANCE') # type: ignore
+        subtype='DISTANCE',
+        **OVERRIDABLE) # type: ignore
     
     projector_d: bpy.props.FloatProperty(
         name="Projector Depth",
         description="Set the depth of the projector",
         soft_min=0.1, soft_max=1,
         update=update_projector_depth,
-        subtype='DISTANCE') # type: ignore
+        subtype='DISTANCE',
+        **OVERRIDABLE) # type: ignore
     
     resolution: bpy.props.EnumProperty(
         items=RESOLUTIONS,
         default='1920x1080',
         description="Select a Resolution for your Projector",
-        update=update_resolution) # type: ignore
+        update=update_resolution,
+        **OVERRIDABLE) # type: ignore
 
     use_custom_texture_res: bpy.props.BoolProperty(
         name="Let Image Define Projector Resolution",
         default=True,
         description="Use the resolution from the image as the projector resolution. Warning: After selecting a new image toggle this checkbox to update",
-        update=update_throw_ratio) # type: ignore
+        update=update_throw_ratio,
+        **OVERRIDABLE) # type: ignore
 
     projected_color: bpy.props.FloatVectorProperty(
         subtype='COLOR',
-        update=update_checker_color) # type: ignore
+        update=update_checker_color,
+        **OVERRIDABLE) # type: ignore
 
     projected_texture: bpy.props.EnumProperty(
         items=PROJECTED_OUTPUTS,
         default=Textures.CHECKER.value,
         description="What do you to project?",
-        update=update_throw_ratio) # type: ignore
+        update=update_throw_ratio,
+        **OVERRIDABLE) # type: ignore
 
     show_pixel_grid: bpy.props.BoolProperty(
         name="Show Pixel Grid",
         description="When checked the image is divided into a pixel grid with the dimensions of the image resolution.",
         default=False,
-        update=update_pixel_grid) # type: ignore
+        update=update_pixel_grid,
+        **OVERRIDABLE) # type: ignore
+
+    projection_mode: bpy.props.EnumProperty(
+        items=PROJECTION_MODES,
+        default='LIGHT',
+        description="How the image gets onto the target objects",
+        update=update_projection_mode,
+        **OVERRIDABLE) # type: ignore
+
+    material_strength: bpy.props.FloatProperty(
+        name="Strength",
+        description="Emission strength of the projection in material mode",
+        default=1.0, min=0, soft_max=10,
+        update=update_material_projection,
+        **OVERRIDABLE) # type: ignore
+
+    aov_index: bpy.props.IntProperty(
+        name="Relighting Index",
+        description="Value of the projector in the projector_index AOV, it stays the same when other projectors are added or removed",
+        default=0, min=0,
+        **OVERRIDABLE) # type: ignore
+
+    use_warp_map: bpy.props.BoolProperty(
+        name="Keystone & Distortion",
+        description="Apply keystone correction and lens distortion through a precomputed warp map",
+        default=False,
+        update=update_warp_map,
+        **OVERRIDABLE) # type: ignore
+
+    keystone_h: bpy.props.FloatProperty(
+        name="Horizontal Keystone",
+        description="Horizontal keystone correction",
+        soft_min=-50, soft_max=50,
+        update=update_warp_map,
+        subtype='PERCENTAGE',
+        **OVERRIDABLE) # type: ignore
+
+    keystone_v: bpy.props.FloatProperty(
+        name="Vertical Keystone",
+        description="Vertical keystone correction",
+        soft_min=-50, soft_max=50,
+        update=update_warp_map,
+        subtype='PERCENTAGE',
+        **OVERRIDABLE) # type: ignore
+
+    k1: bpy.props.FloatProperty(
+        name="Radial K1",
+        description="First radial distortion coefficient",
+        soft_min=-1, soft_max=1,
+        update=update_warp_map,
+        **OVERRIDABLE) # type: ignore
+
+    k2: bpy.props.FloatProperty(
+        name="Radial K2",
+        description="Second radial distortion coefficient",
+        soft_min=-1, soft_max=1,
+        update=update_warp_map,
+        **OVERRIDABLE) # type: ignore
+
+    p1: bpy.props.FloatProperty(
+        name="Tangential P1",
+        description="First tangential distortion coefficient",
+        soft_min=-0.1, soft_max=0.1,
+        update=update_warp_map,
+        **OVERRIDABLE) # type: ignore
+
+    p2: bpy.props.FloatProperty(
+        name="Tangential P2",
+        description="Second tangential distortion coefficient",
+        soft_min=-0.1, soft_max=0.1,
+        update=update_warp_map,
+        **OVERRIDABLE) # type: ignore
+
+    live_feed_source: bpy.props.EnumProperty(
+        name="Source",
+        items=LIVE_FEED_SOURCES,
+        default='SHARED_MEMORY',
+        description="Where the frames of the live feed come from",
+        **OVERRIDABLE) # type: ignore
+
+    live_feed_path: bpy.props.StringProperty(
+        name="Feed",
+        description="Name of the shared memory segment or path of the watched file",
+        **OVERRIDABLE) # type: ignore
+
+    live_feed_rate: bpy.props.FloatProperty(
+        name="Refresh Rate",
+        description="Frames per second the projected image is refreshed with",
+        default=30.0, min=1.0, soft_max=60.0, max=240.0,
+        **OVERRIDABLE) # type: ignore
+
+    helper_collection: bpy.props.PointerProperty(
+        name="Helper Collection",
+        description="Collection which holds the helper objects of the projector",
+        type=bpy.types.Collection,
+        **OVERRIDABLE) # type: ignore
+
+    warp_map_resolution: bpy.props.IntProperty(
+        name="Warp Map Resolution",
+        description="Width of the warp map in pixels, the height follows the aspect ratio",
+        default=512, min=16, soft_max=2048,
+        update=update_warp_map,
+        **OVERRIDABLE) # type: ignore
 
 
 def register():
@@ -1064,7 +1588,8 @@ def register():
     bpy.utils.register_class(PROJECTOR_OT_delete_projector)
     bpy.utils.register_class(PROJECTOR_OT_change_color_randomly)
     bpy.types.Object.proj_settings = bpy.props.PointerProperty(
-        type=ProjectorSettings)
+        type=ProjectorSettings,
+        **OVERRIDABLE)
 
 
 def unregister():
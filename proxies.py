@@ -0,0 +1,239 @@
+# Standard Lib imports
+import hashlib
+import logging
+import os
+
+# Blender imports
+import bpy
+from bpy.app.handlers import persistent
+
+from .helper import get_child_ID_by_type
+from .index import projector_index
+from .texture_loading import known_image_size, request_image_size
+
+log = logging.getLogger(name=__file__)
+
+PROXY_NAME = '{}.proxy'
+PLACEHOLDER_NAME = '{}.loading'
+PROXY_DIR = 'projector_proxies'
+# Image idprops: proxies and placeholders remember the image they stand in for, placeholders are flagged.
+FULL_IMAGE = 'projector_full_image'
+PLACEHOLDER = 'projector_placeholder'
+
+# Final renders use the full resolution images until the render job is done.
+_rendering = False
+
+
+def get_projected_image_nodes(projector):
+    """ Return the image nodes of the projectors spot light: the custom texture and the generated texture. """
+    spot = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+    root_tree = spot.data.node_tree
+    nodes = [root_tree.nodes.get('Image Texture')]
+    group = root_tree.nodes.get('Group')
+    if group is not None and group.node_tree is not None:
+        nodes.append(group.node_tree.nodes.get('Image Texture'))
+    return [node for node in nodes if node is not None]
+
+
+def is_proxy(image):
+    return FULL_IMAGE in image
+
+
+def is_placeholder(image):
+    return PLACEHOLDER in image
+
+
+def full_image(image):
+    """ Return the full resolution image of a proxy. """
+    if image is None or not is_proxy(image):
+        return image
+    return bpy.data.images.get(image[FULL_IMAGE], image)
+
+
+def proxy_size(image, max_size):
+    w, h = known_image_size(image)
+    scale = max_size / max(w, h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def proxy_cache_path(image, size):
+    """ Return the file the proxy of an image is cached in.
+    The file name contains a hash of the source file and its modification time, so edited sources get a new proxy.
+    """
+    if bpy.data.filepath:
+        directory = bpy.path.abspath(f'//{PROXY_DIR}')
+    else:
+        directory = os.path.join(bpy.app.tempdir, PROXY_DIR)
+    source = bpy.path.abspath(image.filepath)
+    mtime = os.path.getmtime(source) if os.path.isfile(source) else 0
+    key = hashlib.sha1(f'{source}|{mtime}|{image.name}|{size}'.encode()).hexdigest()[:12]
+    name = bpy.path.clean_name(os.path.splitext(os.path.basename(source))[0] or image.name)
+    return os.path.join(directory, f'{name}_{size[0]}x{size[1]}_{key}.png')
+
+
+def create_proxy(image, max_size):
+    """ Return a low resolution copy of the image.
+    Generated images get a generated proxy, image files get a proxy cached on disk.
+    """
+    size = proxy_size(image, max_size)
+    name = PROXY_NAME.format(image.name)
+    proxy = bpy.data.images.get(name)
+    if proxy is not None and tuple(proxy.size) == size:
+        return proxy
+
+    if image.source == 'GENERATED':
+        if proxy is None:
+            proxy = bpy.data.images.new(name, *size, alpha=True)
+        proxy.generated_type = image.generated_type
+        proxy.generated_color = image.generated_color
+        proxy.generated_width, proxy.generated_height = size
+    else:
+        path = proxy_cache_path(image, size)
+        if os.path.isfile(path):
+            proxy = bpy.data.images.load(path, check_existing=True)
+        else:
+            log.debug(f'Create proxy: {path}')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            proxy = image.copy()
+            proxy.scale(*size)
+            proxy.filepath_raw = path
+            proxy.file_format = 'PNG'
+            proxy.save()
+        proxy.name = name
+        proxy.colorspace_settings.name = image.colorspace_settings.name
+        proxy.alpha_mode = image.alpha_mode
+    proxy[FULL_IMAGE] = image.name
+    return proxy
+
+
+def create_placeholder(image):
+    """ Return the black image shown instead of an image file whose size is still read in the background.
+    Assigning the image itself would make Blender load all of its pixels on the main thread.
+    """
+    name = PLACEHOLDER_NAME.format(image.name)
+    placeholder = bpy.data.images.get(name)
+    if placeholder is None:
+        placeholder = bpy.data.images.new(name, 1, 1)
+        placeholder.generated_color = (0, 0, 0, 1)
+        placeholder[FULL_IMAGE] = image.name
+        placeholder[PLACEHOLDER] = True
+    return placeholder
+
+
+def on_size_known(image):
+    apply_proxies(bpy.context.scene)
+
+
+def size_unknown(image):
+    """ True while the size of an image file is read in the background. Final renders always load the image. """
+    if _rendering or image is None or image.source != 'FILE' or known_image_size(image) is not None:
+        return False
+    request_image_size(image, on_size_known)
+    return True
+
+
+def wants_proxy(image, max_size):
+    """ Only still images larger than the proxy size are replaced.
+    Images whose size is still unknown get their proxy once the size was read in the background.
+    """
+    if image is None or is_proxy(image) or image.source not in {'FILE', 'GENERATED'}:
+        return False
+    size = known_image_size(image)
+    if size is None:
+        request_image_size(image, on_size_known)
+        return False
+    return max(size) > max_size
+
+
+def use_proxies(projector, use_proxy, max_size):
+    """ Switch the projected images of a projector between their placeholder, proxy and full resolution variant. """
+    for node in get_projected_image_nodes(projector):
+        image = full_image(node.image)
+        if size_unknown(image):
+            image = create_placeholder(image)
+        elif use_proxy and wants_proxy(image, max_size):
+            image = create_proxy(image, max_size)
+        # Only assign changes, every assignment triggers another depsgraph update.
+        if node.image != image:
+            node.image = image
+
+
+def uses_proxy(projector):
+    return any(node.image is not None and is_proxy(node.image) and not is_placeholder(node.image)
+               for node in get_projected_image_nodes(projector))
+
+
+def apply_proxies(scene):
+    settings = scene.projector_proxies
+    for projector in projector_index.get_projectors(scene):
+        use_proxies(projector, settings.enabled, settings.size)
+
+
+def update_proxy_settings(settings, context):
+    apply_proxies(context.scene)
+
+
+@persistent
+def update_proxies_handler(scene, depsgraph):
+    """ Replace newly assigned images with their placeholders or proxies. """
+    if _rendering:
+        return
+    if depsgraph.id_type_updated('NODETREE') or depsgraph.id_type_updated('LIGHT') or depsgraph.id_type_updated('IMAGE'):
+        apply_proxies(scene)
+
+
+@persistent
+def use_full_resolution(scene, *args):
+    global _rendering
+    _rendering = True
+    for projector in projector_index.get_projectors(scene):
+        use_proxies(projector, False, scene.projector_proxies.size)
+
+
+@persistent
+def restore_proxies(scene, *args):
+    global _rendering
+    _rendering = False
+    apply_proxies(scene)
+
+
+@persistent
+def apply_proxies_on_load(*args):
+    apply_proxies(bpy.context.scene)
+
+
+class ProjectorProxySettings(bpy.types.PropertyGroup):
+    enabled: bpy.props.BoolProperty(
+        name="Use Proxies",
+        description="Show low resolution copies of the projected images in the viewport. Final renders use the full resolution",
+        default=False,
+        update=update_proxy_settings) # type: ignore
+
+    size: bpy.props.IntProperty(
+        name="Proxy Size",
+        description="Longest side of the proxy images in pixels",
+        default=512, min=16, soft_max=2048,
+        update=update_proxy_settings) # type: ignore
+
+
+HANDLERS = ((bpy.app.handlers.depsgraph_update_post, update_proxies_handler),
+            (bpy.app.handlers.render_pre, use_full_resolution),
+            (bpy.app.handlers.render_complete, restore_proxies),
+            (bpy.app.handlers.render_cancel, restore_proxies),
+            (bpy.app.handlers.load_post, apply_proxies_on_load))
+
+
+def register():
+    bpy.utils.register_class(ProjectorProxySettings)
+    bpy.types.Scene.projector_proxies = bpy.props.PointerProperty(
+        type=ProjectorProxySettings)
+    for handlers, handler in HANDLERS:
+        handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+    del bpy.types.Scene.projector_proxies
+    bpy.utils.unregister_class(ProjectorProxySettings)
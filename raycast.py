@@ -0,0 +1,164 @@
+""" Pure NumPy ray caster for the output maps of a projector.
+One ray per projector pixel is cast against the triangles of the targets. Triangles are binned into
+screen space tiles first, so every ray is only tested against the triangles which can cover its tile.
+Importable without Blender, so it runs in the worker processes of the job scheduler.
+"""
+import numpy as np
+
+TILE_SIZE = 32
+# Upper bound of ray-triangle tests per batch, keeps the temporary arrays small.
+BATCH_SIZE = 1 << 20
+
+
+def pixel_rays(extents, resolution):
+    """ Return the (h, w, 3) local space directions through the pixel centers, with z = -1. """
+    left, right, bottom, top = extents
+    w, h = resolution
+    x = left + (np.arange(w) + 0.5) / w * (right - left)
+    y = bottom + (np.arange(h) + 0.5) / h * (top - bottom)
+    rays = np.empty((h, w, 3))
+    rays[..., 0] = x[None, :]
+    rays[..., 1] = y[:, None]
+    rays[..., 2] = -1
+    return rays
+
+
+def bin_triangles(local, extents, resolution, tile_size=TILE_SIZE):
+    """ Return the (tile, triangle) pairs of triangles which may cover a tile, sorted by tile.
+    Triangles crossing the plane of the projector can not be projected and go into every tile.
+    """
+    left, right, bottom, top = extents
+    w, h = resolution
+    tiles_x, tiles_y = -(-w // tile_size), -(-h // tile_size)
+    depth = -local[..., 2]
+    visible = (depth > 0).any(axis=1)
+    in_front = (depth > 1e-9).all(axis=1)
+    safe = np.where(depth > 1e-9, depth, 1.0)
+    px = (local[..., 0] / safe - left) / (right - left) * w
+    py = (local[..., 1] / safe - bottom) / (top - bottom) * h
+    x0 = np.clip(np.floor(px.min(axis=1)) // tile_size, 0, tiles_x - 1)
+    x1 = np.clip(np.floor(px.max(axis=1)) // tile_size, 0, tiles_x - 1)
+    y0 = np.clip(np.floor(py.min(axis=1)) // tile_size, 0, tiles_y - 1)
+    y1 = np.clip(np.floor(py.max(axis=1)) // tile_size, 0, tiles_y - 1)
+    outside = (px.max(axis=1) < 0) | (px.min(axis=1) > w) | (py.max(axis=1) < 0) | (py.min(axis=1) > h)
+    straddling = visible & ~in_front
+    x0 = np.where(straddling, 0, x0).astype(np.int64)
+    y0 = np.where(straddling, 0, y0).astype(np.int64)
+    x1 = np.where(straddling, tiles_x - 1, x1).astype(np.int64)
+    y1 = np.where(straddling, tiles_y - 1, y1).astype(np.int64)
+    keep = np.flatnonzero(straddling | (in_front & ~outside))
+
+    counts_x = x1[keep] - x0[keep] + 1
+    counts_y = y1[keep] - y0[keep] + 1
+    counts = counts_x * counts_y
+    triangles = np.repeat(keep, counts)
+    # Position of every pair inside the tile rectangle of its triangle.
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    tx = x0[triangles] + offsets % np.repeat(counts_x, counts)
+    ty = y0[triangles] + offsets // np.repeat(counts_x, counts)
+    tiles = ty * tiles_x + tx
+    order = np.argsort(tiles, kind='stable')
+    return tiles[order], triangles[order], (tiles_x, tiles_y)
+
+
+def triangle_planes(triangles):
+    """ Return the per triangle vectors intersect() needs: the plane normal, its offset and the edge planes.
+    For rays from the origin, the triple products of the direction with the edge planes are the
+    barycentric coordinates scaled by the dot product with the normal.
+    """
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    planes = np.stack((np.cross(b, c), np.cross(c, a), np.cross(a, b)), axis=1)
+    normal = planes.sum(axis=1)
+    offset = np.einsum('tk,tk->t', a, normal)
+    return np.concatenate((normal[:, None, :], planes), axis=1), offset
+
+
+def intersect(directions, planes, offset, eps=1e-12):
+    """ Ray triangle intersection for rays from the origin, with one matrix product for all pairs.
+    Returns (t, u, v) of shape (rays, triangles), t is inf on a miss.
+    """
+    dots = directions @ planes.reshape(-1, 3).T
+    dots = dots.reshape(len(directions), -1, 4)
+    det = dots[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_det = 1.0 / det
+        u = dots[..., 2] * inv_det
+        v = dots[..., 3] * inv_det
+        t = offset[None, :] * inv_det
+    hit = (np.abs(det) > eps) & (dots[..., 1] * inv_det >= 0) & (u >= 0) & (v >= 0) & (t > 0)
+    return np.where(hit, t, np.inf), u, v
+
+
+def cast_maps(triangles, normals, uvs, object_ids, to_local, extents, resolution, tile_size=TILE_SIZE):
+    """ Return the depth, normal and UV maps of a projector.
+    triangles and normals are (n, 3, 3) world space corner positions and normals, uvs (n, 3, 2) and
+    object_ids (n,) tell which target a triangle belongs to. Maps are (h, w, ...) arrays, with the first
+    row at the bottom of the image like Blender images:
+        depth: distance along the view axis, 0 where nothing was hit
+        normal: world space interpolated normal
+        uv: target UV in the first two channels and the target index + 1 in the third, 0 where nothing was hit
+    """
+    triangles = np.asarray(triangles, dtype=np.float64)
+    normals = np.asarray(normals, dtype=np.float64)
+    uvs = np.asarray(uvs, dtype=np.float64)
+    object_ids = np.asarray(object_ids)
+    to_local = np.asarray(to_local, dtype=np.float64)
+    # get_resolution returns floats, the maps need whole pixels.
+    resolution = w, h = tuple(int(v) for v in resolution)
+    local = triangles @ to_local[:3, :3].T + to_local[:3, 3]
+    planes, offset = triangle_planes(local)
+    rays = pixel_rays(extents, resolution)
+
+    depth = np.full((h, w), np.inf)
+    hit_triangle = np.full((h, w), -1, dtype=np.int64)
+    bary = np.zeros((h, w, 2))
+    if len(local):
+        tiles, tile_triangles, (tiles_x, _) = bin_triangles(local, extents, resolution, tile_size)
+        starts = np.searchsorted(tiles, np.arange(tiles.max() + 1 if len(tiles) else 0))
+        ends = np.searchsorted(tiles, np.arange(tiles.max() + 1 if len(tiles) else 0), side='right')
+        for tile, (start, end) in enumerate(zip(starts, ends)):
+            if start == end:
+                continue
+            ty, tx = divmod(tile, tiles_x)
+            rows = slice(ty * tile_size, min((ty + 1) * tile_size, h))
+            cols = slice(tx * tile_size, min((tx + 1) * tile_size, w))
+            directions = rays[rows, cols].reshape(-1, 3)
+            best_t = np.full(len(directions), np.inf)
+            best_triangle = np.full(len(directions), -1, dtype=np.int64)
+            best_uv = np.zeros((len(directions), 2))
+            candidates = tile_triangles[start:end]
+            step = max(1, BATCH_SIZE // len(directions))
+            for batch in range(0, len(candidates), step):
+                indices = candidates[batch:batch + step]
+                t, u, v = intersect(directions, planes[indices], offset[indices])
+                nearest = np.argmin(t, axis=1)
+                rays_index = np.arange(len(directions))
+                t_nearest = t[rays_index, nearest]
+                closer = t_nearest < best_t
+                best_t[closer] = t_nearest[closer]
+                best_triangle[closer] = indices[nearest[closer]]
+                best_uv[closer, 0] = u[rays_index, nearest][closer]
+                best_uv[closer, 1] = v[rays_index, nearest][closer]
+            shape = (rows.stop - rows.start, cols.stop - cols.start)
+            depth[rows, cols] = best_t.reshape(shape)
+            hit_triangle[rows, cols] = best_triangle.reshape(shape)
+            bary[rows, cols] = best_uv.reshape(shape + (2,))
+
+    hit = hit_triangle >= 0
+    index = hit_triangle[hit]
+    u, v = bary[hit, 0], bary[hit, 1]
+    weights = np.stack((1 - u - v, u, v), axis=1)[:, :, None]
+
+    normal_map = np.zeros((h, w, 3))
+    if index.size:
+        n = (normals[index] * weights).sum(axis=1)
+        lengths = np.linalg.norm(n, axis=1, keepdims=True)
+        normal_map[hit] = np.divide(n, lengths, out=np.zeros_like(n), where=lengths > 0)
+
+    uv_map = np.zeros((h, w, 3))
+    if index.size:
+        uv_map[hit, :2] = (uvs[index] * weights).sum(axis=1)
+        uv_map[hit, 2] = object_ids[index] + 1
+    # Rays have a z of -1, so t is the distance along the view axis.
+    depth = np.where(hit, depth, 0.0)
+    return depth, normal_map, uv_map
@@ -0,0 +1,227 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+
+from .helper import auto_offset
+
+log = logging.getLogger(name=__file__)
+
+WEIGHT_GROUP = '_Projector_Weight.{}'
+AOV_GROUP = '_Projector_AOVs'
+INDEX_AOV = 'projector_index'
+GRID_AOV = 'projector_grid'
+# View layer idprop which maps the values of the index AOV to the projector names, for the compositor.
+INDEX_NAMES = 'projector_index_names'
+# AOV group idprop: the projectors it was built for.
+AOV_SIGNATURE = 'projector_signature'
+# Width of the pixel grid lines in the AOV, relative to a projector pixel.
+GRID_LINE_WIDTH = 0.05
+
+
+def relighting_supported():
+    """ Light groups exist since Blender 3.2. """
+    return bpy.app.version >= (3, 2)
+
+
+def lightgroup_name(projector):
+    return bpy.path.clean_name(projector.name)
+
+
+def ensure_lightgroup(projector, spot, view_layer):
+    """ Put the spot light of the projector into its own light group, so it gets its own render pass. """
+    if not relighting_supported():
+        return
+    name = lightgroup_name(projector)
+    if spot.lightgroup != name:
+        spot.lightgroup = name
+    if name not in view_layer.lightgroups:
+        view_layer.lightgroups.add(name=name)
+
+
+def ensure_view_layer_aovs(view_layer):
+    names = {aov.name for aov in view_layer.aovs}
+    for name in (INDEX_AOV, GRID_AOV):
+        if name not in names:
+            aov = view_layer.aovs.add()
+            aov.name = name
+            aov.type = 'VALUE'
+
+
+def new_group_outputs(node_group, names):
+    if(bpy.app.version >= (4, 0)):
+        for name in names:
+            node_group.interface.new_socket(name, in_out='OUTPUT', socket_type='NodeSocketFloat')
+    else:
+        for name in names:
+            node_group.outputs.new('NodeSocketFloat', name)
+
+
+def math_builder(node_group):
+    """ Return a function which adds a math node and connects its inputs to sockets or constants. """
+    nodes = node_group.nodes
+    links = node_group.links
+    auto_pos = auto_offset()
+
+    def op(operation, a, b=0.0):
+        node = nodes.new('ShaderNodeMath')
+        node.operation = operation
+        node.location = auto_pos(20)
+        for socket, value in zip(node.inputs, (a, b)):
+            if isinstance(value, bpy.types.NodeSocket):
+                links.new(value, socket)
+            else:
+                socket.default_value = value
+        return node.outputs[0]
+    return op
+
+
+def create_weight_group(projector):
+    """ Create the node group which tells for a shading point how strongly the projector lights it.
+    Weight is the power over the squared distance inside of the frustum and 0 outside,
+    Grid is 1 on the pixel grid lines of the projector.
+    """
+    node_group = bpy.data.node_groups.new(WEIGHT_GROUP.format(projector.name), 'ShaderNodeTree')
+    new_group_outputs(node_group, ('Weight', 'Grid'))
+    nodes = node_group.nodes
+    op = math_builder(node_group)
+
+    tex_coord = nodes.new('ShaderNodeTexCoord')
+    tex_coord.object = projector
+    sep = nodes.new('ShaderNodeSeparateXYZ')
+    node_group.links.new(tex_coord.outputs['Object'], sep.inputs[0])
+
+    values = {}
+    for name in ('left', 'right', 'bottom', 'top', 'width', 'height', 'power'):
+        node = nodes.new('ShaderNodeValue')
+        node.name = f'_{name}'
+        node.label = name.capitalize()
+        values[name] = node.outputs[0]
+
+    # The projector looks down its local -Z axis.
+    depth = op('MULTIPLY', sep.outputs[2], -1.0)
+    u = op('DIVIDE', sep.outputs[0], depth)
+    v = op('DIVIDE', sep.outputs[1], depth)
+    inside = op('GREATER_THAN', depth, 0.0)
+    inside = op('MULTIPLY', inside, op('GREATER_THAN', u, values['left']))
+    inside = op('MULTIPLY', inside, op('LESS_THAN', u, values['right']))
+    inside = op('MULTIPLY', inside, op('GREATER_THAN', v, values['bottom']))
+    inside = op('MULTIPLY', inside, op('LESS_THAN', v, values['top']))
+    weight = op('MULTIPLY', inside, op('DIVIDE', values['power'], op('MULTIPLY', depth, depth)))
+
+    pixel_u = op('MULTIPLY', op('DIVIDE', op('SUBTRACT', u, values['left']),
+                                op('SUBTRACT', values['right'], values['left'])), values['width'])
+    pixel_v = op('MULTIPLY', op('DIVIDE', op('SUBTRACT', v, values['bottom']),
+                                op('SUBTRACT', values['top'], values['bottom'])), values['height'])
+    line_u = op('LESS_THAN', op('MODULO', pixel_u, 1.0), GRID_LINE_WIDTH)
+    line_v = op('LESS_THAN', op('MODULO', pixel_v, 1.0), GRID_LINE_WIDTH)
+    grid = op('MULTIPLY', inside, op('MAXIMUM', line_u, line_v))
+
+    output = nodes.new('NodeGroupOutput')
+    node_group.links.new(weight, output.inputs[0])
+    node_group.links.new(grid, output.inputs[1])
+    return node_group
+
+
+def get_weight_group(projector):
+    return bpy.data.node_groups.get(WEIGHT_GROUP.format(projector.name))
+
+
+def update_weight_group(projector, extents, resolution, power):
+    """ Sync the frustum, resolution and power of the projector into its weight group, if it has one. """
+    node_group = get_weight_group(projector)
+    if node_group is None:
+        return
+    nodes = node_group.nodes
+    values = dict(zip(('left', 'right', 'bottom', 'top'), extents))
+    values['width'], values['height'] = resolution
+    values['power'] = power
+    for name, value in values.items():
+        socket = nodes[f'_{name}'].outputs[0]
+        if socket.default_value != value:
+            socket.default_value = value
+
+
+def assign_aov_indices(projectors):
+    """ Give every projector a stable value in the index AOV. Projectors keep their value when others are
+    added or removed, new and duplicated projectors get the next free one.
+    """
+    seen = set()
+    unassigned = []
+    for projector in projectors:
+        index = projector.proj_settings.aov_index
+        if index == 0 or index in seen:
+            unassigned.append(projector)
+        else:
+            seen.add(index)
+    next_index = max(seen, default=0) + 1
+    for projector in unassigned:
+        projector.proj_settings.aov_index = next_index
+        next_index += 1
+
+
+def aov_signature(projectors):
+    return [f'{projector.proj_settings.aov_index}:{projector.name}' for projector in projectors]
+
+
+def aov_group_outdated(projectors):
+    node_group = bpy.data.node_groups.get(AOV_GROUP)
+    return node_group is not None and list(node_group.get(AOV_SIGNATURE, [])) != aov_signature(projectors)
+
+
+def write_index_names(view_layer, projectors):
+    """ Store which projector every value of the index AOV stands for on the view layer. """
+    names = {str(projector.proj_settings.aov_index): projector.name for projector in projectors}
+    if view_layer.get(INDEX_NAMES, {}) != names:
+        view_layer[INDEX_NAMES] = names
+
+
+def build_aov_group(projectors):
+    """ (Re)build the node group which picks the dominant projector of a shading point.
+    Index is the AOV index of the projector (0 for none), see assign_aov_indices(), Grid its pixel grid mask.
+    """
+    node_group = bpy.data.node_groups.get(AOV_GROUP)
+    if node_group is None:
+        node_group = bpy.data.node_groups.new(AOV_GROUP, 'ShaderNodeTree')
+        new_group_outputs(node_group, ('Index', 'Grid'))
+    node_group.nodes.clear()
+    op = math_builder(node_group)
+
+    strongest, index, grid = 0.0, 0.0, 0.0
+    for projector in projectors:
+        weight_node = node_group.nodes.new('ShaderNodeGroup')
+        weight_node.node_tree = get_weight_group(projector) or create_weight_group(projector)
+        weight = weight_node.outputs['Weight']
+        stronger = op('GREATER_THAN', weight, strongest)
+        index = op('ADD', index, op('MULTIPLY', stronger, op('SUBTRACT', float(projector.proj_settings.aov_index), index)))
+        grid = op('ADD', grid, op('MULTIPLY', stronger, op('SUBTRACT', weight_node.outputs['Grid'], grid)))
+        strongest = op('MAXIMUM', weight, strongest)
+
+    output = node_group.nodes.new('NodeGroupOutput')
+    for socket, value in zip(output.inputs, (index, grid)):
+        if isinstance(value, bpy.types.NodeSocket):
+            node_group.links.new(value, socket)
+    node_group[AOV_SIGNATURE] = aov_signature(projectors)
+    return node_group
+
+
+def add_aov_outputs(material, aov_group):
+    """ Write the projector index and grid AOVs from the material. """
+    tree = material.node_tree
+    nodes = tree.nodes
+    group_node = nodes.get(AOV_GROUP)
+    if group_node is None:
+        group_node = nodes.new('ShaderNodeGroup')
+        group_node.name = AOV_GROUP
+        group_node.label = 'Projector AOVs'
+        group_node.location = (-200, -600)
+    group_node.node_tree = aov_group
+    for i, name in enumerate((INDEX_AOV, GRID_AOV)):
+        aov_node = nodes.get(name)
+        if aov_node is None:
+            aov_node = nodes.new('ShaderNodeOutputAOV')
+            aov_node.name = name
+            aov_node.aov_name = name
+            aov_node.location = (0, -600 - i * 150)
+        tree.links.new(group_node.outputs[i], aov_node.inputs['Value'])
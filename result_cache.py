@@ -0,0 +1,66 @@
+""" Store analysis results as compressed binary blobs inside ID properties.
+Independent of bpy, so it can be used by background jobs and tested without Blender.
+"""
+# Standard Lib imports
+import hashlib
+import io
+import zlib
+
+import numpy as np
+
+# Bump when the stored layout or the analysis itself changes, so old results are recomputed.
+CACHE_VERSION = 1
+HASH_KEY = 'hash'
+
+
+def array_hash(*arrays):
+    """ Return a short hex digest over the dtype, shape and contents of all arrays. """
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(str(CACHE_VERSION).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def pack_array(array):
+    """ Return the array as zlib compressed .npy bytes. """
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(array), allow_pickle=False)
+    return zlib.compress(buffer.getvalue(), 6)
+
+
+def unpack_array(data):
+    return np.load(io.BytesIO(zlib.decompress(bytes(data))), allow_pickle=False)
+
+
+class ResultCache:
+    """ Results of one input (e.g. the geometry of a target object), stored per key (e.g. per projector).
+    storage is a dict like object, an ID property group in Blender. All results are dropped when the
+    hash of the input changes.
+    """
+
+    def __init__(self, storage, input_hash):
+        self.storage = storage
+        if storage.get(HASH_KEY) != input_hash:
+            storage.clear()
+            storage[HASH_KEY] = input_hash
+
+    def get(self, key):
+        data = self.storage.get(key)
+        if data is None:
+            return None
+        try:
+            return unpack_array(data)
+        except (zlib.error, ValueError, OSError):
+            return None
+
+    def set(self, key, array):
+        self.storage[key] = pack_array(array)
+
+    def prune(self, keep):
+        """ Remove the results of all keys not in keep. """
+        keep = set(keep) | {HASH_KEY}
+        for key in [key for key in self.storage.keys() if key not in keep]:
+            del self.storage[key]
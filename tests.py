@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 import bpy
 from bpy.app.handlers import persistent
@@ -126,17 +128,697 @@ class TestProjector(unittest.TestCase):
 
 
 
+    def test_warp_map(self):
+        tree = self.nodes['Group'].node_tree
+        links = [(l.from_node.name, l.to_node.name) for l in tree.links]
+        self.assertIn(('Texture Vector', 'Image Texture'), links)
+        # Turn warp map on
+        self.c.proj_settings.use_warp_map = True
+        self.c.proj_settings.keystone_v = 10
+        warp_map = tree.nodes['Warp Map'].image
+        self.assertIsNotNone(warp_map)
+        self.assertEqual(warp_map.size[0], self.c.proj_settings.warp_map_resolution)
+        links = [(l.from_node.name, l.to_node.name) for l in tree.links]
+        self.assertIn(('Texture Vector', 'Warp Map'), links)
+        self.assertIn(('Warp Offset', 'Image Texture'), links)
+        self.assertNotIn(('Texture Vector', 'Image Texture'), links)
+        self.assertEqual(tree.nodes['Warp Map'].interpolation, 'Closest')
+
+    def test_warp_map_removed_with_projector(self):
+        bpy.ops.projector.create()
+        projector = bpy.context.object
+        projector.proj_settings.use_warp_map = True
+        projector.proj_settings.keystone_h = 10
+        spot = projector.children[0]
+        name = spot.data.node_tree.nodes['Group'].node_tree.nodes['Warp Map'].image.name
+        bpy.ops.object.select_all(action='DESELECT')
+        projector.select_set(True)
+        bpy.ops.projector.delete()
+        self.assertNotIn(name, bpy.data.images)
+
+    def test_helper_collection(self):
+        collection = self.c.proj_settings.helper_collection
+        self.assertIsNotNone(collection)
+        self.assertEqual(len(collection.objects), 6)
+        self.assertNotIn(self.s.name, collection.objects)
+        # Exclude the helpers by only showing the helpers of selected projectors.
+        bpy.ops.object.select_all(action='DESELECT')
+        bpy.context.scene.projector_lod.mode = 'SELECTED'
+        layer_collection = bpy.context.view_layer.layer_collection.children[
+            'Projector Helpers'].children[collection.name]
+        self.assertTrue(layer_collection.exclude)
+        bpy.context.scene.projector_lod.mode = 'OFF'
+        self.assertFalse(layer_collection.exclude)
+        self.c.select_set(True)
+
+    def test_shared_canvas(self):
+        bpy.ops.mesh.primitive_plane_add(size=2, location=(0, 1, 0), rotation=(1.5707963, 0, 0))
+        plane = bpy.context.object
+        bpy.context.scene.projector_canvas.canvas_object = plane
+        bpy.ops.object.select_all(action='DESELECT')
+        self.c.select_set(True)
+        bpy.context.view_layer.objects.active = self.c
+        self.c.proj_settings.projected_texture = 'canvas_texture'
+        bpy.ops.projector.update_canvas()
+        mapping_node = self.nodes['Canvas Mapping']
+        # A throw ratio of 1 at 1m distance covers half of the 2m wide plane.
+        self.assertAlmostEqual(mapping_node.inputs['Scale'].default_value[0], 0.5, places=4)
+        bpy.context.scene.projector_canvas.canvas_object = None
+        bpy.data.objects.remove(plane, do_unlink=True)
+
+    def test_projector_index(self):
+        from Projectors.index import projector_index
+        self.assertIn(self.c, projector_index.get_projectors(bpy.context.scene))
+        positions = projector_index.get_positions(bpy.context.scene)
+        self.assertEqual(bpy.data.objects[positions[self.c]], self.c)
+
+    def test_image_size(self):
+        self.c.proj_settings.throw_ratio = 1
+        self.c.proj_settings.focus_distance = 2
+        self.assertAlmostEqual(self.c.proj_settings.w_projection, 2)
+        self.assertAlmostEqual(self.c.proj_settings.h_projection, 1.125)
+        # Setting the width solves for the throw ratio.
+        self.c.proj_settings.w_projection = 4
+        self.assertAlmostEqual(self.c.proj_settings.throw_ratio, 0.5)
+        self.assertAlmostEqual(self.c.proj_settings.w_projection, 4)
+        # Or for the distance.
+        self.c.proj_settings.size_solves = 'DISTANCE'
+        self.c.proj_settings.d_projection = self.c.proj_settings.d_projection * 2
+        self.assertAlmostEqual(self.c.proj_settings.throw_ratio, 0.5)
+        self.assertAlmostEqual(self.c.proj_settings.focus_distance, 4)
+
     def test_update_power(self):
         new_power = 30
         self.c.proj_settings.power = new_power
         self.assertEqual(self.s.data.energy, new_power)
 
+    def test_lumens(self):
+        self.c.proj_settings.use_lumens = True
+        self.c.proj_settings.lumens = 1000
+        energy = self.s.data.energy
+        self.assertAlmostEqual(self.c.proj_settings.power, energy)
+        self.c.proj_settings.lumens = 2000
+        self.assertAlmostEqual(self.s.data.energy, energy * 2, places=4)
+        # The same flux spread over the larger solid angle of a wider frustum gives a lower intensity.
+        self.c.proj_settings.throw_ratio = 0.5
+        self.assertLess(self.s.data.energy, energy * 2)
+
+    def test_catalog_model(self):
+        from Projectors.catalog import apply_model, load_catalog, throw_range
+        index = load_catalog('')
+        low, high = throw_range(6, 9, 11)
+        found = index.query(low, high, 1920, 1080)
+        self.assertTrue(len(found) > 0)
+        for i in found:
+            model = index.models[i]
+            self.assertLessEqual(model['throw_min'], high)
+            self.assertGreaterEqual(model['throw_max'], low)
+        model = index.models[found[0]]
+        apply_model(self.c.proj_settings, bpy.context, model, 10 / 6)
+        self.assertGreaterEqual(self.c.proj_settings.throw_ratio, model['throw_min'] - 1e-6)
+        self.assertLessEqual(self.c.proj_settings.throw_ratio, model['throw_max'] + 1e-6)
+        self.assertTrue(self.c.proj_settings.use_lumens)
+
+    def test_proxies(self):
+        from Projectors.proxies import restore_proxies, use_full_resolution
+        scene = bpy.context.scene
+        node = self.nodes['Group'].node_tree.nodes['Image Texture']
+        full = node.image
+        scene.projector_proxies.enabled = True
+        self.assertEqual(max(node.image.size), scene.projector_proxies.size)
+        self.assertEqual(self.c.proj_settings.resolution, '1920x1080')
+        use_full_resolution(scene)
+        self.assertEqual(node.image, full)
+        restore_proxies(scene)
+        self.assertNotEqual(node.image, full)
+        scene.projector_proxies.enabled = False
+        self.assertEqual(node.image, full)
+
+    def test_migration(self):
+        from Projectors.migration import get_outdated_projectors, migrate_projectors
+        from Projectors.projector import RIG_VERSION, RIG_VERSION_KEY
+        self.assertNotIn(self.c, get_outdated_projectors())
+        del self.c[RIG_VERSION_KEY]
+        self.assertIn(self.c, get_outdated_projectors())
+        migrate_projectors()
+        self.assertEqual(self.c[RIG_VERSION_KEY], RIG_VERSION)
+        self.assertIn('Warp Map', self.nodes['Group'].node_tree.nodes)
+
+    def test_spot_cone(self):
+        import math
+        self.c.proj_settings.throw_ratio = 1.0
+        wide = self.s.data.spot_size
+        self.assertLess(wide, math.pi - 0.001)
+        self.c.proj_settings.throw_ratio = 2.0
+        self.assertLess(self.s.data.spot_size, wide)
+        self.c.proj_settings.h_shift = 50
+        self.assertGreater(self.s.data.spot_size, 2 * math.atan(0.25))
+
+    def test_material_projection_teardown(self):
+        from Projectors.material_projection import LAYER_GROUP, MODIFIER, add_target, layer_key
+        bpy.ops.mesh.primitive_plane_add()
+        plane = bpy.context.object
+        add_target(self.c, plane, 1920, 1080)
+        self.c.proj_settings.projection_mode = 'MATERIAL'
+        group_name = LAYER_GROUP.format(layer_key(self.c))
+        material = plane.material_slots[0].material
+        self.assertIn(group_name, material.node_tree.nodes)
+        self.c.proj_settings.projection_mode = 'LIGHT'
+        self.assertNotIn(MODIFIER.format(layer_key(self.c)), plane.modifiers)
+        self.assertNotIn(group_name, material.node_tree.nodes)
+        self.assertNotIn(group_name, bpy.data.node_groups)
+        self.assertFalse(self.s.hide_render)
+        bpy.data.objects.remove(plane)
+
+    def test_material_projection_shared_data(self):
+        from Projectors.material_projection import LAYER_GROUP, add_target, layer_key, remove_target, uv_map_name
+        bpy.ops.mesh.primitive_plane_add()
+        target = bpy.context.object
+        material = bpy.data.materials.new('Shared')
+        target.data.materials.append(material)
+        bpy.ops.object.duplicate(linked=True)
+        other = bpy.context.object
+        bpy.ops.object.duplicate(linked=True)
+        second_target = bpy.context.object
+        add_target(self.c, target, 1920, 1080)
+        add_target(self.c, second_target, 1920, 1080)
+        group_name = LAYER_GROUP.format(layer_key(self.c))
+        # The object which is no target keeps the material without the layer.
+        self.assertEqual(other.material_slots[0].material, material)
+        self.assertNotIn(group_name, material.node_tree.nodes if material.node_tree else [])
+        self.assertIn(group_name, target.material_slots[0].material.node_tree.nodes)
+        # The mesh is shared, the other target still needs the UV map.
+        remove_target(self.c, target)
+        self.assertIn(uv_map_name(self.c), target.data.uv_layers)
+        self.assertEqual(target.material_slots[0].material, material)
+        remove_target(self.c, second_target)
+        self.assertNotIn(uv_map_name(self.c), target.data.uv_layers)
+        for obj in (target, other, second_target):
+            bpy.data.objects.remove(obj)
+
+    def test_material_projection_rename(self):
+        from Projectors.material_projection import get_layer_group, get_targets, add_target
+        bpy.ops.mesh.primitive_plane_add()
+        plane = bpy.context.object
+        add_target(self.c, plane, 1920, 1080)
+        self.c.proj_settings.projection_mode = 'MATERIAL'
+        group = get_layer_group(self.c, create=False)
+        self.c.name = 'Renamed Projector'
+        self.assertEqual(get_targets(self.c), [plane])
+        self.assertEqual(get_layer_group(self.c, create=False), group)
+        self.c.proj_settings.projection_mode = 'LIGHT'
+        self.assertEqual(get_targets(self.c), [])
+        bpy.data.objects.remove(plane)
+
     def tearDown(self):
         bpy.ops.object.select_all(action='DESELECT')
         self.c.select_set(True)
         bpy.ops.projector.delete()
 
 
+class TestProjectorIndex(unittest.TestCase):
+    def test_removed_and_renamed(self):
+        from Projectors.index import projector_index
+        scene = bpy.context.scene
+        bpy.ops.projector.create()
+        projector = bpy.context.object
+        self.assertIn(projector, projector_index.get_projectors(scene))
+        count = len(projector_index.get_projectors(scene))
+        bpy.ops.object.camera_add()
+        camera = bpy.context.object
+        camera.name = 'Projector Renamed'
+        bpy.context.view_layer.update()
+        self.assertIn(camera, projector_index.get_projectors(scene))
+        bpy.data.objects.remove(camera)
+        self.assertEqual(len(projector_index.get_projectors(scene)), count)
+        # Editing the settings keeps the index.
+        generation = projector_index.generation
+        projector.proj_settings.throw_ratio = 1.3
+        bpy.context.view_layer.update()
+        projector_index.get_projectors(scene)
+        self.assertEqual(projector_index.generation, generation)
+        bpy.ops.object.select_all(action='DESELECT')
+        projector.select_set(True)
+        bpy.ops.projector.delete()
+
+
+class TestRigLibrary(unittest.TestCase):
+    def test_linked_rigs_share_data(self):
+        from Projectors.helper import get_child_by_name, get_child_ID_by_type
+        from Projectors.library import link_rig, save_rig_library
+        bpy.ops.projector.create()
+        projector = bpy.context.object
+        filepath = os.path.join(tempfile.mkdtemp(), 'projector_rig.blend')
+        save_rig_library(projector, filepath)
+        first = link_rig(bpy.context, filepath)
+        second = link_rig(bpy.context, filepath)
+
+        def node_groups(projector):
+            spot = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')]
+            return {node.node_tree for node in spot.data.node_tree.nodes if node.type == 'GROUP'}
+
+        self.assertEqual(node_groups(first), node_groups(second))
+        self.assertNotEqual(first.data, second.data)
+        # The first update which writes to the node groups gives the instance its own copy.
+        first.proj_settings.throw_ratio = 1.5
+        self.assertTrue(node_groups(first).isdisjoint(node_groups(second)))
+        # The body keeps its material, now as a local copy on the object.
+        body = get_child_by_name(first.children, 'Cube')
+        self.assertIsNotNone(body.material_slots[0].material)
+        self.assertIsNone(body.material_slots[0].material.library)
+        for obj in (projector, first, second):
+            bpy.ops.object.select_all(action='DESELECT')
+            obj.select_set(True)
+            bpy.ops.projector.delete()
+
+
+class TestRelighting(unittest.TestCase):
+    def test_stable_aov_indices(self):
+        from Projectors.relighting import INDEX_NAMES, assign_aov_indices, relighting_supported
+        if not relighting_supported():
+            self.skipTest('Light groups need Blender 3.2')
+        projectors = []
+        for i in range(3):
+            bpy.ops.projector.create()
+            projectors.append(bpy.context.object)
+        first, second, third = projectors
+        bpy.ops.mesh.primitive_plane_add()
+        plane = bpy.context.object
+        bpy.ops.projector.setup_relighting()
+        names = bpy.context.view_layer[INDEX_NAMES]
+        for projector in projectors:
+            self.assertEqual(names[str(projector.proj_settings.aov_index)], projector.name)
+        index = third.proj_settings.aov_index
+        # Removing a projector doesn't renumber the others, a duplicate gets a new index.
+        assign_aov_indices([second, third])
+        self.assertEqual(third.proj_settings.aov_index, index)
+        second.proj_settings.aov_index = index
+        assign_aov_indices([first, second, third])
+        self.assertEqual(len({p.proj_settings.aov_index for p in projectors}), 3)
+        bpy.data.objects.remove(plane)
+        for projector in projectors:
+            bpy.ops.object.select_all(action='DESELECT')
+            projector.select_set(True)
+            bpy.ops.projector.delete()
+
+
+class TestLightweightProjector(unittest.TestCase):
+    def test_lightweight_projector(self):
+        bpy.ops.projector.create(lightweight=True)
+        projector = bpy.context.object
+        self.assertEqual([child.type for child in projector.children], ['LIGHT'])
+        # Updates which touch helpers must not fail without them.
+        projector.proj_settings.throw_ratio = 1.5
+        projector.proj_settings.projector_w = 0.4
+        projector.proj_settings.projected_color = (1, 0, 0)
+        self.assertIsNone(projector.proj_settings.helper_collection)
+        bpy.ops.projector.delete()
+
+
+class TestJobs(unittest.TestCase):
+    def test_coalesce_and_result(self):
+        from Projectors.jobs import scheduler
+        results = []
+
+        def work(job, value):
+            job.report(1)
+            return value
+
+        first = scheduler.submit('test', work, 1, on_done=results.append)
+        second = scheduler.submit('test', work, 2, on_done=results.append)
+        self.assertTrue(first.cancelled)
+        second.future.result()
+        scheduler.poll()
+        self.assertEqual(results, [2])
+        self.assertNotIn('test', scheduler.jobs)
+
+
+class TestOverlap(unittest.TestCase):
+    def test_blend_clusters(self):
+        import numpy as np
+        from Projectors.overlap import Frustum, overlap_graph
+
+        def frustum(x):
+            to_world = np.eye(4)
+            to_world[0, 3] = x
+            return Frustum(to_world, (-0.5, 0.5, -0.3, 0.3), 10)
+
+        pairs, clusters = overlap_graph([frustum(0), frustum(3), frustum(30), frustum(6)])
+        self.assertEqual(pairs, [(0, 1), (0, 3), (1, 3)])
+        self.assertEqual(clusters, [[0, 1, 3], [2]])
+
+
+class TestPlacement(unittest.TestCase):
+    def test_layout_resolution(self):
+        import numpy as np
+        from Projectors.helper import get_child_ID_by_type
+        from Projectors.optimizer import create_layout
+        projector, = create_layout(bpy.context, [(np.eye(4), 1.5)], '1280x720')
+        proj_settings = projector.proj_settings
+        self.assertEqual(proj_settings.resolution, '1280x720')
+        self.assertAlmostEqual(proj_settings.throw_ratio, 1.5)
+        nodes = projector.children[get_child_ID_by_type(projector.children, 'LIGHT')].data.node_tree.nodes
+        self.assertEqual(nodes['Group'].node_tree.nodes['Image Texture'].image.name, '_proj.tex.1280x720')
+        pixel_grid_nodes = nodes['pixel_grid'].node_tree.nodes
+        self.assertEqual(pixel_grid_nodes['_width'].outputs[0].default_value, 1280)
+        self.assertEqual(pixel_grid_nodes['_height'].outputs[0].default_value, 720)
+
+
+class TestRaycast(unittest.TestCase):
+    def test_wall_maps(self):
+        import numpy as np
+        from Projectors.raycast import cast_maps
+        # A wall 2 units in front of the projector, its UVs span 4x4 units.
+        corners = np.array([(-2, -2, -2), (2, -2, -2), (2, 2, -2), (-2, 2, -2)], dtype=float)
+        triangles = corners[[[0, 1, 2], [0, 2, 3]]]
+        normals = np.tile((0, 0, 1.0), (2, 3, 1))
+        uvs = (triangles[..., :2] + 2) / 4
+        depth, normal, uv = cast_maps(triangles, normals, uvs, [0, 0], np.eye(4), (-0.5, 0.5, -0.25, 0.25), (64, 32))
+        self.assertTrue(np.allclose(depth, 2))
+        self.assertTrue(np.allclose(normal[..., 2], 1))
+        self.assertTrue(np.allclose(uv[0, 0], (0.25 + 1 / 256, 0.375 + 1 / 256, 1)))
+
+    def test_projector_resolution(self):
+        import numpy as np
+        from Projectors.output_maps import map_resolution
+        from Projectors.projector import get_resolution
+        from Projectors.raycast import cast_maps
+        bpy.ops.projector.create()
+        proj_settings = bpy.context.object.proj_settings
+        proj_settings.resolution = '1280x720'
+        resolution = map_resolution(proj_settings, bpy.context)
+        self.assertEqual(resolution, (1280, 720))
+        corners = np.array([(-2, -2, -2), (2, -2, -2), (2, 2, -2), (-2, 2, -2)], dtype=float)
+        triangles = corners[[[0, 1, 2], [0, 2, 3]]]
+        normals = np.tile((0, 0, 1.0), (2, 3, 1))
+        uvs = (triangles[..., :2] + 2) / 4
+        extents = (-0.5, 0.5, -0.25, 0.25)
+        for size in (resolution, get_resolution(proj_settings, bpy.context)):
+            depth, normal, uv = cast_maps(triangles, normals, uvs, [0, 0], np.eye(4), extents, size)
+            self.assertEqual(depth.shape, (720, 1280))
+
+
+class TestInteractiveAdjust(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.projector.create()
+        self.projector = bpy.context.object
+
+    def adjust(self, target, initial, mouse, shift=False):
+        from types import SimpleNamespace
+        from Projectors.interactive import PROJECTOR_OT_adjust_interactive
+        state = SimpleNamespace(target=target, projector=self.projector, start=(0, 0),
+                                initial=initial, values=dict(initial))
+        event = SimpleNamespace(mouse_x=mouse[0], mouse_y=mouse[1], shift=shift)
+        PROJECTOR_OT_adjust_interactive.compute_values(state, event)
+        return state
+
+    def test_drag_values(self):
+        import math
+        state = self.adjust('THROW_RATIO', {'throw_ratio': 1.0}, (200, 50))
+        self.assertAlmostEqual(state.values['throw_ratio'], math.e)
+        # Shift slows the drag down.
+        state = self.adjust('THROW_RATIO', {'throw_ratio': 1.0}, (200, 50), shift=True)
+        self.assertAlmostEqual(state.values['throw_ratio'], math.exp(0.1))
+        state = self.adjust('LENS_SHIFT', {'h_shift': 0.0, 'v_shift': 0.0}, (10, -20))
+        self.assertAlmostEqual(state.values['h_shift'], 1.0)
+        self.assertAlmostEqual(state.values['v_shift'], -2.0)
+        state = self.adjust('FOCUS_DISTANCE', {'focus_distance': 1.0}, (-100000, 0))
+        self.assertAlmostEqual(state.values['focus_distance'], 0.01)
+
+    def test_updates_on_confirm(self):
+        from Projectors.interactive import ADJUST_UPDATES, PROJECTOR_OT_adjust_interactive
+        state = self.adjust('THROW_RATIO', {'throw_ratio': 1.0}, (100, 0))
+        lens = self.projector.data.lens
+        # While dragging the values are written without running the update callbacks.
+        PROJECTOR_OT_adjust_interactive.write_values(state, state.values)
+        self.assertAlmostEqual(self.projector.proj_settings.throw_ratio, state.values['throw_ratio'])
+        self.assertEqual(self.projector.data.lens, lens)
+        ADJUST_UPDATES['THROW_RATIO'](self.projector.proj_settings, bpy.context)
+        self.assertAlmostEqual(self.projector.data.lens, 10 * state.values['throw_ratio'], places=4)
+
+    def tearDown(self):
+        bpy.ops.object.select_all(action='DESELECT')
+        self.projector.select_set(True)
+        bpy.ops.projector.delete()
+
+
+def add_scene_far_away(self):
+    """ A cube, a render camera above it and a projector between them, away from the objects of other tests. """
+    bpy.ops.mesh.primitive_cube_add(location=(100, 0, 0))
+    self.cube = bpy.context.object
+    bpy.ops.object.camera_add(location=(100, 0, 10), rotation=(0, 0, 0))
+    self.camera = bpy.context.object
+    bpy.ops.projector.create()
+    self.projector = bpy.context.object
+    self.projector.location = (100, 0, 5)
+
+
+def aim_projector(projector, at_cube):
+    """ Point the projector down at the cube or up, away from it. """
+    import math
+    projector.rotation_euler = (0, 0, 0) if at_cube else (math.pi, 0, 0)
+    bpy.context.view_layer.update()
+
+
+class TestCulling(unittest.TestCase):
+    def setUp(self):
+        add_scene_far_away(self)
+        self.scene_camera = bpy.context.scene.camera
+        bpy.context.scene.camera = self.camera
+
+    def test_projector_aimed_away(self):
+        from Projectors.culling import find_culled_projectors
+        scene = bpy.context.scene
+        aim_projector(self.projector, at_cube=True)
+        self.assertNotIn(self.projector, find_culled_projectors(scene, bpy.context.evaluated_depsgraph_get()))
+        aim_projector(self.projector, at_cube=False)
+        self.assertIn(self.projector, find_culled_projectors(scene, bpy.context.evaluated_depsgraph_get()))
+
+    def test_render_handlers(self):
+        from Projectors.culling import cull_projectors, restore_projectors
+        scene = bpy.context.scene
+        spot = self.projector.children[0]
+        aim_projector(self.projector, at_cube=False)
+        scene.projector_culling.enabled = True
+        cull_projectors(scene)
+        self.assertTrue(spot.hide_render)
+        restore_projectors(scene)
+        self.assertFalse(spot.hide_render)
+        scene.projector_culling.enabled = False
+
+    def tearDown(self):
+        bpy.context.scene.camera = self.scene_camera
+        bpy.ops.object.select_all(action='DESELECT')
+        self.projector.select_set(True)
+        bpy.ops.projector.delete()
+        bpy.data.objects.remove(self.cube)
+        bpy.data.objects.remove(self.camera)
+
+
+class TestLightLinking(unittest.TestCase):
+    def setUp(self):
+        from Projectors.light_linking import light_linking_supported
+        if not light_linking_supported():
+            self.skipTest('Light linking needs Blender 4.0')
+        add_scene_far_away(self)
+
+    def test_projector_aimed_away(self):
+        from Projectors.light_linking import clear_light_linking, get_spot, update_light_linking
+        spot = get_spot(self.projector)
+        aim_projector(self.projector, at_cube=True)
+        update_light_linking(bpy.context)
+        receivers = spot.light_linking.receiver_collection
+        self.assertIn(self.cube.name, receivers.objects)
+        self.assertNotIn(self.camera.name, receivers.objects)
+        aim_projector(self.projector, at_cube=False)
+        update_light_linking(bpy.context)
+        self.assertNotIn(self.cube.name, receivers.objects)
+        clear_light_linking(bpy.context)
+        self.assertIsNone(spot.light_linking.receiver_collection)
+
+    def tearDown(self):
+        bpy.ops.object.select_all(action='DESELECT')
+        self.projector.select_set(True)
+        bpy.ops.projector.delete()
+        bpy.data.objects.remove(self.cube)
+        bpy.data.objects.remove(self.camera)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_round_trip(self):
+        import numpy as np
+        from Projectors.result_cache import ResultCache, array_hash
+        points = np.arange(12, dtype=np.float64).reshape(4, 3)
+        storage = {}
+        cache = ResultCache(storage, array_hash(points))
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', np.linspace(0, 1, 4))
+        cache.set('b', np.ones(4))
+        # A new cache over the same storage and input sees the stored results.
+        cache = ResultCache(storage, array_hash(points))
+        self.assertTrue(np.array_equal(cache.get('a'), np.linspace(0, 1, 4)))
+        cache.prune(['a'])
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        # Changed input drops all results.
+        cache = ResultCache(storage, array_hash(points + 1))
+        self.assertIsNone(cache.get('a'))
+
+    def test_id_property_storage(self):
+        import numpy as np
+        from Projectors.result_cache import ResultCache, array_hash
+        scene = bpy.context.scene
+        scene['test_result_cache'] = {}
+        cache = ResultCache(scene['test_result_cache'], array_hash(np.zeros(3)))
+        cache.set('a', np.arange(3.0))
+        self.assertTrue(np.array_equal(cache.get('a'), np.arange(3.0)))
+        # Corrupt data reads as a missing result.
+        scene['test_result_cache']['a'] = b'corrupt'
+        self.assertIsNone(cache.get('a'))
+        del scene['test_result_cache']
+
+
+class TestTiledTextures(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.projector.create()
+        self.projector = bpy.context.object
+        self.image = bpy.data.images.new('Tiled Texture Test', 64, 32)
+        self.node = self.projector.children[0].data.node_tree.nodes['Image Texture']
+        self.node.image = self.image
+
+    def test_render_swap(self):
+        from Projectors.tiled_textures import TX_PATH, is_tx, restore_textures, tx_cache_path, tx_ready, use_tiled_textures
+        scene = bpy.context.scene
+        # An existing .tx file is picked up without a conversion job.
+        path = tx_cache_path(self.image)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.image.save_render(path)
+        scene.projector_tiled_textures.enabled = True
+        self.assertEqual(self.image[TX_PATH], path)
+        self.assertTrue(tx_ready(self.image))
+
+        use_tiled_textures(scene)
+        self.assertTrue(is_tx(self.node.image))
+        restore_textures(scene)
+        self.assertEqual(self.node.image, self.image)
+
+        # Without the setting the render keeps the original images.
+        scene.projector_tiled_textures.enabled = False
+        use_tiled_textures(scene)
+        self.assertEqual(self.node.image, self.image)
+        os.remove(path)
+
+    def test_make_tx(self):
+        from types import SimpleNamespace
+        from Projectors.tiled_textures import converter_available, make_tx
+        if not converter_available():
+            self.skipTest('Neither OpenImageIO nor maketx is available')
+        directory = tempfile.mkdtemp()
+        source = os.path.join(directory, 'source.png')
+        self.image.save_render(source)
+        reported = []
+        target = make_tx(SimpleNamespace(report=reported.append), source, os.path.join(directory, 'tx', 'source.tx'))
+        self.assertTrue(os.path.isfile(target))
+        self.assertFalse(os.path.exists(target + '.part'))
+        self.assertEqual(reported, [1])
+
+    def tearDown(self):
+        bpy.ops.object.select_all(action='DESELECT')
+        self.projector.select_set(True)
+        bpy.ops.projector.delete()
+        bpy.data.images.remove(self.image)
+
+
+def write_frame(buffer, sequence, pixels):
+    """ Write a frame in the live feed format: the header followed by the RGBA pixels. """
+    from Projectors.live_feed import HEADER
+    height, width = pixels.shape[:2]
+    HEADER.pack_into(buffer, 0, sequence, width, height)
+    buffer[HEADER.size:HEADER.size + pixels.size] = pixels.tobytes()
+
+
+class TestLiveFeed(unittest.TestCase):
+    def setUp(self):
+        import numpy as np
+        self.pixels = np.zeros((2, 3, 4), dtype=np.uint8)
+        self.pixels[..., 0] = 255
+        self.pixels[..., 3] = 255
+        self.out = np.empty(self.pixels.size, dtype=np.float32)
+
+    def write_file(self, path, sequence, pixels):
+        from Projectors.live_feed import HEADER
+        buffer = bytearray(HEADER.size + pixels.size)
+        write_frame(buffer, sequence, pixels)
+        # Replaced atomically like the player does.
+        with open(path + '.tmp', 'wb') as f:
+            f.write(buffer)
+        os.replace(path + '.tmp', path)
+
+    def test_file_source(self):
+        import numpy as np
+        from Projectors.live_feed import FileSource
+        path = os.path.join(tempfile.mkdtemp(), 'frame.bin')
+        source = FileSource(path)
+        self.assertIsNone(source.read(None, self.out))
+        self.write_file(path, 2, self.pixels)
+        self.assertEqual(source.read(None, self.out), 2)
+        self.assertTrue(np.allclose(self.out, self.pixels.ravel() / 255))
+        # An unchanged file is not read again.
+        self.assertIsNone(source.read(2, self.out))
+        # A frame of the wrong size is rejected.
+        self.write_file(path, 4, np.zeros((3, 3, 4), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            source.read(2, self.out)
+
+    def test_shared_memory_source(self):
+        import sys
+        import numpy as np
+        from Projectors.live_feed import HEADER, SharedMemorySource, shared_memory
+        if shared_memory is None:
+            self.skipTest('Shared memory needs Python 3.8')
+        memory = shared_memory.SharedMemory(create=True, size=HEADER.size + self.pixels.size)
+        try:
+            source = SharedMemorySource(memory.name)
+            if sys.version_info < (3, 13) and os.name == 'posix':
+                # The player and the feed share the tracker of this process, the feed took the segment out.
+                from multiprocessing import resource_tracker
+                resource_tracker.register(memory._name, 'shared_memory')
+            # An odd counter means the player is still writing.
+            write_frame(memory.buf, 1, self.pixels)
+            self.assertIsNone(source.read(None, self.out))
+            write_frame(memory.buf, 2, self.pixels)
+            self.assertEqual(source.read(None, self.out), 2)
+            self.assertTrue(np.allclose(self.out, self.pixels.ravel() / 255))
+            self.assertIsNone(source.read(2, self.out))
+            source.close()
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def test_feed_into_image(self):
+        import time
+        import numpy as np
+        from Projectors.live_feed import FileSource, LiveFeed
+        path = os.path.join(tempfile.mkdtemp(), 'frame.bin')
+        self.write_file(path, 2, self.pixels)
+        image = bpy.data.images.new('Live Feed Test', 3, 2, alpha=True)
+        feed = LiveFeed(FileSource(path), 3, 2, rate=100)
+        try:
+            deadline = time.perf_counter() + 2
+            while not feed.apply(image) and time.perf_counter() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(feed.frame, 2)
+            self.assertIsNone(feed.error)
+            pixels = np.empty(len(image.pixels), dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            self.assertTrue(np.allclose(pixels, self.pixels.ravel() / 255))
+            # No new frame, nothing is copied.
+            self.assertFalse(feed.apply(image))
+        finally:
+            feed.stop()
+            bpy.data.images.remove(image)
+
+
 def run_tests():
     testLoader = unittest.TestLoader()
     testLoader.testMethodPrefix = "test"
@@ -0,0 +1,68 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+
+from .image_header import read_image_size
+from .jobs import scheduler
+
+log = logging.getLogger(name=__file__)
+
+JOB_KEY = 'image_size.{}'
+# Image idprops: the size read from the file header and the file it was read from.
+IMAGE_SIZE = 'projector_image_size'
+IMAGE_SIZE_PATH = 'projector_image_size_path'
+
+# Callbacks waiting for the size of an image, by image name.
+_callbacks = {}
+
+
+def known_image_size(image):
+    """ Return the size of an image if it is known without loading its pixels, otherwise None. """
+    if image.has_data or image.source == 'GENERATED' or image.packed_file is not None:
+        return tuple(image.size)
+    if IMAGE_SIZE in image and image.get(IMAGE_SIZE_PATH) == image.filepath:
+        return tuple(image[IMAGE_SIZE])
+    return None
+
+
+def size_pending(image):
+    return JOB_KEY.format(image.name) in scheduler.jobs
+
+
+def read_size(job, filepath):
+    try:
+        return read_image_size(filepath)
+    except OSError:
+        return None
+
+
+def request_image_size(image, on_known):
+    """ Read the size of the image file in a background thread.
+    on_known(image) is called on the main thread once the size is stored on the image, every callback
+    requested while the size is read is called once.
+    Formats without a known header are loaded by Blender at that point, outside of any update callback.
+    """
+    name = image.name
+    callbacks = _callbacks.setdefault(name, [])
+    if on_known not in callbacks:
+        callbacks.append(on_known)
+    if size_pending(image):
+        return
+    filepath = bpy.path.abspath(image.filepath, library=image.library)
+
+    def on_done(size):
+        image = bpy.data.images.get(name)
+        callbacks = _callbacks.pop(name, [])
+        if image is None:
+            return
+        if size is None:
+            size = tuple(image.size)
+        image[IMAGE_SIZE] = list(size)
+        image[IMAGE_SIZE_PATH] = image.filepath
+        log.debug(f'Image size known: {name} {size}')
+        for callback in callbacks:
+            callback(image)
+
+    scheduler.submit(JOB_KEY.format(name), read_size, filepath, label=f'Read {name}', on_done=on_done)
@@ -0,0 +1,220 @@
+# Standard Lib imports
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+
+# Blender imports
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Operator
+
+from .index import projector_index
+from .jobs import scheduler
+from .proxies import FULL_IMAGE, full_image, get_projected_image_nodes
+
+log = logging.getLogger(name=__file__)
+
+TX_DIR = 'projector_tx'
+JOB_KEY = 'tx.{}'
+# Image idprop: the .tx file the image was last converted to.
+TX_PATH = 'projector_tx_path'
+
+# Image nodes using a .tx file during the running render.
+_swapped = []
+
+
+def oiio_module():
+    try:
+        import OpenImageIO
+    except ImportError:
+        return None
+    return OpenImageIO
+
+
+def converter_available():
+    """ Blender 3.5+ ships the OpenImageIO python module, otherwise maketx has to be on the PATH. """
+    return oiio_module() is not None or shutil.which('maketx') is not None
+
+
+def make_tx(job, source, target):
+    """ Convert an image into a tiled and mipmapped .tx file. Runs in a worker thread. """
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    partial = target + '.part'
+    oiio = oiio_module()
+    if oiio is not None:
+        config = oiio.ImageSpec()
+        config.attribute('maketx:filtername', 'lanczos3')
+        config.attribute('tile_width', 64)
+        config.attribute('tile_height', 64)
+        # Write the .tx format explicitly, the .part extension does not tell it.
+        config.attribute('maketx:fileformatname', 'tiff')
+        if not oiio.ImageBufAlgo.make_texture(oiio.MakeTxTexture, source, partial, config):
+            raise RuntimeError(oiio.geterror())
+    else:
+        subprocess.run(['maketx', '--filter', 'lanczos3', '--tile', '64', '64', '--format', 'tiff',
+                        source, '-o', partial], check=True, capture_output=True)
+    job.report(1)
+    os.replace(partial, target)
+    return target
+
+
+def tx_cache_path(image):
+    """ Return the .tx file of an image, next to the .blend file.
+    The file name contains a hash of the source file and its modification time, so edited sources are converted again.
+    """
+    if bpy.data.filepath:
+        directory = bpy.path.abspath(f'//{TX_DIR}')
+    else:
+        directory = os.path.join(bpy.app.tempdir, TX_DIR)
+    source = bpy.path.abspath(image.filepath, library=image.library)
+    if image.source == 'GENERATED':
+        signature = (image.generated_type, image.generated_width, image.generated_height, tuple(image.generated_color))
+    else:
+        signature = os.path.getmtime(source) if os.path.isfile(source) else 0
+    key = hashlib.sha1(f'{source}|{signature}|{image.name}'.encode()).hexdigest()[:12]
+    name = bpy.path.clean_name(os.path.splitext(os.path.basename(source))[0] or image.name)
+    return os.path.join(directory, f'{name}_{key}.tx')
+
+
+def source_path(image):
+    """ Return a file to convert the image from. Generated images are written to the cache directory first. """
+    if image.source == 'FILE':
+        path = bpy.path.abspath(image.filepath, library=image.library)
+        return path if os.path.isfile(path) else None
+    if image.source == 'GENERATED':
+        path = os.path.splitext(tx_cache_path(image))[0] + '.png'
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save_render(path)
+        return path
+    return None
+
+
+def get_projected_images(scene):
+    images = set()
+    for projector in projector_index.get_projectors(scene):
+        for node in get_projected_image_nodes(projector):
+            image = full_image(node.image)
+            if image is not None and image.source in {'FILE', 'GENERATED'}:
+                images.add(image)
+    return images
+
+
+def tx_ready(image):
+    path = image.get(TX_PATH)
+    return path is not None and path == tx_cache_path(image) and os.path.isfile(path)
+
+
+def convert_images(images):
+    """ Convert the images without an up to date .tx file in the background. Returns the number of jobs. """
+    count = 0
+    for image in images:
+        target = tx_cache_path(image)
+        if os.path.isfile(target):
+            image[TX_PATH] = target
+            continue
+        source = source_path(image)
+        if source is None:
+            continue
+        name = image.name
+
+        def on_done(path, name=name):
+            image = bpy.data.images.get(name)
+            if image is not None:
+                image[TX_PATH] = path
+
+        scheduler.submit(JOB_KEY.format(name), make_tx, source, target, label=f'Convert {name}', on_done=on_done)
+        count += 1
+    return count
+
+
+def is_tx(image):
+    return image is not None and image.filepath.endswith('.tx')
+
+
+def tx_image(image):
+    """ Return the image datablock of the .tx file of an image. """
+    tx = bpy.data.images.load(image[TX_PATH], check_existing=True)
+    tx.colorspace_settings.name = image.colorspace_settings.name
+    tx.alpha_mode = image.alpha_mode
+    tx[FULL_IMAGE] = image.name
+    return tx
+
+
+@persistent
+def use_tiled_textures(scene, *args):
+    """ Render with the .tx files, Cycles only reads the tiles and mip levels it samples from them. """
+    if not scene.projector_tiled_textures.enabled:
+        return
+    for projector in projector_index.get_projectors(scene):
+        for node in get_projected_image_nodes(projector):
+            image = full_image(node.image)
+            if image is not None and tx_ready(image):
+                _swapped.append(node)
+                node.image = tx_image(image)
+
+
+@persistent
+def restore_textures(scene, *args):
+    """ Switch back to the original images, unless the proxies already did. """
+    for node in _swapped:
+        try:
+            if is_tx(node.image):
+                node.image = full_image(node.image)
+        except ReferenceError:
+            pass
+    _swapped.clear()
+
+
+def update_tiled_textures(settings, context):
+    if settings.enabled:
+        convert_images(get_projected_images(context.scene))
+
+
+class ProjectorTiledTextureSettings(bpy.types.PropertyGroup):
+    enabled: bpy.props.BoolProperty(
+        name="Use Tiled Textures",
+        description="Render the projected images from tiled and mipmapped .tx files stored next to the .blend file",
+        default=False,
+        update=update_tiled_textures) # type: ignore
+
+
+class PROJECTOR_OT_convert_tiled_textures(Operator):
+    """ Convert the projected images into tiled and mipmapped .tx files. """
+    bl_idname = 'projector.convert_tiled_textures'
+    bl_label = 'Convert Textures'
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return converter_available()
+
+    def execute(self, context):
+        count = convert_images(get_projected_images(context.scene))
+        self.report({'INFO'}, f'Converting {count} textures.' if count else 'All textures are up to date.')
+        return {'FINISHED'}
+
+
+HANDLERS = ((bpy.app.handlers.render_pre, use_tiled_textures),
+            (bpy.app.handlers.render_complete, restore_textures),
+            (bpy.app.handlers.render_cancel, restore_textures))
+
+
+def register():
+    bpy.utils.register_class(ProjectorTiledTextureSettings)
+    bpy.utils.register_class(PROJECTOR_OT_convert_tiled_textures)
+    bpy.types.Scene.projector_tiled_textures = bpy.props.PointerProperty(
+        type=ProjectorTiledTextureSettings)
+    for handlers, handler in HANDLERS:
+        handlers.append(handler)
+
+
+def unregister():
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+    del bpy.types.Scene.projector_tiled_textures
+    bpy.utils.unregister_class(PROJECTOR_OT_convert_tiled_textures)
+    bpy.utils.unregister_class(ProjectorTiledTextureSettings)
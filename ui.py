@@ -1,5 +1,15 @@
-from .helper import get_projectors, get_child_ID_by_type, get_child_ID_by_name
-from .projector import RESOLUTIONS, Textures
+from .helper import get_projector, get_projectors, get_child_ID_by_type, get_child_ID_by_name, is_linked
+from .index import is_projector, projector_index
+from .projector import PROJECTED_OUTPUTS, RESOLUTIONS, Textures
+from .jobs import scheduler
+from .culling import last_culled
+from .blend_clusters import last_clusters, last_overlaps
+from .proxies import full_image, get_projected_image_nodes, uses_proxy
+from .texture_loading import size_pending
+from .tiled_textures import JOB_KEY as TX_JOB_KEY, converter_available, tx_ready
+from .light_linking import light_linking_supported
+from .live_feed import get_feed
+from .relighting import relighting_supported
 
 import bpy
 from bpy.types import Panel, PropertyGroup, UIList, Operator
@@ -23,12 +33,13 @@ class PROJECTOR_PT_projector_settings(Panel):
         row.operator('projector.delete',
                      text='Remove', icon='REMOVE')
 
-        if context.scene.render.engine == 'BLENDER_EEVEE':
+        selected_projectors = get_projectors(context, only_selected=True)
+        use_material = len(selected_projectors) == 1 and selected_projectors[0].proj_settings.projection_mode == 'MATERIAL'
+        if context.scene.render.engine != 'CYCLES' and not use_material:
             box = layout.box()
-            box.label(text='Image Projection only works in Cycles.', icon='ERROR')
+            box.label(text='Light Projection only works in Cycles.', icon='ERROR')
             box.operator('projector.switch_to_cycles')
 
-        selected_projectors = get_projectors(context, only_selected=True)
         if len(selected_projectors) == 1:
             projector = selected_projectors[0]
             proj_settings = projector.proj_settings
@@ -38,21 +49,43 @@ class PROJECTOR_PT_projector_settings(Panel):
             layout.label(text='ProjectorFork Settings:')
             box = layout.box()
 
-            box.prop(proj_settings, 'throw_ratio')
-            box.prop(proj_settings, 'power', text='Power')
+            box.prop(proj_settings, 'projection_mode', text='Mode', expand=True)
+            if use_material:
+                col = box.column(align=True)
+                col.prop(proj_settings, 'material_strength')
+                row = col.row(align=True)
+                row.operator('projector.add_material_targets', text='Add Targets', icon='ADD')
+                row.operator('projector.remove_material_targets', text='Remove', icon='REMOVE')
+                col.label(text='Interpolated per vertex, subdivide large faces.', icon='INFO')
+
+            row = box.row(align=True)
+            row.prop(proj_settings, 'throw_ratio')
+            row.operator('projector.adjust_interactive', text='', icon='ARROW_LEFTRIGHT').target = 'THROW_RATIO'
+            col = box.column(align=True)
+            col.prop(proj_settings, 'use_lumens')
+            if proj_settings.use_lumens:
+                col.prop(proj_settings, 'lumens')
+                col.prop(proj_settings, 'brightness', slider=True)
+                col.label(text=f'Power: {proj_settings.power:.2f} W')
+            else:
+                col.prop(proj_settings, 'power', text='Power')
 
             # Lens Shift
             col = box.column(align=True)
             col.prop(proj_settings, 'v_shift', text='Vertical Shift')
             col.prop(proj_settings, 'h_shift', text='Horizontal Shift')
+            col.operator('projector.adjust_interactive', text='Adjust Lens Shift', icon='VIEW_PAN').target = 'LENS_SHIFT'
 
-            box.prop(data=proj_settings, property='focus_distance', text='Focus Distance',slider=True)
+            row = box.row(align=True)
+            row.prop(data=proj_settings, property='focus_distance', text='Focus Distance',slider=True)
+            row.operator('projector.adjust_interactive', text='', icon='ARROW_LEFTRIGHT').target = 'FOCUS_DISTANCE'
 
             #pro = col.split(factor=0.0, align=True)
             img_size = box.column(align=True, heading='Image')
             img_size.prop(proj_settings, 'w_projection', text='Image Width',slider=True)
             img_size.prop(proj_settings, 'h_projection', text='Image Height',slider=True)
             img_size.prop(proj_settings, 'd_projection', text='Image Diagonal',slider=True)
+            img_size.prop(proj_settings, 'size_solves', text='Solve For')
             
             p_size = box.column(align=True, heading='Projector')
             p_size.prop(proj_settings, 'projector_w', text='Projector Width',slider=True)
@@ -80,8 +113,26 @@ class PROJECTOR_PT_projector_settings(Panel):
                 box = layout.box()
                 box.prop(proj_settings, 'use_custom_texture_res')
                 node = get_projectors(context, only_selected=True)[0].children[get_child_ID_by_type(projector.children,'LIGHT')].data.node_tree.nodes['Image Texture']
+                if node.image and size_pending(full_image(node.image)):
+                    box.label(text=f'Reading {node.image.name}...', icon='SORTTIME')
                 box.template_image(node, 'image', node.image_user, compact=False)
 
+            # Live Feed
+            if proj_settings.projected_texture == Textures.LIVE_FEED.value:
+                box = layout.box()
+                box.prop(proj_settings, 'live_feed_source', text='Source')
+                box.prop(proj_settings, 'live_feed_path')
+                box.prop(proj_settings, 'live_feed_rate')
+                row = box.row(align=True)
+                row.operator('projector.start_live_feed', icon='PLAY', text='Start')
+                row.operator('projector.stop_live_feed', icon='PAUSE', text='Stop')
+                feed = get_feed(projector)
+                if feed is not None:
+                    if feed.error:
+                        box.label(text=feed.error, icon='ERROR')
+                    else:
+                        box.label(text=f'{feed.fps:.1f} fps', icon='TIME')
+
 
 class PROJECTOR_PT_projected_color(Panel):
     bl_label = "Projected Color"
@@ -107,14 +158,497 @@ class PROJECTOR_PT_projected_color(Panel):
                      icon='MODIFIER_ON', text='Random Color')
 
 
+class PROJECTOR_PT_warp_map(Panel):
+    bl_label = "Keystone & Distortion"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    @classmethod
+    def poll(self, context):
+        return len(get_projectors(context, only_selected=True)) == 1
+
+    def draw_header(self, context):
+        proj_settings = get_projectors(context, only_selected=True)[0].proj_settings
+        self.layout.prop(proj_settings, 'use_warp_map', text='')
+
+    def draw(self, context):
+        proj_settings = get_projectors(context, only_selected=True)[0].proj_settings
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+        layout.active = proj_settings.use_warp_map
+        col = layout.column(align=True)
+        col.prop(proj_settings, 'keystone_h', text='Keystone Horizontal')
+        col.prop(proj_settings, 'keystone_v', text='Vertical')
+        col = layout.column(align=True)
+        col.prop(proj_settings, 'k1')
+        col.prop(proj_settings, 'k2')
+        col = layout.column(align=True)
+        col.prop(proj_settings, 'p1')
+        col.prop(proj_settings, 'p2')
+        layout.prop(proj_settings, 'warp_map_resolution', text='Map Resolution')
+
+
+class PROJECTOR_PT_helper_lod(Panel):
+    bl_label = "Helper Level of Detail"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        lod = context.scene.projector_lod
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+        layout.prop(lod, 'mode', text='Show Helpers')
+        if lod.mode == 'DISTANCE':
+            layout.prop(lod, 'distance')
+        elif lod.mode == 'COUNT':
+            layout.prop(lod, 'max_count')
+        layout.operator('projector.apply_lod', text='Apply', icon='FILE_REFRESH')
+        layout.operator('projector.make_lightweight', icon='OVERLAY')
+
+
+class PROJECTOR_PT_light_linking(Panel):
+    bl_label = "Light Linking"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        if not light_linking_supported():
+            layout.label(text='Light linking needs Blender 4.0 or newer', icon='INFO')
+            return
+        layout.prop(context.scene.projector_light_linking, 'auto_update')
+        row = layout.row(align=True)
+        row.operator('projector.update_light_linking', icon='LINKED')
+        row.operator('projector.clear_light_linking', text='Clear', icon='UNLINKED')
+
+
+class PROJECTOR_PT_relighting(Panel):
+    bl_label = "Relighting"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        if not relighting_supported():
+            layout.label(text='Light groups need Blender 3.2 or newer', icon='INFO')
+            return
+        col = layout.column()
+        col.label(text='Select the objects to write the AOVs from.')
+        col.operator('projector.setup_relighting', icon='NODE_COMPOSITING')
+
+
+class PROJECTOR_PT_proxies(Panel):
+    bl_label = "Proxies"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene.projector_proxies, 'enabled', text='')
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.projector_proxies
+        layout.prop(settings, 'size')
+        col = layout.column(align=True)
+        for projector in projector_index.get_projectors(context.scene):
+            row = col.row()
+            row.label(text=projector.name, icon='CAMERA_DATA')
+            if uses_proxy(projector):
+                row.label(text=f'Proxy {settings.size}px', icon='TEXTURE')
+            else:
+                row.label(text='Full Resolution', icon='IMAGE_DATA')
+
+
+class PROJECTOR_PT_tiled_textures(Panel):
+    bl_label = "Tiled Textures"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene.projector_tiled_textures, 'enabled', text='')
+
+    def draw(self, context):
+        layout = self.layout
+        if not converter_available():
+            layout.label(text='Needs OpenImageIO or maketx', icon='ERROR')
+            return
+        scene = context.scene
+        if scene.render.engine == 'CYCLES' and not scene.cycles.shading_system:
+            layout.label(text='Enable Open Shading Language for tile streaming', icon='INFO')
+        layout.operator('projector.convert_tiled_textures', icon='TEXTURE')
+        col = layout.column(align=True)
+        for projector in projector_index.get_projectors(scene):
+            for node in get_projected_image_nodes(projector):
+                image = full_image(node.image)
+                if image is None or image.source not in {'FILE', 'GENERATED'}:
+                    continue
+                row = col.row()
+                row.label(text=image.name, icon='IMAGE_DATA')
+                if TX_JOB_KEY.format(image.name) in scheduler.jobs:
+                    row.label(text='Converting ...')
+                else:
+                    row.label(text='Tiled' if tx_ready(image) else 'Not converted')
+
+
+class PROJECTOR_PT_render_culling(Panel):
+    bl_label = "Render Culling"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene.projector_culling, 'enabled', text='')
+
+    def draw(self, context):
+        layout = self.layout
+        if not last_culled:
+            layout.label(text='Nothing culled in the last render')
+            return
+        layout.label(text=f'Culled in the last render: {len(last_culled)}')
+        col = layout.column(align=True)
+        for name in last_culled:
+            col.label(text=name, icon='LIGHT_SPOT')
+
+
+class PROJECTOR_PT_blend_clusters(Panel):
+    bl_label = "Blend Clusters"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.scene.projector_overlap, 'distance')
+        row = layout.row(align=True)
+        row.operator('projector.find_blend_clusters', icon='SELECT_INTERSECT')
+        row.operator('projector.export_blend_clusters', text='', icon='EXPORT')
+        if not last_clusters:
+            return
+        layout.label(text=f'Overlaps: {len(last_overlaps)}')
+        col = layout.column(align=True)
+        for i, cluster in enumerate(last_clusters):
+            if len(cluster) < 2:
+                continue
+            row = col.row()
+            row.label(text=f'{len(cluster)}: {", ".join(cluster[:3])}' + (' ...' if len(cluster) > 3 else ''))
+            row.operator('projector.select_blend_cluster', text='', icon='RESTRICT_SELECT_OFF').index = i
+
+
+class PROJECTOR_PT_canvas(Panel):
+    bl_label = "Shared Canvas"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        canvas = context.scene.projector_canvas
+        layout = self.layout
+        layout.template_ID(canvas, 'image', open='image.open')
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+        layout.prop(canvas, 'canvas_object', text='Canvas')
+        layout.prop(canvas, 'auto_update')
+        if canvas.image and canvas.image.source == 'TILED':
+            layout.prop(canvas, 'load_needed_tiles')
+            layout.label(text=f'Loaded Tiles: {len(canvas.image.tiles)}')
+        layout.operator('projector.update_canvas', icon='FILE_REFRESH')
+
+
+class PROJECTOR_PT_photometry(Panel):
+    bl_label = "Photometry"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text='Targets: the selected objects')
+        col = layout.column(align=True)
+        col.operator('projector.estimate_illuminance', icon='LIGHT_SUN')
+        col.operator('projector.balance_brightness', icon='MOD_OPACITY')
+
+
+class PROJECTOR_UL_catalog_results(UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        split = layout.split(factor=0.5)
+        split.label(text=item.name)
+        row = split.row()
+        row.label(text=f'{item.throw_min:.2f}-{item.throw_max:.2f}')
+        row.label(text=item.resolution)
+        row.label(text=f'{item.lumens:.0f} lm')
+
+
+class PROJECTOR_PT_catalog(Panel):
+    bl_label = "Catalog"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.projector_catalog
+        layout.prop(settings, 'filepath')
+        col = layout.column(align=True)
+        col.prop(settings, 'image_width')
+        col.prop(settings, 'distance_min')
+        col.prop(settings, 'distance_max')
+        col = layout.column(align=True)
+        col.prop(settings, 'min_width')
+        col.prop(settings, 'min_height')
+        col.prop(settings, 'min_lumens')
+        layout.operator('projector.search_catalog', icon='VIEWZOOM')
+        layout.template_list('PROJECTOR_UL_catalog_results', '', settings, 'results', settings, 'active_result')
+        layout.operator('projector.apply_catalog_model', icon='CHECKMARK')
+
+
+class PROJECTOR_PT_rig_library(Panel):
+    bl_label = "Rig Library"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        projector = get_projector(context)
+        if projector is not None and is_linked(projector):
+            layout.label(text='Linked rig, only the settings are local', icon='LIBRARY_DATA_OVERRIDE'
+                         if bpy.app.version >= (2, 90) else 'LINK_BLEND')
+        col = layout.column(align=True)
+        col.operator('projector.save_rig_library', icon='EXPORT')
+        col.operator('projector.link_rig', icon='LINK_BLEND')
+
+
+class PROJECTOR_PT_placement(Panel):
+    bl_label = "Placement"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.projector_placement
+        layout.prop(settings, 'target')
+        layout.prop(settings, 'goal', expand=True)
+        layout.prop(settings, 'count' if settings.goal == 'COUNT' else 'coverage')
+        layout.prop(settings, 'resolution')
+        col = layout.column(align=True)
+        col.prop(settings, 'throw_min')
+        col.prop(settings, 'throw_max')
+        col = layout.column(align=True)
+        col.prop(settings, 'distance_min')
+        col.prop(settings, 'distance_max')
+        col = layout.column(align=True)
+        col.prop(settings, 'pixel_density')
+        col.prop(settings, 'overlap_weight')
+        col = layout.column(align=True)
+        col.prop(settings, 'samples')
+        col.prop(settings, 'candidates')
+        col.prop(settings, 'restarts')
+        col.prop(settings, 'seed')
+        layout.prop(settings, 'use_catalog')
+        if settings.use_catalog:
+            layout.label(text='Catalog and minimum lumens from the Catalog panel.', icon='INFO')
+        layout.operator('projector.optimize_placement', icon='VIEWZOOM')
+
+
+class PROJECTOR_PT_output_maps(Panel):
+    bl_label = "Output Maps"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.scene.projector_maps, 'directory')
+        layout.label(text='Depth, normal and UV maps of the selected projectors.')
+        layout.operator('projector.bake_output_maps', icon='RENDER_STILL')
+
+
+class PROJECTOR_PT_jobs(Panel):
+    bl_label = "Background Jobs"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    @classmethod
+    def poll(self, context):
+        return bool(scheduler.jobs)
+
+    def draw(self, context):
+        layout = self.layout
+        for job in list(scheduler.jobs.values()):
+            row = layout.row(align=True)
+            text = job.label if job.use_processes else f'{job.label} {job.progress:.0%}'
+            if bpy.app.version >= (4, 0) and not job.use_processes:
+                row.progress(factor=job.progress, type='BAR', text=text)
+            else:
+                row.label(text=text, icon='SORTTIME')
+            row.operator('projector.cancel_job', text='', icon='X').key = job.key
+
+
+def resolution_key(projector):
+    w, h = projector.proj_settings.resolution.split('x')
+    return int(w) * int(h)
+
+
+MANAGER_SORT = [('NAME', 'Name', 'Sort by name', 1),
+                ('RESOLUTION', 'Resolution', 'Sort by resolution', 2),
+                ('THROW_RATIO', 'Throw Ratio', 'Sort by throw ratio', 3),
+                ('POWER', 'Power', 'Sort by power', 4),
+                ('TEXTURE', 'Texture', 'Sort by projected texture', 5)]
+
+SORT_KEYS = {'NAME': lambda projector: projector.name.lower(),
+             'RESOLUTION': resolution_key,
+             'THROW_RATIO': lambda projector: projector.proj_settings.throw_ratio,
+             'POWER': lambda projector: projector.proj_settings.power,
+             'TEXTURE': lambda projector: projector.proj_settings.projected_texture}
+
+TEXTURE_NAMES = {item[0]: item[1] for item in PROJECTED_OUTPUTS}
+
+
+# Signature, flags and order of the last filtered projector list.
+_list_cache = (None, [], [])
+
+
+class PROJECTOR_UL_projectors(UIList):
+    """ List of all projectors in the scene, drawn from bpy.data.objects filtered by the projector index. """
+    sort_by: bpy.props.EnumProperty(items=MANAGER_SORT, name='Sort By') # type: ignore
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        proj_settings = item.proj_settings
+        split = layout.split(factor=0.3)
+        split.prop(item, 'name', text='', emboss=False, icon='CAMERA_DATA')
+        row = split.row()
+        row.label(text=proj_settings.resolution)
+        row.label(text=f'{proj_settings.throw_ratio:.2f}')
+        row.label(text=f'{proj_settings.power:.1f}')
+        row.label(text=TEXTURE_NAMES.get(proj_settings.projected_texture, ''))
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, 'filter_name', text='')
+        row.prop(self, 'sort_by', text='')
+        row.prop(self, 'use_filter_sort_reverse', text='', icon='SORT_DESC' if self.use_filter_sort_reverse else 'SORT_ASC')
+
+    def filter_items(self, context, data, propname):
+        """ Only show projectors. Filtering and sorting only touch the cached projectors, not all objects.
+        The flags and the order of all objects are only rebuilt when the listed projectors or their order change.
+        """
+        global _list_cache
+        objects = getattr(data, propname)
+        positions = projector_index.get_positions(context.scene)
+        name_filter = self.filter_name.lower()
+        visible = [(position, projector) for projector, position in positions.items()
+                   if not name_filter or name_filter in projector.name.lower()]
+        key = SORT_KEYS[self.sort_by]
+        visible.sort(key=lambda item: key(item[1]), reverse=self.use_filter_sort_reverse)
+        signature = (projector_index.generation, len(objects), tuple(position for position, _ in visible))
+        if signature == _list_cache[0]:
+            return _list_cache[1], _list_cache[2]
+
+        flags = [0] * len(objects)
+        for position, _ in visible:
+            flags[position] = self.bitflag_filter_item
+        order = [0] * len(objects)
+        taken = set()
+        for new_position, (position, _) in enumerate(visible):
+            order[position] = new_position
+            taken.add(position)
+        new_position = len(visible)
+        for position in range(len(objects)):
+            if position not in taken:
+                order[position] = new_position
+                new_position += 1
+        _list_cache = (signature, flags, order)
+        return flags, order
+
+
+class PROJECTOR_PT_projector_manager(Panel):
+    bl_label = "Projector Manager"
+    bl_parent_id = "OBJECT_PT_projector_n_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+
+    def draw(self, context):
+        layout = self.layout
+        split = layout.split(factor=0.3)
+        split.label(text='Name')
+        row = split.row()
+        for label in ('Resolution', 'Throw', 'Power', 'Texture'):
+            row.label(text=label)
+        layout.template_list('PROJECTOR_UL_projectors', '', bpy.data, 'objects',
+                             context.scene, 'projector_manager_index', rows=8)
+
+
+def select_projector_from_list(scene, context):
+    """ Select the projector which was clicked in the projector manager. """
+    index = scene.projector_manager_index
+    if not 0 <= index < len(bpy.data.objects):
+        return
+    obj = bpy.data.objects[index]
+    if not is_projector(obj) or obj.name not in context.view_layer.objects:
+        return
+    for selected in context.selected_objects:
+        selected.select_set(False)
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+
+
 def append_to_add_menu(self, context):
     self.layout.operator('projector.create',
                          text='Projector', icon='CAMERA_DATA')
+    self.layout.operator('projector.create',
+                         text='Lightweight Projector', icon='CAMERA_DATA').lightweight = True
+    self.layout.operator('projector.link_rig',
+                         text='Linked Projector Rig', icon='LINK_BLEND')
 
 
 def register():
     bpy.utils.register_class(PROJECTOR_PT_projector_settings)
     bpy.utils.register_class(PROJECTOR_PT_projected_color)
+    bpy.utils.register_class(PROJECTOR_PT_warp_map)
+    bpy.utils.register_class(PROJECTOR_PT_helper_lod)
+    bpy.utils.register_class(PROJECTOR_PT_light_linking)
+    bpy.utils.register_class(PROJECTOR_PT_relighting)
+    bpy.utils.register_class(PROJECTOR_PT_proxies)
+    bpy.utils.register_class(PROJECTOR_PT_tiled_textures)
+    bpy.utils.register_class(PROJECTOR_PT_render_culling)
+    bpy.utils.register_class(PROJECTOR_PT_blend_clusters)
+    bpy.utils.register_class(PROJECTOR_PT_canvas)
+    bpy.utils.register_class(PROJECTOR_PT_photometry)
+    bpy.utils.register_class(PROJECTOR_UL_catalog_results)
+    bpy.utils.register_class(PROJECTOR_PT_catalog)
+    bpy.utils.register_class(PROJECTOR_PT_rig_library)
+    bpy.utils.register_class(PROJECTOR_PT_placement)
+    bpy.utils.register_class(PROJECTOR_PT_output_maps)
+    bpy.utils.register_class(PROJECTOR_PT_jobs)
+    bpy.utils.register_class(PROJECTOR_UL_projectors)
+    bpy.utils.register_class(PROJECTOR_PT_projector_manager)
+    bpy.types.Scene.projector_manager_index = bpy.props.IntProperty(
+        update=select_projector_from_list)
     # Register create  in the blender add menu.
     bpy.types.VIEW3D_MT_light_add.append(append_to_add_menu)
 
@@ -122,5 +656,24 @@ def register():
 def unregister():
     # Register create in the blender add menu.
     bpy.types.VIEW3D_MT_light_add.remove(append_to_add_menu)
+    del bpy.types.Scene.projector_manager_index
+    bpy.utils.unregister_class(PROJECTOR_PT_projector_manager)
+    bpy.utils.unregister_class(PROJECTOR_UL_projectors)
+    bpy.utils.unregister_class(PROJECTOR_PT_jobs)
+    bpy.utils.unregister_class(PROJECTOR_PT_output_maps)
+    bpy.utils.unregister_class(PROJECTOR_PT_placement)
+    bpy.utils.unregister_class(PROJECTOR_PT_rig_library)
+    bpy.utils.unregister_class(PROJECTOR_PT_catalog)
+    bpy.utils.unregister_class(PROJECTOR_UL_catalog_results)
+    bpy.utils.unregister_class(PROJECTOR_PT_photometry)
+    bpy.utils.unregister_class(PROJECTOR_PT_canvas)
+    bpy.utils.unregister_class(PROJECTOR_PT_blend_clusters)
+    bpy.utils.unregister_class(PROJECTOR_PT_render_culling)
+    bpy.utils.unregister_class(PROJECTOR_PT_tiled_textures)
+    bpy.utils.unregister_class(PROJECTOR_PT_proxies)
+    bpy.utils.unregister_class(PROJECTOR_PT_relighting)
+    bpy.utils.unregister_class(PROJECTOR_PT_light_linking)
+    bpy.utils.unregister_class(PROJECTOR_PT_helper_lod)
+    bpy.utils.unregister_class(PROJECTOR_PT_warp_map)
     bpy.utils.unregister_class(PROJECTOR_PT_projected_color)
     bpy.utils.unregister_class(PROJECTOR_PT_projector_settings)
@@ -0,0 +1,93 @@
+# Standard Lib imports
+import logging
+
+# Blender imports
+import bpy
+import numpy as np
+
+log = logging.getLogger(name=__file__)
+
+WARP_MAP_NAME = '_proj.warp.{}'
+WARP_KEY = 'projector_warp_key'
+
+
+def compute_st_map(width, height, aspect=1.0,
+                   keystone_h=0.0, keystone_v=0.0,
+                   k1=0.0, k2=0.0, p1=0.0, p2=0.0):
+    """ Return a (height, width, 4) float32 ST-map.
+    For every output pixel the red and green channel hold the texture coordinate (offset by +1)
+    that has to be sampled to get a keystone corrected and lens distorted image. Pixels that
+    fall outside the source image are 0, which is turned into an out of range coordinate in
+    the projector node tree.
+    """
+    u = (np.arange(width, dtype=np.float64) + 0.5) / width
+    v = (np.arange(height, dtype=np.float64) + 0.5) / height
+    u, v = np.meshgrid(u, v)
+
+    # Normalized coordinates, the vertical axis is scaled to keep the distortion round.
+    x = u * 2 - 1
+    y = (v * 2 - 1) / aspect
+
+    # Keystone as a homography.
+    w = 1 + keystone_h * x + keystone_v * y
+    valid = w > 1e-6
+    w = np.where(valid, w, 1)
+    x = x / w
+    y = y / w
+
+    # Brown-Conrady radial and tangential distortion.
+    r2 = x * x + y * y
+    radial = 1 + k1 * r2 + k2 * r2 * r2
+    x_d = x * radial + 2 * p1 * x * y + p2 * (r2 + 2 * x * x)
+    y_d = y * radial + p1 * (r2 + 2 * y * y) + 2 * p2 * x * y
+
+    s = (x_d + 1) / 2
+    t = (y_d * aspect + 1) / 2
+    valid &= (s >= 0) & (s <= 1) & (t >= 0) & (t <= 1)
+
+    st_map = np.zeros((height, width, 4), dtype=np.float32)
+    st_map[..., 0] = np.where(valid, s + 1, 0)
+    st_map[..., 1] = np.where(valid, t + 1, 0)
+    st_map[..., 2] = np.where(valid, 1, 0)
+    st_map[..., 3] = 1
+    return st_map
+
+
+def warp_key(width, height, params):
+    """ Key used to detect if a warp map has to be recomputed. """
+    return repr((width, height) + tuple(round(p, 6) for p in params))
+
+
+def write_warp_map(image, st_map):
+    """ Write the pixels of a st map into an image. """
+    if bpy.app.version >= (2, 83):
+        image.pixels.foreach_set(st_map.ravel())
+    else:
+        image.pixels[:] = st_map.ravel()
+    image.update()
+
+
+def bake_warp_map(name, width, height, aspect, params, image=None):
+    """ Return a warp map image for the given parameters.
+    The map is only recomputed if the parameters or the size changed since the last bake.
+    """
+    key = warp_key(width, height, params)
+    if image and tuple(image.size) != (width, height):
+        bpy.data.images.remove(image)
+        image = None
+    if image is None:
+        image = bpy.data.images.new(WARP_MAP_NAME.format(name), width, height,
+                                    alpha=True, float_buffer=True)
+        image.colorspace_settings.name = 'Non-Color'
+    elif image.get(WARP_KEY) == key:
+        return image
+
+    log.debug(f'Bake warp map: {image.name} {key}')
+    write_warp_map(image, compute_st_map(width, height, aspect, *params))
+    image[WARP_KEY] = key
+    try:
+        # Generated images lose their pixels on save if they are not packed.
+        image.pack()
+    except RuntimeError as e:
+        log.warning(f'Could not pack warp map {image.name}: {e}')
+    return image